@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Vectorized analytics over price observations, trades and sessions.
+
+Observations are read in chunks from the hot SQLite database (read-only,
+so reports never take the bot's write lock) and from the Parquet archive
+(archive.py, only the columns a report needs). Each report is one pandas
+group-by pass: every chunk is reduced to per-band partial counts, sums,
+maxes and mins, and the partials are combined at the end. Memory stays flat
+however many months of observations are scanned.
+
+Observation rows are change-only states (observation_recorder.py); counts
+and sums are weighted by sample_count, so every report is per evaluation,
+exactly as if each evaluation had its own row.
+
+Reports take an iterable of DataFrame chunks (observation_chunks()) or a
+single DataFrame, and return a DataFrame indexed by band (run_reports()
+computes several in the same pass):
+
+    price_bands             edge opportunities per 10¢ price band
+    price_band_outcomes     settled win rate / model accuracy per price band
+    spread_by_price         bid/ask spread per price band
+    bps_bands               distance from spot (bps) bands
+    settlement_time_bands   10%+ edge opportunities per minutes-to-settlement band
+    calibration             model NO probability vs realized NO win rate
+
+The CLIs (view_trades.py, PerformanceTracker.print_price_analysis) only
+format these tables.
+
+Usage:
+    python analytics.py                        # full report: hf_trades.db + archive/
+    python analytics.py --days 30 --db other.db
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from archive import ARCHIVE_DIR, archive_files
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DB_PATH = "hf_trades.db"
+
+# Rows fetched from SQLite per chunk
+CHUNK_SIZE = 200_000
+
+# Minutes-to-settlement bands (inclusive)
+MINUTE_BANDS = [(1, 5), (6, 10), (11, 15), (16, 30), (31, 45), (46, 60)]
+
+# Strike distance from spot in bps: (-inf, -50], (-50, 0], (0, 25], ...
+BPS_EDGES = [-np.inf, -50, 0, 25, 50, 100, 200, 400, np.inf]
+
+# Edge threshold for "opportunity" reports
+OPPORTUNITY_EDGE_PCT = 10
+
+# Win-rate flags used by the renderers
+WIN_RATE_GOOD = 80
+WIN_RATE_BAD = 60
+
+Chunks = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def read_only(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Read-only connection: in WAL mode it never blocks the bot's writes."""
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def _derive(df: pd.DataFrame) -> pd.DataFrame:
+    """Columns the reports group on, computed once per chunk."""
+    # Evaluations each row stands for (rows without sample_count are single samples)
+    df['weight'] = (df['sample_count'].fillna(1).astype(np.int64) if 'sample_count' in df
+                    else np.int64(1))
+    if 'actual_outcome' in df:
+        df['settled'] = df['actual_outcome'].notna().astype(np.int64)
+        df['no_win'] = (df['actual_outcome'] == 'NO_WIN').astype(np.int64)
+        df['no_lose'] = (df['actual_outcome'] == 'NO_LOSE').astype(np.int64)
+    return df
+
+
+def _read_part(path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    """One archive part file; columns added by later migrations read as missing."""
+    if columns is None:
+        return pd.read_parquet(path)
+    present = set(pq.read_schema(path).names)
+    df = pd.read_parquet(path, columns=[c for c in columns if c in present])
+    for col in columns:
+        if col not in present:
+            df[col] = 1 if col == 'sample_count' else None
+    return df
+
+
+class _SeenIds:
+    """
+    Ids already yielded, kept per chunk with the chunk's id range. Archive
+    parts cover disjoint id ranges except after a crash between writing a
+    part and deleting its rows, so only overlapping ranges are compared.
+    """
+
+    def __init__(self):
+        self._chunks: List[tuple] = []   # (min id, max id, ids)
+
+    def drop_seen(self, df: pd.DataFrame, remember: bool = True) -> pd.DataFrame:
+        ids = df['id'].to_numpy(dtype=np.int64)
+        if not ids.size:
+            return df
+        lo, hi = ids.min(), ids.max()
+        seen = np.zeros(ids.size, dtype=bool)
+        for chunk_lo, chunk_hi, chunk_ids in self._chunks:
+            if chunk_lo <= hi and lo <= chunk_hi:
+                seen |= np.isin(ids, chunk_ids)
+        if seen.any():
+            df, ids = df[~seen], ids[~seen]
+        if remember and ids.size:
+            self._chunks.append((ids.min(), ids.max(), ids))
+        return df
+
+
+def observation_chunks(db_path: Optional[str] = DB_PATH, archive_dir: Optional[str] = ARCHIVE_DIR,
+                       columns: Optional[Sequence[str]] = None, settled_only: bool = False,
+                       start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       chunk_size: int = CHUNK_SIZE, conn: Optional[sqlite3.Connection] = None
+                       ) -> Iterator[pd.DataFrame]:
+    """
+    price_observations as DataFrame chunks: the Parquet archive first (one
+    part file at a time), then the hot database. Each id is yielded once - a
+    row left in both places (or in two part files) by an interrupted archive
+    run is not double-counted. Pass conn to read through an already-open
+    (read-only) connection, db_path=None or archive_dir=None to skip a
+    source. start/end are naive UTC like the stored timestamps (a state is
+    selected by its first sample). id and sample_count are always read.
+    """
+    columns = list(columns) if columns else None
+    if columns and 'id' not in columns:
+        columns.append('id')
+    if columns and 'timestamp' not in columns and (start or end):
+        columns.append('timestamp')
+    if columns and 'sample_count' not in columns:
+        columns.append('sample_count')
+
+    seen = _SeenIds()
+    if archive_dir:
+        for path in archive_files('price_observations', start.date() if start else None,
+                                  end.date() if end else None, archive_dir):
+            df = _read_part(path, columns)
+            if start or end:
+                ts = df['timestamp'].astype(str)
+                keep = pd.Series(True, index=df.index)
+                if start:
+                    keep &= ts >= start.isoformat()
+                if end:
+                    keep &= ts < end.isoformat()
+                df = df[keep]
+            if settled_only and 'actual_outcome' in df:
+                df = df[df['actual_outcome'].notna()]
+            df = seen.drop_seen(df)
+            if not df.empty:
+                yield _derive(df.reset_index(drop=True))
+
+    if conn is None and not db_path:
+        return
+    where, params = [], []
+    if settled_only:
+        where.append("actual_outcome IS NOT NULL")
+    if start:
+        where.append("timestamp >= ?")
+        params.append(start.isoformat())
+    if end:
+        where.append("timestamp < ?")
+        params.append(end.isoformat())
+    sql = (f"SELECT {', '.join(columns) if columns else '*'} FROM price_observations"
+           + (f" WHERE {' AND '.join(where)}" if where else ""))
+    own = conn is None
+    conn = conn or read_only(db_path)
+    try:
+        for df in pd.read_sql_query(sql, conn, params=params, chunksize=chunk_size):
+            df = seen.drop_seen(df, remember=False)  # Still in SQLite but already archived
+            if not df.empty:
+                yield _derive(df.reset_index(drop=True))
+    finally:
+        if own:
+            conn.close()
+
+
+def load_trades(db_path: str = DB_PATH, limit: Optional[int] = 50) -> pd.DataFrame:
+    """Most recent trades, newest first."""
+    conn = read_only(db_path)
+    try:
+        return pd.read_sql_query(
+            "SELECT timestamp, ticker, action, contracts, price_cents, edge_pct, btc_price, strike_price "
+            "FROM trades ORDER BY timestamp DESC" + (" LIMIT ?" if limit else ""),
+            conn, params=(limit,) if limit else ())
+    finally:
+        conn.close()
+
+
+def load_sessions(db_path: str = DB_PATH, limit: Optional[int] = 10) -> pd.DataFrame:
+    """Sessions, newest first, with the saved SessionStats fields as columns."""
+    conn = read_only(db_path)
+    try:
+        sessions = pd.read_sql_query(
+            "SELECT id, start_time, end_time, stats_json FROM sessions ORDER BY start_time DESC"
+            + (" LIMIT ?" if limit else ""), conn, params=(limit,) if limit else ())
+    finally:
+        conn.close()
+    stats = pd.DataFrame([json.loads(s) if isinstance(s, str) else {} for s in sessions.pop('stats_json')],
+                         index=sessions.index)
+    return sessions.join(stats)
+
+
+# =============================================================================
+# GROUP-BY ENGINE
+# =============================================================================
+
+def _chunks(data: Chunks) -> Iterable[pd.DataFrame]:
+    return [_derive(data.copy())] if isinstance(data, pd.DataFrame) else data
+
+
+@dataclass
+class Report:
+    """
+    One banded aggregation: rows passing mask (after prepare) are grouped by
+    band, reduced to n plus sum_/max_/min_ columns, and finalize turns the
+    combined totals into the report table. n and the sums are weighted by
+    each row's sample count.
+    """
+    band: Callable[[pd.DataFrame], pd.Series]
+    finalize: Callable[[pd.DataFrame], pd.DataFrame]
+    mask: Optional[Callable[[pd.DataFrame], pd.Series]] = None
+    prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+    sums: Sequence[str] = ()
+    maxes: Sequence[str] = ()
+    mins: Sequence[str] = ()
+
+    def partial(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        if self.prepare is not None:
+            df = self.prepare(df)
+        if self.mask is not None:
+            df = df[self.mask(df)]
+        if df.empty:
+            return None
+        band = self.band(df)
+        weighted = df[list(self.sums)].mul(df['weight'], axis=0).add_prefix('sum_')
+        weighted.insert(0, 'n', df['weight'])
+        part = weighted.groupby(band, observed=True).sum()
+        grouped = df.groupby(band, observed=True)
+        for col in self.maxes:
+            part[f'max_{col}'] = grouped[col].max()
+        for col in self.mins:
+            part[f'min_{col}'] = grouped[col].min()
+        return part
+
+    def combine(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        if not partials:
+            return pd.DataFrame()
+        combined = pd.concat(partials)
+        how = {c: 'max' if c.startswith('max_') else 'min' if c.startswith('min_') else 'sum'
+               for c in combined.columns}
+        return self.finalize(combined.groupby(level=0).agg(how).sort_index())
+
+
+def run_reports(data: Chunks, reports: Dict[str, Report]) -> Dict[str, pd.DataFrame]:
+    """
+    Compute several reports in one pass over the chunks (each chunk is read
+    once and reduced by every report). Also returns the number of
+    evaluations covered as 'rows'.
+    """
+    partials: Dict[str, List[pd.DataFrame]] = {name: [] for name in reports}
+    rows = 0
+    for df in _chunks(data):
+        rows += int(df['weight'].sum())
+        for name, report in reports.items():
+            part = report.partial(df)
+            if part is not None:
+                partials[name].append(part)
+    results = {name: report.combine(partials[name]) for name, report in reports.items()}
+    results['rows'] = rows
+    return results
+
+
+def _labelled(totals: pd.DataFrame, labels: List[str]) -> pd.DataFrame:
+    """Order a label-indexed table by band order, dropping empty bands."""
+    return totals.reindex([label for label in labels if label in totals.index])
+
+
+def _price_band(df: pd.DataFrame) -> pd.Series:
+    return (df['price_cents'] // 10 * 10).astype(np.int64).rename('price_band')
+
+
+def _minute_band_labels() -> List[str]:
+    return [f"{lo}-{hi}" for lo, hi in MINUTE_BANDS]
+
+
+def _minute_band(df: pd.DataFrame) -> pd.Series:
+    minutes = df['minutes_to_settlement']
+    conditions = [(minutes >= lo) & (minutes <= hi) for lo, hi in MINUTE_BANDS]
+    return pd.Series(np.select(conditions, _minute_band_labels(), default='other'),
+                     index=df.index, name='minutes_band')
+
+
+def _bps_band_labels() -> List[str]:
+    return [f"({lo:g}, {hi:g}]" for lo, hi in zip(BPS_EDGES[:-1], BPS_EDGES[1:])]
+
+
+def _bps_band(df: pd.DataFrame) -> pd.Series:
+    return pd.cut(df['bps_above_current'], BPS_EDGES, labels=_bps_band_labels()) \
+        .astype(str).rename('bps_band')
+
+
+def _rate(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    return (numerator / denominator.where(denominator > 0)).fillna(0) * 100
+
+
+# =============================================================================
+# REPORTS
+# =============================================================================
+
+def price_bands_report() -> Report:
+    """Positive-edge observations per 10¢ band: observations, avg/max edge, trades, avg bps."""
+    return Report(
+        band=_price_band,
+        mask=lambda df: df['edge_pct'] > 0,
+        sums=('edge_pct', 'was_traded', 'bps_above_current'), maxes=('edge_pct',),
+        finalize=lambda t: pd.DataFrame({
+            'observations': t['n'],
+            'avg_edge': t['sum_edge_pct'] / t['n'],
+            'max_edge': t['max_edge_pct'],
+            'trades': t['sum_was_traded'].astype(np.int64),
+            'avg_bps': t['sum_bps_above_current'] / t['n'],
+        }),
+    )
+
+
+def price_band_outcomes_report() -> Report:
+    """Settled observations per 10¢ band: wins, losses, win rate, avg edge, model accuracy."""
+    return Report(
+        band=_price_band,
+        mask=lambda df: df['settled'] == 1,
+        sums=('no_win', 'no_lose', 'edge_pct', 'model_was_correct'),
+        finalize=lambda t: pd.DataFrame({
+            'settled': t['n'],
+            'wins': t['sum_no_win'],
+            'losses': t['sum_no_lose'],
+            'win_rate': _rate(t['sum_no_win'], t['n']),
+            'avg_edge': t['sum_edge_pct'] / t['n'],
+            'accuracy': _rate(t['sum_model_was_correct'], t['n']),
+        }),
+    )
+
+
+def spread_by_price_report() -> Report:
+    """Observations with a bid per 10¢ band: avg/max/min spread and spread as % of price."""
+    def with_pct(df):
+        df = df[df['spread_cents'].notna()]
+        return df.assign(spread_pct=df['spread_cents'] * 100.0 / df['price_cents'])
+    return Report(
+        band=_price_band,
+        prepare=with_pct,
+        sums=('spread_cents', 'spread_pct'), maxes=('spread_cents',), mins=('spread_cents',),
+        finalize=lambda t: pd.DataFrame({
+            'observations': t['n'],
+            'avg_spread': t['sum_spread_cents'] / t['n'],
+            'max_spread': t['max_spread_cents'],
+            'min_spread': t['min_spread_cents'],
+            'spread_pct': t['sum_spread_pct'] / t['n'],
+        }),
+    )
+
+
+def bps_bands_report() -> Report:
+    """Per distance-from-spot band: observations, avg edge, settled, NO win rate."""
+    def finalize(t):
+        t = _labelled(t, _bps_band_labels())
+        return pd.DataFrame({
+            'observations': t['n'],
+            'avg_edge': t['sum_edge_pct'] / t['n'],
+            'settled': t['sum_settled'],
+            'win_rate': _rate(t['sum_no_win'], t['sum_settled']),
+        })
+    return Report(band=_bps_band, sums=('edge_pct', 'settled', 'no_win'), finalize=finalize)
+
+
+def settlement_time_bands_report(min_edge: float = OPPORTUNITY_EDGE_PCT) -> Report:
+    """Opportunities with edge >= min_edge per minutes-to-settlement band, with settled win rate."""
+    def finalize(t):
+        t = _labelled(t, _minute_band_labels())
+        return pd.DataFrame({
+            'opportunities': t['n'],
+            'avg_edge': t['sum_edge_pct'] / t['n'],
+            'max_edge': t['max_edge_pct'],
+            'settled': t['sum_settled'],
+            'win_rate': _rate(t['sum_no_win'], t['sum_settled']),
+        })
+    return Report(band=_minute_band, mask=lambda df: df['edge_pct'] >= min_edge,
+                  sums=('edge_pct', 'settled', 'no_win'), maxes=('edge_pct',), finalize=finalize)
+
+
+def calibration_report(bins: int = 10) -> Report:
+    """
+    Settled observations binned by model NO probability: mean predicted vs
+    realized NO win rate (both in %). gap > 0 means the model is overconfident.
+    """
+    def prob_bin(df):
+        return (np.minimum((df['model_prob'] * bins).astype(np.int64), bins - 1) * 100 // bins) \
+            .rename('model_prob_band')
+
+    def finalize(t):
+        predicted = t['sum_model_prob'] / t['n'] * 100
+        actual = _rate(t['sum_no_win'], t['n'])
+        return pd.DataFrame({'settled': t['n'], 'predicted': predicted, 'actual': actual,
+                             'gap': predicted - actual})
+    return Report(band=prob_bin, mask=lambda df: df['settled'] == 1,
+                  sums=('model_prob', 'no_win'), finalize=finalize)
+
+
+def price_bands(data: Chunks) -> pd.DataFrame:
+    return run_reports(data, {'r': price_bands_report()})['r']
+
+
+def price_band_outcomes(data: Chunks) -> pd.DataFrame:
+    return run_reports(data, {'r': price_band_outcomes_report()})['r']
+
+
+def spread_by_price(data: Chunks) -> pd.DataFrame:
+    return run_reports(data, {'r': spread_by_price_report()})['r']
+
+
+def bps_bands(data: Chunks) -> pd.DataFrame:
+    return run_reports(data, {'r': bps_bands_report()})['r']
+
+
+def settlement_time_bands(data: Chunks, min_edge: float = OPPORTUNITY_EDGE_PCT) -> pd.DataFrame:
+    return run_reports(data, {'r': settlement_time_bands_report(min_edge)})['r']
+
+
+def calibration(data: Chunks, bins: int = 10) -> pd.DataFrame:
+    return run_reports(data, {'r': calibration_report(bins)})['r']
+
+
+def spread_summary(spreads: pd.DataFrame) -> Dict:
+    """Overall spread stats from a spread_by_price() table."""
+    if spreads.empty:
+        return {'observations': 0}
+    n = int(spreads['observations'].sum())
+    return {
+        'observations': n,
+        'avg_spread': float((spreads['avg_spread'] * spreads['observations']).sum() / n),
+        'max_spread': float(spreads['max_spread'].max()),
+        'min_spread': float(spreads['min_spread'].min()),
+    }
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+# Columns each report reads (so the archive only loads these)
+PRICE_ANALYSIS_COLUMNS = ['price_cents', 'edge_pct', 'was_traded', 'bps_above_current', 'spread_cents',
+                          'minutes_to_settlement', 'actual_outcome', 'model_was_correct', 'model_prob',
+                          'sample_count']
+
+
+def _flag(win_rate: float) -> str:
+    return "✅" if win_rate >= WIN_RATE_GOOD else "⚠️" if win_rate < WIN_RATE_BAD else "  "
+
+
+def print_price_analysis(data: Chunks, indent: str = "   "):
+    """Print the price level report (every table from one pass over data)."""
+    tables = run_reports(data, {
+        'bands': price_bands_report(),
+        'outcomes': price_band_outcomes_report(),
+        'spreads': spread_by_price_report(),
+        'distance': bps_bands_report(),
+        'timing': settlement_time_bands_report(),
+        'curve': calibration_report(),
+    })
+    count = tables['rows']
+    if count == 0:
+        return
+    print(f"\n📊 Price Level Analysis ({count:,} observations):")
+
+    bands = tables['bands']
+    if not bands.empty:
+        print(f"\n{indent}Price Bucket |    Obs | Avg Edge | Max Edge | Trades | Avg BPS")
+        print(f"{indent}" + "-" * 60)
+        for bucket, row in bands.iterrows():
+            print(f"{indent}{bucket:3d}-{bucket + 9:2d}¢      | {row.observations:6.0f} | {row.avg_edge:7.1f}% | "
+                  f"{row.max_edge:7.1f}% | {row.trades:6.0f} | {row.avg_bps:6.0f}")
+
+    outcomes = tables['outcomes']
+    if not outcomes.empty:
+        print(f"\n{indent}🎯 PRICE BAND OUTCOMES (where does edge break down?):")
+        print(f"{indent}Price Bucket | Settled | Wins | Losses | Win Rate | Avg Edge | Model Accuracy")
+        print(f"{indent}" + "-" * 75)
+        for bucket, row in outcomes.iterrows():
+            print(f"{indent}{bucket:3d}-{bucket + 9:2d}¢      | {row.settled:7.0f} | {row.wins:4.0f} | {row.losses:6.0f} | "
+                  f"{row.win_rate:7.1f}% | {row.avg_edge:7.1f}% | {row.accuracy:6.1f}% {_flag(row.win_rate)}")
+
+    spreads = tables['spreads']
+    summary = spread_summary(spreads)
+    if summary['observations']:
+        print(f"\n{indent}📉 SLIPPAGE ANALYSIS ({summary['observations']:,} observations with bid/ask data):")
+        print(f"{indent}   Average spread: {summary['avg_spread']:.1f}¢")
+        print(f"{indent}   Max spread:     {summary['max_spread']:.0f}¢")
+        print(f"{indent}   Min spread:     {summary['min_spread']:.0f}¢")
+        print(f"\n{indent}   Price Bucket | Avg Spread | Spread %")
+        print(f"{indent}   " + "-" * 40)
+        for bucket, row in spreads.iterrows():
+            print(f"{indent}   {bucket:3d}-{bucket + 9:2d}¢      | {row.avg_spread:9.1f}¢ | {row.spread_pct:7.2f}%")
+
+    distance = tables['distance']
+    if not distance.empty:
+        print(f"\n{indent}📏 DISTANCE FROM SPOT (bps above current):")
+        print(f"{indent}BPS Band      | Obs     | Avg Edge | Settled | Win Rate")
+        print(f"{indent}" + "-" * 55)
+        for band, row in distance.iterrows():
+            print(f"{indent}{band:<13} | {row.observations:7.0f} | {row.avg_edge:7.1f}% | {row.settled:7.0f} | "
+                  f"{row.win_rate:7.1f}%")
+
+    timing = tables['timing']
+    if not timing.empty:
+        print(f"\n{indent}⏱️  TIME TO SETTLEMENT ({OPPORTUNITY_EDGE_PCT}%+ edge opportunities):")
+        print(f"{indent}Min to Settlement | {OPPORTUNITY_EDGE_PCT}%+ Edge Opps | Avg Edge | Win Rate")
+        print(f"{indent}" + "-" * 56)
+        for band, row in timing.iterrows():
+            win_rate = f"{row.win_rate:7.1f}%" if row.settled else "     n/a"
+            print(f"{indent}{band:>17} | {row.opportunities:14.0f} | {row.avg_edge:7.1f}% | {win_rate}")
+
+    curve = tables['curve']
+    if not curve.empty:
+        print(f"\n{indent}🎚️  CALIBRATION (model NO probability vs realized):")
+        print(f"{indent}Model Prob | Settled | Predicted | Actual  | Gap")
+        print(f"{indent}" + "-" * 50)
+        for band, row in curve.iterrows():
+            print(f"{indent}{band:3d}-{band + 9:3d}%   | "
+                  f"{row.settled:7.0f} | {row.predicted:8.1f}% | {row.actual:6.1f}% | {row.gap:+5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Price level analytics over hf_trades.db and the Parquet archive')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--days', type=float, help='Only the last N days (default: everything)')
+    args = parser.parse_args()
+
+    db_path = args.db if os.path.exists(args.db) else None
+    start = datetime.utcnow() - timedelta(days=args.days) if args.days else None
+    t0 = time.perf_counter()
+    print_price_analysis(observation_chunks(db_path, args.archive_dir, PRICE_ANALYSIS_COLUMNS, start=start))
+    print(f"\n   ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Columnar archive for the HF bot's SQLite database (hf_trades.db).
+
+Settled price observations and closed trades older than N hours are moved
+out of the hot database into Parquet files, one directory per UTC day:
+
+    archive/price_observations/date=2026-01-18/part-<first id>-<last id>.parquet
+    archive/trades/date=2026-01-18/part-<first id>-<last id>.parquet
+
+and deleted from SQLite, so the live database only holds what the bot and
+the settlement checks still touch. Historical analysis reads the columns it
+needs straight from the Parquet files (read_archive), without touching the
+bot's database at all.
+
+What is archived:
+- price_observations with an actual_outcome (settled) older than the cutoff
+- every trade row of a ticker whose opens are all liquidated or settled and
+  whose last trade is older than the cutoff (an open position's rows stay)
+
+Files are written before the rows are deleted, and rows are deleted by the
+exact ids written, so a crash can at worst leave a row in both places;
+read_archive and analytics.observation_chunks drop duplicate ids. Freed SQLite pages are reused by new rows,
+so the file stops growing rather than shrinking (VACUUM separately if needed).
+
+Usage:
+    python archive.py                          # archive hf_trades.db, cutoff 24h
+    python archive.py --hours 6 --dry-run      # show what would be archived
+    python archive.py --db other.db --archive-dir /data/archive
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db_schema import connect
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DB_PATH = "hf_trades.db"
+ARCHIVE_DIR = "archive"
+
+# Rows older than this (and settled / closed) are archived
+ARCHIVE_AFTER_HOURS = 24
+
+# Rows read from SQLite per Parquet part file
+CHUNK_ROWS = 200_000
+
+# Wait this long for the bot's write lock before giving up on a delete
+BUSY_TIMEOUT_SEC = 30
+
+ARCHIVED_TABLES = ('price_observations', 'trades')
+
+# SQLite column affinity -> pandas dtype, so every part file has the same schema
+_DTYPES = {'INTEGER': 'Int64', 'REAL': 'float64', 'TEXT': 'string'}
+
+
+def _dtypes(conn: sqlite3.Connection, table: str) -> Dict[str, str]:
+    return {name: _DTYPES.get(col_type.upper(), 'object')
+            for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _cutoff(hours: float) -> str:
+    # Observations and bot trades are stamped with naive utcnow().isoformat()
+    return (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+
+
+def _partition_dir(archive_dir: str, table: str, day: str) -> str:
+    return os.path.join(archive_dir, table, f"date={day}")
+
+
+def _write_part(df: pd.DataFrame, archive_dir: str, table: str, day: str) -> str:
+    """Write one part file atomically (temp file + rename)."""
+    directory = _partition_dir(archive_dir, table, day)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"part-{df['id'].min()}-{df['id'].max()}.parquet")
+    tmp = path + '.tmp'
+    df.to_parquet(tmp, index=False, compression='zstd')
+    os.replace(tmp, path)
+    return path
+
+
+def _delete_ids(conn: sqlite3.Connection, table: str, ids: Sequence[int]):
+    """Delete exactly the archived rows, in one short write transaction."""
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archived_ids (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM archived_ids")
+        conn.executemany("INSERT OR IGNORE INTO archived_ids (id) VALUES (?)", ((int(i),) for i in ids))
+        conn.execute(f"DELETE FROM {table} WHERE id IN (SELECT id FROM archived_ids)")
+        conn.execute("DELETE FROM archived_ids")
+
+
+def _archive_query(conn: sqlite3.Connection, table: str, where: str, params: Sequence,
+                   archive_dir: str, dry_run: bool) -> int:
+    """Archive the rows of table matching where, day by day and chunk by chunk."""
+    days = [day for (day,) in conn.execute(
+        f"SELECT DISTINCT substr(timestamp, 1, 10) FROM {table} WHERE {where} ORDER BY 1", params)]
+    dtypes = _dtypes(conn, table)
+    total = 0
+    for day in days:
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        # Keyset pagination: no cursor stays open across the deletes
+        query = (f"SELECT * FROM {table} WHERE {where} AND timestamp >= ? AND timestamp < ? "
+                 f"AND id > ? ORDER BY id LIMIT {CHUNK_ROWS}")
+        day_rows, last_id = 0, 0
+        while True:
+            chunk = pd.read_sql_query(query, conn, params=(*params, day, next_day, last_id))
+            if chunk.empty:
+                break
+            day_rows += len(chunk)
+            last_id = int(chunk['id'].iloc[-1])
+            if not dry_run:
+                _write_part(chunk.astype(dtypes), archive_dir, table, day)
+                _delete_ids(conn, table, chunk['id'].tolist())
+        total += day_rows
+        print(f"   {'Would archive' if dry_run else 'Archived'} {day_rows:,} {table} rows for {day}")
+    return total
+
+
+def archive_observations(conn: sqlite3.Connection, hours: float = ARCHIVE_AFTER_HOURS,
+                         archive_dir: str = ARCHIVE_DIR, dry_run: bool = False) -> int:
+    """Move settled observations older than hours to Parquet. Returns rows archived."""
+    return _archive_query(conn, 'price_observations',
+                          "actual_outcome IS NOT NULL AND timestamp < ?", (_cutoff(hours),),
+                          archive_dir, dry_run)
+
+
+def archive_trades(conn: sqlite3.Connection, hours: float = ARCHIVE_AFTER_HOURS,
+                   archive_dir: str = ARCHIVE_DIR, dry_run: bool = False) -> int:
+    """
+    Move the trades of fully closed tickers whose last trade is older than
+    hours to Parquet. Returns rows archived.
+    """
+    # An open is still live if it has neither a later liquidate nor a settlement
+    # (same rule as close_expired's open-position query)
+    closed_tickers = """
+        ticker IN (
+            SELECT t.ticker FROM trades t
+            GROUP BY t.ticker
+            HAVING MAX(t.timestamp) < ?
+            AND NOT EXISTS (
+                SELECT 1 FROM trades o
+                WHERE o.ticker = t.ticker AND o.action = 'open' AND o.settlement_result IS NULL
+                AND NOT EXISTS (
+                    SELECT 1 FROM trades l
+                    WHERE l.ticker = o.ticker AND l.action = 'liquidate' AND l.id > o.id
+                )
+            )
+        )
+    """
+    return _archive_query(conn, 'trades', closed_tickers, (_cutoff(hours),), archive_dir, dry_run)
+
+
+def run_archive(db_path: str = DB_PATH, hours: float = ARCHIVE_AFTER_HOURS,
+                archive_dir: str = ARCHIVE_DIR, dry_run: bool = False) -> Dict[str, int]:
+    conn = connect(db_path)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_SEC * 1000}")
+    try:
+        return {
+            'price_observations': archive_observations(conn, hours, archive_dir, dry_run),
+            'trades': archive_trades(conn, hours, archive_dir, dry_run),
+        }
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# READING
+# =============================================================================
+
+def archive_files(table: str, start: Optional[date] = None, end: Optional[date] = None,
+                  archive_dir: str = ARCHIVE_DIR) -> List[str]:
+    """Part files of table for UTC days start..end (inclusive; None = unbounded)."""
+    root = os.path.join(archive_dir, table)
+    if not os.path.isdir(root):
+        return []
+    files = []
+    for name in sorted(os.listdir(root)):
+        if not name.startswith('date='):
+            continue
+        day = date.fromisoformat(name[len('date='):])
+        if (start and day < start) or (end and day > end):
+            continue
+        directory = os.path.join(root, name)
+        files.extend(os.path.join(directory, f) for f in sorted(os.listdir(directory))
+                     if f.endswith('.parquet'))
+    return files
+
+
+def read_archive(table: str, start: Optional[date] = None, end: Optional[date] = None,
+                 columns: Optional[List[str]] = None, archive_dir: str = ARCHIVE_DIR) -> pd.DataFrame:
+    """
+    Archived rows of table for UTC days start..end as one DataFrame, reading
+    only the given columns (plus id, for de-duplication).
+    """
+    if table not in ARCHIVED_TABLES:
+        raise ValueError(f"{table} is not archived (expected one of {ARCHIVED_TABLES})")
+    files = archive_files(table, start, end, archive_dir)
+    read_columns = None if columns is None else list(dict.fromkeys(['id', *columns]))
+    if not files:
+        return pd.DataFrame(columns=read_columns or [])
+    df = pd.concat((pd.read_parquet(f, columns=read_columns) for f in files), ignore_index=True)
+    df = df.drop_duplicates('id', keep='last')
+    return df if columns is None or 'id' in columns else df.drop(columns='id')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive settled observations and closed trades to Parquet')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--hours', type=float, default=ARCHIVE_AFTER_HOURS,
+                        help=f'Archive rows older than this (default {ARCHIVE_AFTER_HOURS})')
+    parser.add_argument('--dry-run', action='store_true', help="Count rows, don't move them")
+    args = parser.parse_args()
+
+    print(f"📦 Archiving {args.db} -> {args.archive_dir}/ (older than {args.hours:g}h)")
+    t0 = time.perf_counter()
+    counts = run_archive(args.db, args.hours, args.archive_dir, args.dry_run)
+    verb = 'Would archive' if args.dry_run else 'Archived'
+    print(f"✅ {verb} {counts['price_observations']:,} observations and {counts['trades']:,} trades "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
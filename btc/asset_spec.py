@@ -0,0 +1,57 @@
+"""
+Asset specs for the HF trading engine.
+
+Everything asset-specific the bot needs - which Kalshi series to trade,
+where to get spot, which DynamoDB table the price collector writes vol to,
+and the sanity bounds that stop us trading on a bad print - lives here so
+BTC and ETH can run side by side in one HFTradingBot process.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class AssetSpec:
+    """One tradable underlying."""
+    symbol: str
+    series: Tuple[str, ...]     # Kalshi series tickers (e.g. hourly above/below)
+    price_url: str              # Coinbase spot endpoint
+    vol_table: str              # DynamoDB table with pk=VOL, sk=LATEST
+    min_price: float            # Refuse to trade outside these bounds
+    max_price: float
+
+    def owns(self, ticker: str) -> bool:
+        """True if a market/event ticker belongs to one of this asset's series."""
+        return any(ticker.startswith(series + '-') for series in self.series)
+
+
+BTC = AssetSpec(
+    symbol='BTC',
+    series=('KXBTCD',),
+    price_url='https://api.coinbase.com/v2/prices/BTC-USD/spot',
+    vol_table='BTCPriceHistory',
+    min_price=10_000,
+    max_price=500_000,
+)
+
+# Fed by eth/lambda_package/eth_price_collector.py
+ETH = AssetSpec(
+    symbol='ETH',
+    series=('KXETHD',),
+    price_url='https://api.coinbase.com/v2/prices/ETH-USD/spot',
+    vol_table='ETHPriceHistory',
+    min_price=300,
+    max_price=50_000,
+)
+
+ASSETS: Dict[str, AssetSpec] = {spec.symbol: spec for spec in (BTC, ETH)}
+
+
+def parse_assets(value: str) -> List[AssetSpec]:
+    """Parse a comma-separated list like 'BTC,ETH' into specs."""
+    symbols = [s.strip().upper() for s in value.split(',') if s.strip()]
+    unknown = [s for s in symbols if s not in ASSETS]
+    if unknown:
+        raise ValueError(f"Unknown asset(s) {', '.join(unknown)} - known: {', '.join(ASSETS)}")
+    return [ASSETS[s] for s in symbols]
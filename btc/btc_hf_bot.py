@@ -15,6 +15,10 @@ Continuous trading bot for Kalshi BTC hourly markets:
 Usage:
     python btc_hf_bot.py --dry-run     # Test with simulated $200 balance
     python btc_hf_bot.py               # Live trading (requires Kalshi API keys)
+    python btc_hf_bot.py --dry-run --event-driven   # React to price/quote updates
+    python btc_hf_bot.py --dry-run --multi-event    # Trade every open event in the series
+    python btc_hf_bot.py --dry-run --multi-event --assets BTC,ETH
+    python btc_hf_bot.py --dry-run --multi-event --event-driven
 """
 
 
@@ -25,16 +29,27 @@ import os
 import sys
 import time
 import signal
+import threading
 import requests
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, List, Tuple
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from zoneinfo import ZoneInfo
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from performance_tracker import PerformanceTracker, TradeRecord, TradeAction
+from lambda_package.theta_surface import ThetaSurface
+from model_calibration import ModelCalibration, CALIBRATION_PATH
+from lambda_package.latency_metrics import LatencyHistogram, StageTimers
+from lambda_package.concurrent_fetch import gather
+from lambda_package.strike_ladder import StrikeLadder
+from lambda_package.position_store import position_item, position_key, query_open_positions
+from asset_spec import AssetSpec, ASSETS, BTC, parse_assets
+from observation_recorder import EVENT_DRIVEN_TOLERANCES
+from position_journal import PositionJournal, JournalReplicator
 
 # Try to import Kalshi client (may fail in dry-run without proper setup)
 try:
@@ -79,6 +94,14 @@ MAX_EXPOSURE_FRACTION = 1.00  # 100% of balance max across all positions
 # Maximum per-position exposure - half Kelly (0.5 * 0.25 = 12.5% of bankroll per position)
 MAX_POSITION_FRACTION = 0.125  # 12.5% of bankroll max per single ticker
 
+# Maximum exposure to one event (one settlement) and to one strike across events
+MAX_EVENT_FRACTION = 0.50     # 50% of bankroll max per event
+MAX_STRIKE_FRACTION = 0.25    # 25% of bankroll max per strike price
+
+# Maximum worst-case loss (every position settles against us). Same as total
+# cost while we only buy NO, but checked on its own so it stays right if not
+MAX_WORST_CASE_FRACTION = 1.00
+
 
 # Minimum edge increase (percentage points) to add to existing position
 EDGE_INCREASE_THRESHOLD = 5.0
@@ -99,6 +122,13 @@ MAX_SLIPPAGE_CENTS = 3  # If (ask - model_fair) > 3 cents, skip
 # Refresh interval in seconds
 REFRESH_INTERVAL_SEC = 10
 
+# How often per-stage latency percentiles are emitted (LATENCY_METRICS=json|emf)
+METRICS_EMIT_SEC = 60
+
+# Strike band - only evaluate strikes up to this many bps above spot
+# (further out fair value is ~100¢ and there is no edge to find)
+MAX_STRIKE_BPS_ABOVE = 300
+
 # Trading cutoff - stop opening NEW positions when this many minutes remain
 TRADING_CUTOFF_MINUTES = 15
 
@@ -108,14 +138,25 @@ ORDER_TIMEOUT_SEC = 30
 # Starting balance for dry-run mode
 DRY_RUN_STARTING_BALANCE = 200.0
 
-# Kalshi BTC series
-BTC_SERIES = "KXBTCD"
+# Kalshi BTC series (per-asset settings live in asset_spec.py)
+BTC_SERIES = BTC.series[0]
 
 # DynamoDB tables
-VOL_TABLE = "BTCPriceHistory"
+VOL_TABLE = BTC.vol_table
 POSITION_TABLE = "BTCHFPositions"
 POSITION_TABLE_DRYRUN = "BTCHFPositions-DryRun"  # Separate table for dry-run
 
+# Local write-ahead journal of position state (see position_journal.py)
+POSITION_JOURNAL = "positions_journal.db"
+POSITION_JOURNAL_DRYRUN = "positions_journal-dryrun.db"
+
+# last_edge is cosmetic (dashboard only) - coalesce updates and write at most
+# this often; opens/adds/closes are always written synchronously
+EDGE_FLUSH_SEC = 30
+
+# While a new journal can't be seeded (DynamoDB load failed), retry this often
+SEED_RETRY_SEC = 60
+
 
 @dataclass
 class Position:
@@ -138,6 +179,11 @@ class Position:
         """Potential profit if NO wins, in dollars."""
         return self.contracts * (100 - self.avg_price_cents) / 100
     
+    @property
+    def event_ticker(self) -> str:
+        """Event this market belongs to (KXBTCD-26JAN1517-T97500 -> KXBTCD-26JAN1517)."""
+        return self.ticker.rsplit('-', 1)[0]
+    
     def is_expired(self) -> bool:
         """Check if this position's contract has already settled."""
         try:
@@ -154,98 +200,355 @@ class Position:
 
 
 
+@dataclass
+class ScanContext:
+    """Market state shared by every strike/position evaluated in one cycle."""
+    et_time: datetime
+    minutes_to_hour: int
+    spot_price: float
+    vol_15m: float
+    event_ticker: str
+    markets: List[Dict]
+    ladder: StrikeLadder
+    expiry_time: str
+    bankroll: float
+    current_exposure: float = 0.0
+    remaining_exposure: float = 0.0
+    can_open_new: bool = False
+    asset: AssetSpec = BTC
+    built_at: float = field(default_factory=time.perf_counter)
+
+
 class PositionTracker:
     """
     Tracks open positions and enforces trading rules.
     Persists positions to DynamoDB for crash recovery.
     Uses separate tables for dry-run vs live mode to prevent conflicts.
+    
+    Exposure aggregates (total cost, contracts, per-event and per-strike
+    exposure) are maintained incrementally on open/add/close, so risk checks
+    are O(1) however many positions are open. All changes to self.positions
+    must go through _insert/_remove to keep them in sync.
+    
+    Writes are split by criticality: open/add/close are durable before
+    returning (so a crash never loses a position we hold), while last_edge
+    changes are buffered write-behind and flushed by flush_edges().
+    
+    With a journal_path, "durable" means committed to the local journal;
+    DynamoDB is updated by a background replicator, startup replays the
+    journal instead of querying DynamoDB, and reconcile() compares the two.
+    Without one, writes go straight to DynamoDB as before.
     """
     
-    def __init__(self, dry_run: bool = True, use_dynamodb: bool = True):
+    def __init__(self, dry_run: bool = True, use_dynamodb: bool = True,
+                 timers: Optional[StageTimers] = None, journal_path: Optional[str] = None):
         self.positions: Dict[str, Position] = {}
+        self._reset_aggregates()
         self.dry_run = dry_run
         self.use_dynamodb = use_dynamodb
+        self.timers = timers or StageTimers('position_tracker')
+        self._dirty_edges: Dict[str, float] = {}   # ticker -> unflushed last_edge
+        self._edges_flushed_at = time.monotonic()
         self._dynamodb_table = None
         self._table_name = POSITION_TABLE_DRYRUN if dry_run else POSITION_TABLE
         
-        if use_dynamodb:
+        self.journal: Optional[PositionJournal] = None
+        self.replicator: Optional[JournalReplicator] = None
+        self._journal_seeded = False
+        self._seed_retry_at = 0.0
+        self._closing = threading.Event()
+        if journal_path:
+            self._open_journal(journal_path)
+        elif use_dynamodb:
             self._load_positions_from_dynamodb()
     
+    # -------------------------------------------------------------------------
+    # Running aggregates
+    # -------------------------------------------------------------------------
+    
+    def _reset_aggregates(self):
+        self._cost_cents = 0.0
+        self._contracts = 0
+        self._event_cost_cents: Dict[str, float] = defaultdict(float)
+        self._strike_cost_cents: Dict[float, float] = defaultdict(float)
+    
+    def _apply(self, pos: Position, sign: int):
+        """Add (sign=1) or remove (sign=-1) a position's contribution."""
+        cost = sign * pos.contracts * pos.avg_price_cents
+        self._cost_cents += cost
+        self._contracts += sign * pos.contracts
+        self._event_cost_cents[pos.event_ticker] += cost
+        self._strike_cost_cents[pos.strike_price] += cost
+        if sign < 0:
+            # Drop emptied buckets so the maps only hold open exposure
+            if self._event_cost_cents[pos.event_ticker] <= 1e-6:
+                del self._event_cost_cents[pos.event_ticker]
+            if self._strike_cost_cents[pos.strike_price] <= 1e-6:
+                del self._strike_cost_cents[pos.strike_price]
+            if not self.positions:
+                self._reset_aggregates()  # No float drift once flat
+    
+    def _insert(self, pos: Position):
+        existing = self.positions.get(pos.ticker)
+        if existing is not None:
+            self._apply(existing, -1)
+        self.positions[pos.ticker] = pos
+        self._apply(pos, 1)
+    
+    def _remove(self, ticker: str) -> Optional[Position]:
+        pos = self.positions.pop(ticker, None)
+        if pos is not None:
+            self._apply(pos, -1)
+        return pos
+    
+    def total_cost(self) -> float:
+        """Total cost of open positions in dollars."""
+        return self._cost_cents / 100
+    
+    def worst_case_loss(self) -> float:
+        """
+        Loss in dollars if every position settles against us. We only hold
+        NO contracts, so the most we can lose is the premium paid.
+        """
+        return self._cost_cents / 100
+    
+    def event_exposure(self, event_ticker: str) -> float:
+        """Cost in dollars of open positions in one event."""
+        return self._event_cost_cents.get(event_ticker, 0.0) / 100
+    
+    def strike_exposure(self, strike_price: float) -> float:
+        """Cost in dollars of open positions at one strike (across events)."""
+        return self._strike_cost_cents.get(strike_price, 0.0) / 100
+    
+    def exposure_by_event(self) -> Dict[str, float]:
+        return {event: cents / 100 for event, cents in self._event_cost_cents.items()}
+    
+    def _limits(self, event_ticker: str, strike_price: float, bankroll: float):
+        """(name, used, cap) in dollars for every limit a new entry must respect."""
+        return (
+            ('TOTAL EXPOSURE', self.total_cost(), bankroll * MAX_EXPOSURE_FRACTION),
+            ('WORST CASE', self.worst_case_loss(), bankroll * MAX_WORST_CASE_FRACTION),
+            ('EVENT MAX', self.event_exposure(event_ticker), bankroll * MAX_EVENT_FRACTION),
+            ('STRIKE MAX', self.strike_exposure(strike_price), bankroll * MAX_STRIKE_FRACTION),
+        )
+    
+    def entry_headroom(self, event_ticker: str, strike_price: float, bankroll: float) -> float:
+        """Dollars that can still go into this event / strike without breaking a limit."""
+        return max(0.0, min(cap - used for _, used, cap in self._limits(event_ticker, strike_price, bankroll)))
+    
+    def limit_reached(self, event_ticker: str, strike_price: float, bankroll: float) -> Optional[str]:
+        """Description of the first exposure limit already reached, or None."""
+        for name, used, cap in self._limits(event_ticker, strike_price, bankroll):
+            if used >= cap:
+                return f"{name}: ${used:.2f} >= ${cap:.2f}"
+        return None
+    
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    
     def _get_table(self):
         """Lazy-load DynamoDB table."""
         if self._dynamodb_table is None:
-            import boto3
-            dynamodb = boto3.resource('dynamodb')
-            self._dynamodb_table = dynamodb.Table(self._table_name)
+            self._dynamodb_table = self._new_table()
         return self._dynamodb_table
     
-    def _load_positions_from_dynamodb(self):
-        """Load existing positions from DynamoDB on startup."""
+    def _new_table(self):
+        import boto3
+        return boto3.resource('dynamodb').Table(self._table_name)
+    
+    @staticmethod
+    def _position_from_item(item: Dict) -> Position:
+        return Position(
+            ticker=item['ticker'],
+            contracts=int(item['contracts']),
+            avg_price_cents=float(item['avg_price_cents']),
+            entry_edge=float(item['entry_edge']),
+            last_edge=float(item['last_edge']),
+            btc_price_at_entry=float(item['btc_price_at_entry']),
+            strike_price=float(item['strike_price']),
+            opened_at=item['opened_at'],
+            expiry_time=item.get('expiry_time', '2000-01-01T00:00:00')  # Default to expired
+        )
+    
+    @staticmethod
+    def _put_item(table, position: Dict):
+        """Write one position item (raises on failure)."""
+        from decimal import Decimal
+        table.put_item(Item=position_item(
+            position['ticker'],
+            contracts=int(position['contracts']),
+            avg_price_cents=Decimal(str(position['avg_price_cents'])),
+            entry_edge=Decimal(str(position['entry_edge'])),
+            last_edge=Decimal(str(position['last_edge'])),
+            btc_price_at_entry=Decimal(str(position['btc_price_at_entry'])),
+            strike_price=Decimal(str(position['strike_price'])),
+            opened_at=position['opened_at'],
+            expiry_time=position['expiry_time'],
+        ))
+    
+    def _load_positions_from_dynamodb(self) -> bool:
+        """Load existing positions from DynamoDB on startup. Returns True on success."""
         try:
             table = self._get_table()
-            response = table.scan(
-                FilterExpression='begins_with(pk, :prefix)',
-                ExpressionAttributeValues={':prefix': 'POS#'}
-            )
             
             loaded = 0
             expired = 0
-            for item in response.get('Items', []):
-                pos = Position(
-                    ticker=item['ticker'],
-                    contracts=int(item['contracts']),
-                    avg_price_cents=float(item['avg_price_cents']),
-                    entry_edge=float(item['entry_edge']),
-                    last_edge=float(item['last_edge']),
-                    btc_price_at_entry=float(item['btc_price_at_entry']),
-                    strike_price=float(item['strike_price']),
-                    opened_at=item['opened_at'],
-                    expiry_time=item.get('expiry_time', '2000-01-01T00:00:00')  # Default to expired
-                )
+            for item in query_open_positions(table):
+                pos = self._position_from_item(item)
+                if pos.ticker in self.positions:
+                    continue  # Already in the journal - our own writes win
                 
                 # Check if expired - don't load stale positions
                 if pos.is_expired():
                     expired += 1
-                    self._delete_position_from_dynamodb(pos.ticker)
+                    self._delete_position(pos.ticker)
                     print(f"  ⏰ Cleaned up expired position: {pos.ticker}")
                 else:
-                    self.positions[pos.ticker] = pos
+                    self._insert(pos)
                     loaded += 1
             
             if loaded > 0:
                 print(f"[PositionTracker] Loaded {loaded} active positions from {self._table_name}")
             if expired > 0:
                 print(f"[PositionTracker] Cleaned up {expired} expired positions")
+            return True
                 
         except Exception as e:
             error_msg = f"[PositionTracker] Could not load from DynamoDB ({self._table_name}): {e}"
             if self.dry_run:
                 # In dry-run, warn but continue (table may not exist yet)
                 print(f"[WARNING] {error_msg}")
+                return False
             else:
                 # In live mode, FAIL HARD - we could duplicate positions otherwise
                 raise RuntimeError(f"CRITICAL: {error_msg}. Cannot safely trade without position state!")
     
-    def _save_position_to_dynamodb(self, pos: Position) -> bool:
-        """Save a position to DynamoDB. Returns True on success."""
+    # -------------------------------------------------------------------------
+    # Journal
+    # -------------------------------------------------------------------------
+    
+    def _open_journal(self, path: str):
+        """Replay the local journal (seeding it from DynamoDB on first use)."""
+        started = time.perf_counter()
+        self.journal = PositionJournal(path)
+        
+        # An unseeded journal only holds what this bot wrote since it was
+        # created - replay that too, seed_journal() adds DynamoDB's positions
+        expired = []
+        for ticker, payload in self.journal.load().items():
+            pos = Position(**payload)
+            if pos.is_expired():
+                expired.append(ticker)
+            else:
+                self._insert(pos)
+        for ticker in expired:
+            self._delete_position(ticker)
+        
+        if not self.journal.is_initialized():
+            # First run with a journal: DynamoDB is the only copy of our state
+            self.seed_journal()
+        else:
+            self._journal_seeded = True
+            print(f"[PositionTracker] Replayed {len(self.positions)} positions from {path} "
+                  f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+                  + (f", cleaned {len(expired)} expired" if expired else ""))
+            pending = self.journal.pending_count()
+            if pending:
+                print(f"[PositionTracker] {pending} journal change(s) still to replicate to DynamoDB")
+        
+        if self.use_dynamodb:
+            table = None
+            def remote_table():
+                nonlocal table  # Own Table for the replicator thread
+                if table is None:
+                    table = self._new_table()
+                return table
+            self.replicator = JournalReplicator(
+                self.journal,
+                put_item=lambda ticker, position: self._put_item(remote_table(), position),
+                delete_item=lambda ticker: remote_table().delete_item(Key=position_key(ticker)),
+            )
+            self.replicator.start()
+    
+    def seed_journal(self) -> bool:
+        """
+        Seed a new journal once DynamoDB's positions are loaded. If the load
+        fails the journal stays unseeded (so a restart tries again too) and
+        the scan loop retries here every SEED_RETRY_SEC. True once seeded.
+        """
+        if not self.journal or self._journal_seeded:
+            return True
+        if time.monotonic() < self._seed_retry_at:
+            return False
+        if self.use_dynamodb and not self._load_positions_from_dynamodb():
+            self._seed_retry_at = time.monotonic() + SEED_RETRY_SEC
+            print(f"[PositionTracker] Journal {self.journal.path} not seeded - "
+                  f"retrying the DynamoDB load in {SEED_RETRY_SEC}s")
+            return False
+        self.journal.seed({t: asdict(p) for t, p in self.positions.items()})
+        self._journal_seeded = True
+        print(f"[PositionTracker] Seeded journal {self.journal.path} with {len(self.positions)} positions")
+        return True
+    
+    def reconcile(self) -> int:
+        """
+        Compare the journal with DynamoDB and queue any drift for replication.
+        Meant for a background thread at startup. Returns tickers re-queued.
+        """
+        if not (self.journal and self.use_dynamodb):
+            return 0
+        try:
+            remote = {item['ticker']: item for item in query_open_positions(self._new_table())}
+        except Exception as e:
+            print(f"[RECONCILE] Could not read {self._table_name}: {e}")
+            return 0
+        
+        if self._closing.is_set():
+            return 0  # Shutting down - the journal is about to close
+        local = self.journal.load()
+        requeued = 0
+        for ticker, position in local.items():
+            item = remote.get(ticker)
+            if item is None or int(item['contracts']) != position['contracts']:
+                print(f"[RECONCILE] {ticker}: DynamoDB out of date - re-replicating")
+                self.journal.touch(ticker)
+                requeued += 1
+        for ticker in remote.keys() - local.keys():
+            # Journal is authoritative for our own writes; leave unknown items alone
+            print(f"[RECONCILE] {ticker} is in {self._table_name} but not in the journal")
+        if requeued:
+            self.replicator.notify()
+        print(f"[RECONCILE] Journal vs DynamoDB: {len(local)} local, {len(remote)} remote, {requeued} re-queued")
+        return requeued
+    
+    def close(self):
+        """Flush buffered edges and pending replication (call on shutdown)."""
+        self._closing.set()
+        self.flush_edges(force=True)
+        if self.replicator:
+            self.replicator.stop()
+        if self.journal:
+            self.journal.close()
+    
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+    
+    def _save_position(self, pos: Position) -> bool:
+        """Persist a position (journal or DynamoDB). Returns True on success."""
+        self._dirty_edges.pop(pos.ticker, None)  # The full item includes last_edge
+        if self.journal:
+            with self.timers.stage('persist_position'):
+                self.journal.upsert(pos.ticker, asdict(pos))
+            if self.replicator:
+                self.replicator.notify()
+            return True
         if not self.use_dynamodb:
             return True
         try:
-            from decimal import Decimal
-            table = self._get_table()
-            table.put_item(Item={
-                'pk': f'POS#{pos.ticker}',
-                'sk': 'CURRENT',
-                'ticker': pos.ticker,
-                'contracts': pos.contracts,
-                'avg_price_cents': Decimal(str(pos.avg_price_cents)),
-                'entry_edge': Decimal(str(pos.entry_edge)),
-                'last_edge': Decimal(str(pos.last_edge)),
-                'btc_price_at_entry': Decimal(str(pos.btc_price_at_entry)),
-                'strike_price': Decimal(str(pos.strike_price)),
-                'opened_at': pos.opened_at,
-                'expiry_time': pos.expiry_time
-            })
+            with self.timers.stage('persist_position'):
+                self._put_item(self._get_table(), asdict(pos))
             return True
         except Exception as e:
             error_msg = f"[PositionTracker] Failed to save to DynamoDB: {e}"
@@ -257,13 +560,21 @@ class PositionTracker:
                 return False  # Caller should NOT proceed with trade
 
     
-    def _delete_position_from_dynamodb(self, ticker: str):
-        """Delete a position from DynamoDB."""
+    def _delete_position(self, ticker: str):
+        """Delete a persisted position (journal or DynamoDB)."""
+        self._dirty_edges.pop(ticker, None)
+        if self.journal:
+            with self.timers.stage('persist_position'):
+                self.journal.delete(ticker)
+            if self.replicator:
+                self.replicator.notify()
+            return
         if not self.use_dynamodb:
             return
         try:
             table = self._get_table()
-            table.delete_item(Key={'pk': f'POS#{ticker}', 'sk': 'CURRENT'})
+            with self.timers.stage('persist_position'):
+                table.delete_item(Key=position_key(ticker))
         except Exception as e:
             print(f"[PositionTracker] Failed to delete from DynamoDB: {e}")
     
@@ -280,8 +591,8 @@ class PositionTracker:
         
         for ticker in expired:
             print(f"  🧹 Cleaning expired position: {ticker}")
-            del self.positions[ticker]
-            self._delete_position_from_dynamodb(ticker)
+            self._remove(ticker)
+            self._delete_position(ticker)
         
         if expired:
             print(f"  📦 Cleaned {len(expired)} expired positions")
@@ -297,7 +608,8 @@ class PositionTracker:
         """Check if we can add to an existing position.
         
         Allow adding if:
-        0. Position hasn't reached max exposure (half Kelly)
+        0. Position hasn't reached max exposure (half Kelly), and neither
+           have the total, worst-case, event or strike limits
         1. Edge increased by 5pp (original rule), OR
         2. Edge still high (>10%) AND price dropped at least 5¢ AND model says 95%+ (averaging down)
         """
@@ -312,6 +624,10 @@ class PositionTracker:
             if current_exposure >= max_position:
                 print(f"  🚫 POSITION MAX: ${current_exposure:.2f} >= ${max_position:.2f} (half Kelly) - skip add")
                 return False
+            reached = self.limit_reached(pos.event_ticker, pos.strike_price, bankroll)
+            if reached:
+                print(f"  🚫 {reached} - skip add")
+                return False
         
         # Rule 1: Edge increased significantly
         edge_increase = current_edge - pos.last_edge
@@ -349,8 +665,8 @@ class PositionTracker:
             opened_at=datetime.utcnow().isoformat(),
             expiry_time=expiry_time
         )
-        self.positions[ticker] = pos
-        self._save_position_to_dynamodb(pos)
+        self._insert(pos)
+        self._save_position(pos)
     
     def add_to_position(self, ticker: str, contracts: int, price_cents: float, edge: float):
         """Add contracts to an existing position."""
@@ -361,35 +677,88 @@ class PositionTracker:
         total_cost = pos.contracts * pos.avg_price_cents + contracts * price_cents
         new_avg = total_cost / total_contracts
         
+        # Cost only grows by the added contracts' cost
+        added_cents = contracts * price_cents
+        self._cost_cents += added_cents
+        self._contracts += contracts
+        self._event_cost_cents[pos.event_ticker] += added_cents
+        self._strike_cost_cents[pos.strike_price] += added_cents
+        
         pos.contracts = total_contracts
         pos.avg_price_cents = new_avg
         pos.last_edge = edge
-        self._save_position_to_dynamodb(pos)
+        self._save_position(pos)
     
     def update_edge(self, ticker: str, edge: float):
-        """Update the current edge for a position."""
-        if ticker in self.positions:
-            self.positions[ticker].last_edge = edge
-            # Don't save on every edge update to reduce DynamoDB writes
+        """Update the current edge for a position (persisted by flush_edges)."""
+        pos = self.positions.get(ticker)
+        if pos and pos.last_edge != edge:
+            pos.last_edge = edge
+            if self.use_dynamodb or self.journal:
+                self._dirty_edges[ticker] = edge
+    
+    def flush_edges(self, force: bool = False) -> int:
+        """
+        Write buffered last_edge values, one targeted UpdateItem per changed
+        position, at most once per EDGE_FLUSH_SEC unless forced.
+        Returns the number of positions written.
+        """
+        if not self._dirty_edges:
+            return 0
+        if not force and time.monotonic() - self._edges_flushed_at < EDGE_FLUSH_SEC:
+            return 0
+        self._edges_flushed_at = time.monotonic()
+        
+        from decimal import Decimal
+        dirty, self._dirty_edges = self._dirty_edges, {}
+        if self.journal:
+            # One local transaction; the replicator pushes the new items
+            with self.timers.stage('persist_edges'):
+                self.journal.update_edges(dirty)
+            if self.replicator:
+                self.replicator.notify()
+            return len(dirty)
+        written = 0
+        with self.timers.stage('persist_edges'):
+            try:
+                table = self._get_table()
+            except Exception as e:
+                print(f"[PositionTracker] Failed to flush edges: {e}")
+                return 0
+            for ticker, edge in dirty.items():
+                try:
+                    table.update_item(
+                        Key=position_key(ticker),
+                        UpdateExpression='SET last_edge = :edge',
+                        # Never recreate a position closed since the edge was buffered
+                        ConditionExpression='attribute_exists(pk)',
+                        ExpressionAttributeValues={':edge': Decimal(str(round(edge, 4)))},
+                    )
+                    written += 1
+                except Exception as e:
+                    if 'ConditionalCheckFailed' not in str(e):
+                        print(f"[PositionTracker] Failed to flush edge for {ticker}: {e}")
+        return written
     
     def close_position(self, ticker: str) -> Optional[Position]:
         """Close and remove a position."""
-        pos = self.positions.pop(ticker, None)
+        pos = self._remove(ticker)
         if pos:
-            self._delete_position_from_dynamodb(ticker)
+            self._delete_position(ticker)
         return pos
     
     def get_all_positions(self) -> List[Position]:
         return list(self.positions.values())
     
     def total_contracts(self) -> int:
-        return sum(p.contracts for p in self.positions.values())
+        return self._contracts
 
 
 class HFTradingBot:
     """High-frequency BTC trading bot."""
     
-    def __init__(self, dry_run: bool = True, refresh_interval: int = REFRESH_INTERVAL_SEC):
+    def __init__(self, dry_run: bool = True, refresh_interval: int = REFRESH_INTERVAL_SEC,
+                 use_journal: bool = True):
         self.dry_run = dry_run
         self.running = False
         self.refresh_interval = refresh_interval
@@ -397,8 +766,37 @@ class HFTradingBot:
         # Simulated balance for dry-run (tracks P&L)
         self._simulated_balance = DRY_RUN_STARTING_BALANCE
         
-        # Position tracker - uses separate DynamoDB tables for dry-run vs live
-        self.position_tracker = PositionTracker(dry_run=dry_run, use_dynamodb=True)
+        # Fair-value surfaces per asset, rebuilt whenever that asset's 15m vol changes
+        self.theta_surfaces: Dict[str, ThetaSurface] = {}
+        
+        # Fitted model corrections (identity if no artifact has been fitted yet)
+        self.calibration = ModelCalibration.load(CALIBRATION_PATH)
+        self._raw_calibration = ModelCalibration()
+        
+        # Latency histograms (populated by both polling and event-driven modes)
+        self.latency = {
+            name: LatencyHistogram(name)
+            for name in ('tick_to_decision', 'decision_to_order_sent')
+        }
+        
+        # Per-stage timers (fetch, evaluate, order send, persistence); emitted as
+        # JSON/EMF lines every METRICS_EMIT_SEC when LATENCY_METRICS is set
+        self.stage_timers = StageTimers('hf_bot')
+        self._metrics_emitted_at = time.monotonic()
+        
+        # Set by EventEngine when running with --event-driven
+        self.event_engine = None
+        
+        # Shared HTTP connection pool for Coinbase/Kalshi requests
+        self.http = requests.Session()
+        
+        # Position tracker - uses separate DynamoDB tables (and journals) for dry-run vs live
+        journal_path = None
+        if use_journal:
+            journal_path = POSITION_JOURNAL_DRYRUN if dry_run else POSITION_JOURNAL
+        self.position_tracker = PositionTracker(dry_run=dry_run, use_dynamodb=True,
+                                                timers=self.stage_timers,
+                                                journal_path=journal_path)
         
         # Performance tracker
         self.performance_tracker = PerformanceTracker(
@@ -409,11 +807,17 @@ class HFTradingBot:
         # Kalshi client for live mode
         if not dry_run and KALSHI_AVAILABLE:
             self.kalshi = KalshiClient()
-            # Sync with actual Kalshi positions on startup
-            self._sync_kalshi_positions()
         else:
             self.kalshi = None
         
+        # Check local state against DynamoDB and Kalshi without holding up startup
+        self._reconcile_thread: Optional[threading.Thread] = None
+        if self.position_tracker.journal:
+            self._reconcile_thread = threading.Thread(target=self._reconcile_positions, name="reconcile", daemon=True)
+            self._reconcile_thread.start()
+        elif self.kalshi:
+            self._sync_kalshi_positions()
+        
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._handle_shutdown)
         signal.signal(signal.SIGTERM, self._handle_shutdown)
@@ -428,7 +832,7 @@ class HFTradingBot:
             
             for pos in positions.get('market_positions', []):
                 ticker = pos.get('ticker', '')
-                if not ticker.startswith(BTC_SERIES):
+                if not any(spec.owns(ticker) for spec in ASSETS.values()):
                     continue
                     
                 kalshi_tickers.add(ticker)
@@ -446,6 +850,24 @@ class HFTradingBot:
         except Exception as e:
             print(f"[WARNING] Could not sync Kalshi positions: {e}")
     
+    def _reconcile_positions(self):
+        """Startup reconciliation of the replayed journal (background thread)."""
+        try:
+            self.position_tracker.reconcile()
+            if self.kalshi:
+                self._sync_kalshi_positions()
+        except Exception as e:
+            print(f"[WARNING] Position reconciliation failed: {e}")
+    
+    def close(self, timeout: float = 10.0):
+        """Stop background work, then flush and close the position tracker."""
+        self.position_tracker._closing.set()  # reconcile() bails out at its next step
+        if self._reconcile_thread and self._reconcile_thread.is_alive():
+            self._reconcile_thread.join(timeout=timeout)
+            if self._reconcile_thread.is_alive():
+                print(f"[WARNING] Reconciliation still running after {timeout:.0f}s - closing anyway")
+        self.position_tracker.close()
+    
     def _handle_shutdown(self, signum, frame):
         """Handle shutdown signals gracefully."""
         print("\n\n🛑 Shutdown signal received...")
@@ -454,36 +876,40 @@ class HFTradingBot:
 
     
     def get_btc_price(self) -> Optional[float]:
+        """Fetch current BTC price from Coinbase."""
+        return self.get_spot_price(BTC)
+    
+    def get_spot_price(self, asset: AssetSpec) -> Optional[float]:
         """
-        Fetch current BTC price from Coinbase.
+        Fetch current spot price for an asset from Coinbase.
         Includes sanity checks to prevent trading on bad data.
         """
         try:
-            url = "https://api.coinbase.com/v2/prices/BTC-USD/spot"
-            response = requests.get(url, timeout=10)
+            response = self.http.get(asset.price_url, timeout=10)
             if response.status_code == 200:
                 price = float(response.json()['data']['amount'])
                 
-                # CRITICAL SANITY CHECK: BTC price must be reasonable
-                if price < 10000 or price > 500000:
-                    print(f"🚨 CRITICAL ERROR: BTC price ${price:,.2f} is outside valid range ($10k-$500k)")
+                # CRITICAL SANITY CHECK: price must be reasonable
+                if price < asset.min_price or price > asset.max_price:
+                    print(f"🚨 CRITICAL ERROR: {asset.symbol} price ${price:,.2f} is outside valid range "
+                          f"(${asset.min_price:,.0f}-${asset.max_price:,.0f})")
                     print(f"   This is likely a data error. REFUSING to trade.")
                     return None
                 
                 return price
                 
         except Exception as e:
-            print(f"[ERROR] Failed to get BTC price: {e}")
+            print(f"[ERROR] Failed to get {asset.symbol} price: {e}")
         return None
 
 
     
-    def get_volatility(self) -> Optional[Dict]:
-        """Fetch volatility from DynamoDB."""
+    def get_volatility(self, asset: AssetSpec = BTC) -> Optional[Dict]:
+        """Fetch volatility from the asset's DynamoDB price table."""
         try:
             import boto3
             dynamodb = boto3.resource('dynamodb')
-            table = dynamodb.Table(VOL_TABLE)
+            table = dynamodb.Table(asset.vol_table)
             
             response = table.get_item(Key={'pk': 'VOL', 'sk': 'LATEST'})
             item = response.get('Item')
@@ -494,7 +920,7 @@ class HFTradingBot:
                     '15m_samples': int(item.get('vol_15m_samples', 0)),
                 }
         except Exception as e:
-            print(f"[ERROR] Failed to get volatility: {e}")
+            print(f"[ERROR] Failed to get {asset.symbol} volatility: {e}")
         return None
     
     def get_et_time(self) -> datetime:
@@ -519,7 +945,7 @@ class HFTradingBot:
         """Fetch all markets for a BTC hourly event."""
         try:
             url = f"https://api.elections.kalshi.com/trade-api/v2/events/{event_ticker}"
-            response = requests.get(url, headers={'Accept': 'application/json'}, timeout=10)
+            response = self.http.get(url, headers={'Accept': 'application/json'}, timeout=10)
             
             if response.status_code == 200:
                 markets = response.json().get('markets', [])
@@ -530,14 +956,48 @@ class HFTradingBot:
             print(f"[ERROR] Failed to get markets: {e}")
         return []
     
+    def _refresh_theta_surface(self, vol_15m: float, asset: AssetSpec = BTC):
+        """Rebuild the asset's fair-value surface if volatility moved since the last build."""
+        if vol_15m <= 0:
+            return
+        surface = self.theta_surfaces.get(asset.symbol)
+        if surface is None or not surface.matches(vol_15m):
+            self.theta_surfaces[asset.symbol] = ThetaSurface.build(vol_15m)
+    
+    def _surface_for(self, vol_15m: float) -> Optional[ThetaSurface]:
+        """A surface built for this vol (the model is asset-agnostic given vol)."""
+        for surface in self.theta_surfaces.values():
+            if surface.matches(vol_15m):
+                return surface
+        return None
+    
     def calculate_model_probability(self, btc_price: float, strike_price: float,
-                                     vol_std_pct: float, minutes_to_settlement: int) -> Optional[float]:
-        """Calculate probability BTC stays below strike."""
+                                     vol_std_pct: float, minutes_to_settlement: int,
+                                     calibrated: bool = True) -> Optional[float]:
+        """
+        Calculate probability BTC stays below strike.
+        
+        With calibrated=False the raw random-walk probability is returned
+        (what observations record, so calibration is always fit on the raw model).
+        """
         if vol_std_pct <= 0 or minutes_to_settlement <= 0:
             return None
         
+        calibration = self.calibration if calibrated else self._raw_calibration
+        
+        # Calibrated vol multiplier: scaling vol by k == scaling distance by 1/k
+        vol_mult = calibration.vol_multiplier(minutes_to_settlement)
+        
+        # Fast path: read off the precomputed surface when it was built for this vol
+        surface = self._surface_for(vol_std_pct)
+        if surface is not None:
+            bps_above = (strike_price - btc_price) / btc_price * 10000 / vol_mult
+            if surface.covers(bps_above, minutes_to_settlement):
+                prob = surface.fair_prob(bps_above, minutes_to_settlement, vol_std_pct)
+                return calibration.recalibrate(prob, minutes_to_settlement)
+        
         # Scale volatility to time remaining
-        vol_scaled = vol_std_pct * math.sqrt(minutes_to_settlement / 15)
+        vol_scaled = vol_std_pct * vol_mult * math.sqrt(minutes_to_settlement / 15)
         
         # Distance in percent
         price_diff_pct = (strike_price - btc_price) / btc_price * 100
@@ -554,7 +1014,7 @@ class HFTradingBot:
             p = d * t * (0.3193815 + t * (-0.3565638 + t * (1.781478 + t * (-1.821256 + t * 1.330274))))
             return 1 - p if z > 0 else p
         
-        return norm_cdf(std_devs_above)
+        return calibration.recalibrate(norm_cdf(std_devs_above), minutes_to_settlement)
     
     def calculate_kalshi_fee_pct(self, price_cents: int) -> float:
         """
@@ -670,13 +1130,34 @@ class HFTradingBot:
     
     def execute_trade(self, ticker: str, contracts: int, price: int,
                       action: TradeAction, btc_price: float, strike_price: float,
-                      model_prob: float, edge: float) -> Optional[str]:
+                      model_prob: float, edge: float, decided_at: Optional[float] = None) -> Optional[str]:
         """
         Execute a trade (or simulate in dry-run).
         Returns order_id on success, None on failure.
         Only returns success if order is actually FILLED.
-        """
         
+        decided_at is the perf_counter() reading when the trade decision was
+        made; it feeds the decision-to-order-sent latency histogram.
+        """
+        order_id = self._execute_trade(ticker, contracts, price, action, btc_price,
+                                       strike_price, model_prob, edge, decided_at)
+        if order_id and self.event_engine:
+            self.event_engine.publish_fill(ticker)
+        return order_id
+    
+    def _record_order_sent(self, decided_at: Optional[float]):
+        """Record decision-to-order-sent latency (just before the order leaves)."""
+        if decided_at is not None:
+            self.latency['decision_to_order_sent'].record_since(decided_at, time.perf_counter())
+    
+    def _persist_trade(self, trade: TradeRecord):
+        with self.stage_timers.stage('persistence'):
+            self.performance_tracker.record_trade(trade)
+    
+    def _execute_trade(self, ticker: str, contracts: int, price: int,
+                       action: TradeAction, btc_price: float, strike_price: float,
+                       model_prob: float, edge: float, decided_at: Optional[float]) -> Optional[str]:
+        """Place (or simulate) the order - see execute_trade."""
         market_prob = price / 100
         cost_cents = contracts * price
         
@@ -694,25 +1175,34 @@ class HFTradingBot:
             model_prob=model_prob,
             market_prob=market_prob
         )
+        if action == TradeAction.LIQUIDATE:
+            pos = self.position_tracker.positions.get(ticker)
+            if pos:
+                trade.entry_price_cents = pos.avg_price_cents
+                trade.opened_at = pos.opened_at
+                trade.entry_edge = pos.entry_edge
         
         if self.dry_run:
+            self._record_order_sent(decided_at)
             trade.order_id = f"DRY-{int(time.time()*1000)}"
-            self.performance_tracker.record_trade(trade)
+            self._persist_trade(trade)
             # Update simulated balance
             self._update_simulated_balance(cost_cents, action)
             return trade.order_id
         
         # Live trade
         if self.kalshi:
+            self._record_order_sent(decided_at)
             try:
                 if action == TradeAction.LIQUIDATE:
                     # Exit: Sell NO contracts at market price
-                    result = self.kalshi.sell_order(
-                        ticker=ticker,
-                        side="no",
-                        count=contracts,
-                        price=None  # Market order for immediate exit
-                    )
+                    with self.stage_timers.stage('order_send'):
+                        result = self.kalshi.sell_order(
+                            ticker=ticker,
+                            side="no",
+                            count=contracts,
+                            price=None  # Market order for immediate exit
+                        )
                     order = result.get('order', {})
                     trade.order_id = order.get('order_id')
                     status = order.get('status', '')
@@ -724,24 +1214,25 @@ class HFTradingBot:
                         print(f"     DO NOT close position tracker - manual intervention needed!")
                         return None  # Do NOT close position
                     
-                    self.performance_tracker.record_trade(trade)
+                    self._persist_trade(trade)
                     return trade.order_id
                     
                 else:
                     # Buy order with limit price
-                    result = self.kalshi.create_order(
-                        ticker=ticker,
-                        side="no",
-                        count=contracts,
-                        price=price
-                    )
+                    with self.stage_timers.stage('order_send'):
+                        result = self.kalshi.create_order(
+                            ticker=ticker,
+                            side="no",
+                            count=contracts,
+                            price=price
+                        )
                     order = result.get('order', {})
                     trade.order_id = order.get('order_id')
                     status = order.get('status', '')
                     
                     if status == 'filled':
                         # Immediately filled - success
-                        self.performance_tracker.record_trade(trade)
+                        self._persist_trade(trade)
                         return trade.order_id
                     
                     elif status == 'resting':
@@ -749,6 +1240,7 @@ class HFTradingBot:
                         # Wait briefly for fill, then cancel if not
                         print(f"  ⏳ Order resting... waiting up to {ORDER_TIMEOUT_SEC}s for fill")
                         
+                        fill_wait_started = time.perf_counter()
                         for _ in range(ORDER_TIMEOUT_SEC // 2):
                             time.sleep(2)
                             try:
@@ -756,7 +1248,9 @@ class HFTradingBot:
                                 current_status = order_status.get('order', {}).get('status', '')
                                 if current_status == 'filled':
                                     print(f"  ✅ Order filled!")
-                                    self.performance_tracker.record_trade(trade)
+                                    self.stage_timers.record(
+                                        'fill_confirm', (time.perf_counter() - fill_wait_started) * 1000)
+                                    self._persist_trade(trade)
                                     return trade.order_id
                                 elif current_status not in ['resting', 'pending']:
                                     # Cancelled or rejected
@@ -785,8 +1279,44 @@ class HFTradingBot:
         return None
 
     
-    def scan_and_trade(self):
-        """Main trading logic - scan markets and execute trades."""
+    def _refresh_exposure(self, ctx: 'ScanContext'):
+        """Recompute remaining exposure and whether new entries are allowed."""
+        tracker = self.position_tracker
+        current_exposure = tracker.total_cost()
+        ctx.current_exposure = current_exposure
+        # Strike limits are per market - _evaluate_market applies them
+        ctx.remaining_exposure = min(
+            ctx.bankroll * MAX_EXPOSURE_FRACTION - current_exposure,
+            ctx.bankroll * MAX_WORST_CASE_FRACTION - tracker.worst_case_loss(),
+            ctx.bankroll * MAX_EVENT_FRACTION - tracker.event_exposure(ctx.event_ticker),
+        )
+        ctx.can_open_new = ctx.minutes_to_hour > TRADING_CUTOFF_MINUTES and ctx.remaining_exposure > 0
+    
+    def _make_scan_context(self, et_time: datetime, minutes_to_settlement: int,
+                           spot_price: float, vol_15m: float, event_ticker: str,
+                           markets: List[Dict], expiry_time: str, bankroll: float,
+                           asset: AssetSpec = BTC) -> 'ScanContext':
+        """Context for one event, with exposure computed from current positions."""
+        ctx = ScanContext(
+            et_time=et_time,
+            minutes_to_hour=minutes_to_settlement,
+            spot_price=spot_price,
+            vol_15m=vol_15m,
+            event_ticker=event_ticker,
+            markets=markets,
+            ladder=StrikeLadder(markets),
+            expiry_time=expiry_time,
+            bankroll=bankroll,
+            asset=asset,
+        )
+        self._refresh_exposure(ctx)
+        return ctx
+    
+    def _build_scan_context(self) -> Optional['ScanContext']:
+        """
+        Fetch everything a scan needs (price, vol, markets, bankroll).
+        Returns None if the cycle should be skipped.
+        """
         et_time = self.get_et_time()
         minutes_to_hour = 60 - et_time.minute
         
@@ -795,30 +1325,43 @@ class HFTradingBot:
         print(f"{'='*60}")
         
         # Clean up expired positions from tracker before each scan
+        self.position_tracker.seed_journal()
         self.position_tracker.cleanup_expired_positions()
-
+        
+        # Price, vol, markets and bankroll are independent - fetch them in parallel
+        event_ticker = self.get_next_hour_event_ticker()
+        fetched = gather({
+            'btc_price': self.get_btc_price,
+            'vol': self.get_volatility,
+            'markets': lambda: self.get_markets(event_ticker),
+            'bankroll': self.get_account_balance,
+        })
+        for name, err in fetched.errors.items():
+            print(f"[ERROR] Fetch {name} failed: {err}")
+        print(f"⚡ Fetched in {fetched.summary()}")
+        self.stage_timers.record_fetch(fetched)
         
         # Get BTC price
-        btc_price = self.get_btc_price()
+        btc_price = fetched.get('btc_price')
         if not btc_price:
             print("[SKIP] Could not get BTC price")
-            return
+            return None
         print(f"📊 BTC: ${btc_price:,.2f}")
         
         # Get volatility
-        vol_data = self.get_volatility()
+        vol_data = fetched.get('vol')
         if not vol_data or vol_data['15m_samples'] < 10:
             print("[SKIP] Insufficient volatility data")
-            return
+            return None
         vol_15m = vol_data['15m_std']
         print(f"📈 Volatility (15m): {vol_15m:.4f}%")
+        self._refresh_theta_surface(vol_15m)
         
         # Get markets
-        event_ticker = self.get_next_hour_event_ticker()
-        markets = self.get_markets(event_ticker)
+        markets = fetched.get('markets')
         if not markets:
             print(f"[SKIP] No markets for {event_ticker}")
-            return
+            return None
         print(f"📋 {len(markets)} markets for {event_ticker}")
         
         # Calculate when this contract expires (top of next hour ET)
@@ -826,227 +1369,282 @@ class HFTradingBot:
         # Convert to UTC for storage (et_time is already timezone-aware)
         expiry_utc = next_hour_et.astimezone(timezone.utc)
         expiry_time = expiry_utc.isoformat()
-
         
         # Get bankroll - CRITICAL: Skip cycle if can't fetch
-        bankroll = self.get_account_balance()
+        bankroll = fetched.get('bankroll')
         if bankroll is None:
             print("[SKIP] Could not get account balance - cannot size positions safely")
-            return
+            return None
         print(f"💰 Bankroll: ${bankroll:.2f}")
         
-        # Calculate current exposure
-        current_exposure = sum(p.total_cost() for p in self.position_tracker.get_all_positions())
-        max_allowed_exposure = bankroll * MAX_EXPOSURE_FRACTION
-        remaining_exposure = max_allowed_exposure - current_exposure
+        ctx = self._make_scan_context(et_time, minutes_to_hour, btc_price, vol_15m,
+                                      event_ticker, markets, expiry_time, bankroll)
         
-        print(f"📊 Exposure: ${current_exposure:.2f} / ${max_allowed_exposure:.2f} ({current_exposure/bankroll*100:.1f}%)")
+        max_allowed_exposure = bankroll * MAX_EXPOSURE_FRACTION
+        print(f"📊 Exposure: ${ctx.current_exposure:.2f} / ${max_allowed_exposure:.2f} ({ctx.current_exposure/bankroll*100:.1f}%)")
         
-        if remaining_exposure <= 0:
-            print(f"⚠️ MAX EXPOSURE REACHED - no new positions until exposure decreases")
+        if ctx.remaining_exposure <= 0:
+            print(f"⚠️ MAX EXPOSURE REACHED (total, worst case or event) - no new positions until exposure decreases")
         
         # Check trading cutoff - don't open new positions in last 15 minutes
-        can_open_new = minutes_to_hour > TRADING_CUTOFF_MINUTES and remaining_exposure > 0
         if minutes_to_hour <= TRADING_CUTOFF_MINUTES:
             print(f"⏰ Trading cutoff: {minutes_to_hour} min remaining (< {TRADING_CUTOFF_MINUTES} min)")
             print("   Will only manage existing positions, no new entries")
         
-        # Scan all strikes above current price
-        for market in markets:
-            strike = market.get('floor_strike')
-            if not strike or strike <= btc_price:
-                continue
-            
-            ticker = market.get('ticker')
-            no_ask = market.get('no_ask', 0)
-            no_bid = market.get('no_bid', 0)
-            
-            # Skip if no ask price available
-            if not no_ask or no_ask <= 0 or no_ask >= 100:
-                continue
-            
-            # Calculate spread for slippage check
-            spread = (no_ask - no_bid) if no_bid > 0 else None
+        return ctx
+    
+    def _evaluate_market(self, ctx: 'ScanContext', market: Dict):
+        """Entry / add logic for a single strike."""
+        btc_price = ctx.spot_price
+        vol_15m = ctx.vol_15m
+        minutes_to_hour = ctx.minutes_to_hour
+        
+        strike = market.get('floor_strike')
+        if not strike or strike <= btc_price:
+            return
+        
+        ticker = market.get('ticker')
+        no_ask = market.get('no_ask', 0)
+        no_bid = market.get('no_bid', 0)
+        
+        # Skip if no ask price available
+        if not no_ask or no_ask <= 0 or no_ask >= 100:
+            return
+        
+        # Calculate model probability
+        model_prob = self.calculate_model_probability(
+            btc_price, strike, vol_15m, minutes_to_hour
+        )
+        if model_prob is None:
+            return
+        
+        # Calculate edge (GROSS and NET)
+        market_prob = no_ask / 100
+        gross_edge = (model_prob - market_prob) * 100
+        fee_pct = self.calculate_kalshi_fee_pct(no_ask)
+        net_edge = gross_edge - fee_pct
+        bps_above = (strike - btc_price) / btc_price * 10000
+        
+        # Update edge for existing positions (use net edge)
+        self.position_tracker.update_edge(ticker, net_edge)
+        
+        # Record observation for price level analytics
+        if gross_edge > 0:
+            self.performance_tracker.record_observation(
+                ticker=ticker,
+                price_cents=no_ask,
+                edge_pct=net_edge,  # Record NET edge for accurate analytics
+                model_prob=self.calculate_model_probability(
+                    btc_price, strike, vol_15m, minutes_to_hour, calibrated=False
+                ),  # Raw model prob - calibration is fit against this
+                market_prob=market_prob,
+                btc_price=btc_price,
+                strike_price=strike,
+                bps_above=bps_above,
+                minutes_to_settlement=minutes_to_hour,
+                was_traded=False,
+                bid_price_cents=no_bid if no_bid > 0 else None,
+                expiry_time=ctx.expiry_time
+            )
+        
+        # Check if NET edge is profitable after fees
+        if net_edge < MIN_EDGE_PCT or not ctx.can_open_new:
+            return
+        decided_at = time.perf_counter()
+        
+        print(f"\n  🎯 {ticker}: Strike ${strike:,.0f} ({bps_above:.0f}bps above)")
+        print(f"     Model: {model_prob*100:.1f}% | Market: {market_prob*100:.1f}%")
+        print(f"     Gross edge: {gross_edge:.1f}% | Fee: {fee_pct:.1f}% | NET: {net_edge:.1f}%")
+        
+        # SLIPPAGE CHECK: Skip if model fair value vs ask price differs too much
+        # Model fair = model_prob * 100 (what we think the contract is worth)
+        model_fair_cents = int(model_prob * 100)
+        slippage = no_ask - model_fair_cents
+        if slippage > MAX_SLIPPAGE_CENTS:
+            print(f"     ⚠️ SKIP: Slippage {slippage}¢ (ask {no_ask}¢ vs fair {model_fair_cents}¢) > max {MAX_SLIPPAGE_CENTS}¢")
+            return
+        else:
+            print(f"     Slippage: {slippage}¢ (ask {no_ask}¢ vs fair {model_fair_cents}¢) ✓")
+        
+        # Whatever Kelly says, stay inside the total / worst-case / event / strike limits
+        headroom = self.position_tracker.entry_headroom(ctx.event_ticker, strike, ctx.bankroll)
+        max_contracts = int(headroom * 100 // no_ask)
+        
+        if self.position_tracker.has_position(ticker):
+            # Check add rules (5pp increase OR average down with 95%+ model, AND within half Kelly)
+            if self.position_tracker.can_add_to_position(ticker, net_edge, no_ask, model_prob, ctx.bankroll):
+                contracts = min(self.calculate_kelly_contracts(model_prob, no_ask, ctx.remaining_exposure),
+                                max_contracts)
+                if contracts > 0:
+                    order_id = self.execute_trade(
+                        ticker, contracts, no_ask, TradeAction.ADD,
+                        btc_price, strike, model_prob, net_edge, decided_at
+                    )
+                    if order_id:
+                        self.position_tracker.add_to_position(ticker, contracts, no_ask, net_edge)
+                        ctx.remaining_exposure -= contracts * no_ask / 100
+        else:
+            # Open new position - use remaining exposure for sizing
+            if max_contracts == 0:
+                print(f"     🚫 No room under the event / strike limits at {no_ask}¢ - skip")
+                return
+            contracts = min(self.calculate_kelly_contracts(model_prob, no_ask, ctx.remaining_exposure),
+                            max_contracts)
+            if contracts > 0:
+                order_id = self.execute_trade(
+                    ticker, contracts, no_ask, TradeAction.OPEN,
+                    btc_price, strike, model_prob, net_edge, decided_at
+                )
+                if order_id:
+                    self.position_tracker.open_position(
+                        ticker, contracts, no_ask, net_edge, btc_price, strike,
+                        ctx.expiry_time
+                    )
+                    ctx.remaining_exposure -= contracts * no_ask / 100
+    
+    def _evaluate_markets(self, ctx: 'ScanContext'):
+        """Entry logic for every strike in the band above spot."""
+        for market in ctx.ladder.above(ctx.spot_price, max_bps=MAX_STRIKE_BPS_ABOVE):
+            self._evaluate_market(ctx, market)
+    
+    def _evaluate_position(self, ctx: 'ScanContext', pos: Position, market: Optional[Dict]):
+        """
+        Exit logic for one open position using a TWO-TIER strategy:
+        1. PROFIT TARGET: Take profit when up 5%+ of entry cost
+        2. STOP LOSS: Only exit on low edge if we're already losing
+        """
+        btc_price = ctx.spot_price
+        
+        # Calculate unrealized P&L
+        entry_cost = pos.total_cost()
+        entry_fee = self.calculate_kalshi_fee(pos.contracts, int(pos.avg_price_cents))
+        
+        # Current market bid for this position
+        current_bid = market.get('no_bid', 0) if market else None
+        
+        if current_bid and current_bid > 0:
+            # Calculate what we'd get if we sold now
+            proceeds = pos.contracts * current_bid / 100
+            exit_fee = self.calculate_kalshi_fee(pos.contracts, current_bid)
+            unrealized_pnl = proceeds - entry_cost - entry_fee - exit_fee
+            unrealized_pct = (unrealized_pnl / entry_cost) * 100 if entry_cost > 0 else 0
             
-            # Calculate model probability
+            # Calculate current model probability for this position
             model_prob = self.calculate_model_probability(
-                btc_price, strike, vol_15m, minutes_to_hour
+                btc_price, pos.strike_price, ctx.vol_15m, ctx.minutes_to_hour
             )
-            if model_prob is None:
-                continue
+            model_prob_pct = (model_prob or 0) * 100
             
-            # Calculate edge (GROSS and NET)
-            market_prob = no_ask / 100
-            gross_edge = (model_prob - market_prob) * 100
-            fee_pct = self.calculate_kalshi_fee_pct(no_ask)
-            net_edge = gross_edge - fee_pct
-            bps_above = (strike - btc_price) / btc_price * 10000
+            # Calculate CURRENT edge (not stale entry edge)
+            market_prob = current_bid / 100
+            current_edge = (model_prob - market_prob) * 100 if model_prob else 0
+            fee_pct = self.calculate_kalshi_fee_pct(current_bid)
+            current_net_edge = current_edge - fee_pct
             
-            # Update edge for existing positions (use net edge)
-            self.position_tracker.update_edge(ticker, net_edge)
+            # Update position's last_edge to current for accurate tracking (persisted by flush_edges)
+            self.position_tracker.update_edge(pos.ticker, current_net_edge)
             
-            # Record observation for price level analytics
-            if gross_edge > 0:
-                self.performance_tracker.record_observation(
-                    ticker=ticker,
-                    price_cents=no_ask,
-                    edge_pct=net_edge,  # Record NET edge for accurate analytics
-                    model_prob=model_prob,
-                    market_prob=market_prob,
-                    btc_price=btc_price,
-                    strike_price=strike,
-                    bps_above=bps_above,
-                    minutes_to_settlement=minutes_to_hour,
-                    was_traded=False,
-                    bid_price_cents=no_bid if no_bid > 0 else None,
-                    expiry_time=expiry_time
-                )
-
-            # Check if NET edge is profitable after fees
-            if net_edge >= MIN_EDGE_PCT and can_open_new:
-                bps_above = (strike - btc_price) / btc_price * 10000
-                print(f"\n  🎯 {ticker}: Strike ${strike:,.0f} ({bps_above:.0f}bps above)")
-                print(f"     Model: {model_prob*100:.1f}% | Market: {market_prob*100:.1f}%")
-                print(f"     Gross edge: {gross_edge:.1f}% | Fee: {fee_pct:.1f}% | NET: {net_edge:.1f}%")
-
-                
-
-                # SLIPPAGE CHECK: Skip if model fair value vs ask price differs too much
-                # Model fair = model_prob * 100 (what we think the contract is worth)
-                model_fair_cents = int(model_prob * 100)
-                slippage = no_ask - model_fair_cents
-                if slippage > MAX_SLIPPAGE_CENTS:
-                    print(f"     ⚠️ SKIP: Slippage {slippage}¢ (ask {no_ask}¢ vs fair {model_fair_cents}¢) > max {MAX_SLIPPAGE_CENTS}¢")
-                    continue
-                else:
-                    print(f"     Slippage: {slippage}¢ (ask {no_ask}¢ vs fair {model_fair_cents}¢) ✓")
-
-                
-                if self.position_tracker.has_position(ticker):
-                    # Check add rules (5pp increase OR average down with 95%+ model, AND within half Kelly)
-                    if self.position_tracker.can_add_to_position(ticker, net_edge, no_ask, model_prob, bankroll):
-
-
-                        contracts = self.calculate_kelly_contracts(model_prob, no_ask, remaining_exposure)
-                        if contracts > 0:
-                            order_id = self.execute_trade(
-                                ticker, contracts, no_ask, TradeAction.ADD,
-                                btc_price, strike, model_prob, net_edge
-                            )
-                            if order_id:
-                                self.position_tracker.add_to_position(ticker, contracts, no_ask, net_edge)
-                                remaining_exposure -= contracts * no_ask / 100
+            # EXIT CONDITION 1: Profit target hit
+            # BUT skip if model says we're very likely to win - hold for $1 payout
+            if unrealized_pct >= PROFIT_TARGET_PCT:
+                if model_prob_pct >= HOLD_IF_LIKELY_WIN_PCT:
+                    print(f"\n  🎯 HOLD FOR WIN {pos.ticker}: P&L +${unrealized_pnl:.2f} ({unrealized_pct:.1f}%) but model={model_prob_pct:.0f}% likely to win")
                 else:
-                    # Open new position - use remaining exposure for sizing
-                    contracts = self.calculate_kelly_contracts(model_prob, no_ask, remaining_exposure)
-                    if contracts > 0:
-                        order_id = self.execute_trade(
-                            ticker, contracts, no_ask, TradeAction.OPEN,
-                            btc_price, strike, model_prob, net_edge
-                        )
-                        if order_id:
-                            self.position_tracker.open_position(
-                                ticker, contracts, no_ask, net_edge, btc_price, strike,
-                                expiry_time
-                            )
-                            remaining_exposure -= contracts * no_ask / 100
-
-        
-        # Check for exits using TWO-TIER strategy
-        # 1. PROFIT TARGET: Take profit when up 5%+ of entry cost
-        # 2. STOP LOSS: Only exit on low edge if we're already losing
-        for pos in list(self.position_tracker.get_all_positions()):
-            # Calculate unrealized P&L
-            entry_cost = pos.total_cost()
-            entry_fee = self.calculate_kalshi_fee(pos.contracts, int(pos.avg_price_cents))
-            
-            # Try to get current market bid for this position
-            current_bid = None
-            for market in markets:
-                if market.get('ticker') == pos.ticker:
-                    current_bid = market.get('no_bid', 0)
-                    break
-            
-            if current_bid and current_bid > 0:
-                # Calculate what we'd get if we sold now
-                proceeds = pos.contracts * current_bid / 100
-                exit_fee = self.calculate_kalshi_fee(pos.contracts, current_bid)
-                unrealized_pnl = proceeds - entry_cost - entry_fee - exit_fee
-                unrealized_pct = (unrealized_pnl / entry_cost) * 100 if entry_cost > 0 else 0
-                
-                # Calculate current model probability for this position
-                model_prob = self.calculate_model_probability(
-                    btc_price, pos.strike_price, vol_15m, minutes_to_hour
-                )
-                model_prob_pct = (model_prob or 0) * 100
-                
-                # Calculate CURRENT edge (not stale entry edge)
-                market_prob = current_bid / 100
-                current_edge = (model_prob - market_prob) * 100 if model_prob else 0
-                fee_pct = self.calculate_kalshi_fee_pct(current_bid)
-                current_net_edge = current_edge - fee_pct
-                
-                # Update position's last_edge to current for accurate tracking
-                pos.last_edge = current_net_edge
-                
-                # EXIT CONDITION 1: Profit target hit
-                # BUT skip if model says we're very likely to win - hold for $1 payout
-                if unrealized_pct >= PROFIT_TARGET_PCT:
-                    if model_prob_pct >= HOLD_IF_LIKELY_WIN_PCT:
-                        print(f"\n  🎯 HOLD FOR WIN {pos.ticker}: P&L +${unrealized_pnl:.2f} ({unrealized_pct:.1f}%) but model={model_prob_pct:.0f}% likely to win")
-                    else:
-                        print(f"\n  💰 PROFIT TARGET {pos.ticker}: +${unrealized_pnl:.2f} ({unrealized_pct:.1f}%) model={model_prob_pct:.0f}%")
-                        order_id = self.execute_trade(
-                            pos.ticker, pos.contracts, current_bid,
-                            TradeAction.LIQUIDATE, btc_price, pos.strike_price,
-                            0, current_net_edge
-                        )
-                        if order_id:
-                            self.position_tracker.close_position(pos.ticker)
-                        continue
-
-                
-                # EXIT CONDITION 2: CURRENT edge dropped AND we're losing
-                if current_net_edge <= EXIT_EDGE_PCT and unrealized_pnl < 0:
-                    print(f"\n  🔴 STOP LOSS {pos.ticker}: edge {current_net_edge:.1f}% AND P&L ${unrealized_pnl:.2f}")
+                    print(f"\n  💰 PROFIT TARGET {pos.ticker}: +${unrealized_pnl:.2f} ({unrealized_pct:.1f}%) model={model_prob_pct:.0f}%")
                     order_id = self.execute_trade(
                         pos.ticker, pos.contracts, current_bid,
                         TradeAction.LIQUIDATE, btc_price, pos.strike_price,
-                        0, current_net_edge
+                        0, current_net_edge, time.perf_counter()
                     )
                     if order_id:
                         self.position_tracker.close_position(pos.ticker)
-                    continue
-                    
-                # Holding - show status
-                status = "📈" if unrealized_pnl >= 0 else "📉"
-                print(f"  {status} HOLD {pos.ticker}: edge {current_net_edge:.1f}%, P&L ${unrealized_pnl:.2f} ({unrealized_pct:.1f}%)")
-
-                
-            else:
-                # No bid available - fall back to edge-only logic
-                if pos.last_edge <= EXIT_EDGE_PCT:
-                    print(f"\n  🔴 EXIT {pos.ticker}: edge dropped to {pos.last_edge:.1f}% (no bid available)")
-                    order_id = self.execute_trade(
-                        pos.ticker, pos.contracts, int(pos.avg_price_cents),
-                        TradeAction.LIQUIDATE, btc_price, pos.strike_price,
-                        0, pos.last_edge
-                    )
-                    if order_id:
-                        self.position_tracker.close_position(pos.ticker)
-
+                    return
+            
+            # EXIT CONDITION 2: CURRENT edge dropped AND we're losing
+            if current_net_edge <= EXIT_EDGE_PCT and unrealized_pnl < 0:
+                print(f"\n  🔴 STOP LOSS {pos.ticker}: edge {current_net_edge:.1f}% AND P&L ${unrealized_pnl:.2f}")
+                order_id = self.execute_trade(
+                    pos.ticker, pos.contracts, current_bid,
+                    TradeAction.LIQUIDATE, btc_price, pos.strike_price,
+                    0, current_net_edge, time.perf_counter()
+                )
+                if order_id:
+                    self.position_tracker.close_position(pos.ticker)
+                return
+            
+            # Holding - show status
+            status = "📈" if unrealized_pnl >= 0 else "📉"
+            print(f"  {status} HOLD {pos.ticker}: edge {current_net_edge:.1f}%, P&L ${unrealized_pnl:.2f} ({unrealized_pct:.1f}%)")
         
-        # Summary
-        positions = self.position_tracker.get_all_positions()
+        else:
+            # No bid available - fall back to edge-only logic
+            if pos.last_edge <= EXIT_EDGE_PCT:
+                print(f"\n  🔴 EXIT {pos.ticker}: edge dropped to {pos.last_edge:.1f}% (no bid available)")
+                order_id = self.execute_trade(
+                    pos.ticker, pos.contracts, int(pos.avg_price_cents),
+                    TradeAction.LIQUIDATE, btc_price, pos.strike_price,
+                    0, pos.last_edge, time.perf_counter()
+                )
+                if order_id:
+                    self.position_tracker.close_position(pos.ticker)
+    
+    def _print_position_summary(self):
+        tracker = self.position_tracker
+        positions = tracker.get_all_positions()
         if positions:
-            total_exposure = sum(p.total_cost() for p in positions)
-            print(f"\n📦 Open positions: {len(positions)}, Total contracts: {self.position_tracker.total_contracts()}")
-            print(f"   Total exposure: ${total_exposure:.2f}")
+            print(f"\n📦 Open positions: {len(positions)}, Total contracts: {tracker.total_contracts()}")
+            print(f"   Total exposure: ${tracker.total_cost():.2f}")
+            if len(tracker.exposure_by_event()) > 1:
+                for event, exposure in sorted(tracker.exposure_by_event().items()):
+                    print(f"   {event}: ${exposure:.2f}")
             for p in positions:
                 print(f"   {p.ticker}: {p.contracts} @ {p.avg_price_cents:.0f}¢ (edge: {p.last_edge:.1f}%)")
-
     
-    def run(self):
+    def scan_and_trade(self) -> Optional['ScanContext']:
+        """Main trading logic - scan markets and execute trades."""
+        timers = self.stage_timers
+        with timers.stage('scan'):
+            ctx = self._build_scan_context()
+            if ctx is None:
+                return None
+            
+            # Scan strikes in the band above current price
+            with timers.stage('evaluate_entries'):
+                self._evaluate_markets(ctx)
+            
+            # Check open positions for exits
+            with timers.stage('evaluate_exits'):
+                for pos in list(self.position_tracker.get_all_positions()):
+                    self._evaluate_position(ctx, pos, ctx.ladder.get(pos.ticker))
+        
+        self._print_position_summary()
+        return ctx
+    
+    def flush_observations(self):
+        """Write this cycle's buffered observations (one transaction)."""
+        with self.stage_timers.stage('observations_flush'):
+            self.performance_tracker.flush_observations()
+    
+    def settle_expired_observations(self):
+        """Check for expired contracts and update outcomes from official results."""
+        if self.dry_run:
+            settled = self.performance_tracker.update_settlement_outcomes()
+            if settled:
+                print(f"   📊 Updated {settled} contract settlements")
+    
+    def print_latency_summary(self):
+        print(f"\n⏱️  Latency:")
+        for hist in self.latency.values():
+            print(f"   {hist.format_line()}")
+        self.stage_timers.emit()
+    
+    def maybe_emit_metrics(self):
+        """Emit the stage-timer window every METRICS_EMIT_SEC (no-op when disabled)."""
+        if time.monotonic() - self._metrics_emitted_at >= METRICS_EMIT_SEC:
+            self._metrics_emitted_at = time.monotonic()
+            self.stage_timers.emit()
+    
+    def run(self, event_driven: bool = False, assets: Optional[List[AssetSpec]] = None):
         """Main loop - run until shutdown."""
         mode = "DRY-RUN 🧪" if self.dry_run else "LIVE 🔴"
         print(f"\n{'#'*70}")
@@ -1064,20 +1662,39 @@ class HFTradingBot:
         print(f"{'#'*70}\n")
         
         self.running = True
-
+        
+        # Multi-event mode: one scheduler cycle replaces scan_and_trade
+        scan = self.scan_and_trade
+        if assets:
+            from event_scheduler import EventScheduler
+            scan = EventScheduler(self, assets).run_cycle
+        
+        if event_driven:
+            from event_engine import EventEngine
+            # Every tick is evaluated - coarser states keep the table ~10x smaller
+            self.performance_tracker.set_observation_tolerances(EVENT_DRIVEN_TOLERANCES)
+            try:
+                EventEngine(self, scan=scan, assets=assets).run()
+            finally:
+                print("\n🛑 Shutting down...")
+                self.close()
+                self.print_latency_summary()
+                self.performance_tracker.print_summary()
+                self.performance_tracker.save_session()
+                print("👋 Goodbye!")
+            return
         
         try:
             while self.running:
                 try:
-                    self.scan_and_trade()
+                    scan()
                     
                     # Check for expired contracts and update outcomes
-                    btc_price = self.get_btc_price()
-                    if btc_price and self.dry_run:
-                        settled = self.performance_tracker.update_settlement_outcomes(btc_price)
-                        if settled:
-                            print(f"   📊 Updated {settled} contract settlements")
-                            
+                    self.flush_observations()
+                    self.settle_expired_observations()
+                    self.position_tracker.flush_edges()
+                    self.maybe_emit_metrics()
+                    
                 except Exception as e:
                     print(f"\n[ERROR] Scan failed: {e}")
                     import traceback
@@ -1092,6 +1709,8 @@ class HFTradingBot:
         
         finally:
             print("\n🛑 Shutting down...")
+            self.close()
+            self.print_latency_summary()
             self.performance_tracker.print_summary()
             self.performance_tracker.save_session()
             print("👋 Goodbye!")
@@ -1103,11 +1722,24 @@ def main():
                         help='Run in dry-run mode (no real trades)')
     parser.add_argument('--interval', type=int, default=REFRESH_INTERVAL_SEC,
                         help=f'Refresh interval in seconds (default: {REFRESH_INTERVAL_SEC})')
+    parser.add_argument('--event-driven', action='store_true', default=False,
+                        help='React to price/quote updates instead of fixed-interval scans')
+    parser.add_argument('--multi-event', action='store_true', default=False,
+                        help='Trade every open event for --assets instead of only the next BTC hour')
+    parser.add_argument('--assets', default=BTC.symbol,
+                        help=f'Comma-separated assets for --multi-event: {", ".join(ASSETS)} (default: {BTC.symbol})')
+    parser.add_argument('--no-journal', action='store_true', default=False,
+                        help='Write positions straight to DynamoDB instead of via the local journal')
     
     args = parser.parse_args()
+    try:
+        assets = parse_assets(args.assets) if args.multi_event else None
+    except ValueError as e:
+        parser.error(str(e))
     
-    bot = HFTradingBot(dry_run=args.dry_run, refresh_interval=args.interval)
-    bot.run()
+    bot = HFTradingBot(dry_run=args.dry_run, refresh_interval=args.interval,
+                       use_journal=not args.no_journal)
+    bot.run(event_driven=args.event_driven, assets=assets)
 
 
 if __name__ == "__main__":
@@ -5,69 +5,22 @@ Close out expired positions in the trading database.
 This script:
 1. Finds all open positions (opened but never liquidated)
 2. Checks if their contracts have expired (hour has passed)
-3. Fetches actual settlement results from Kalshi API
+3. Fetches actual settlement results from Kalshi API (settlement_service.py)
 4. Adds liquidate records with correct P&L based on whether NO won or lost
 """
-import sqlite3
-import re
-import requests
+import os
+import sys
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
-DB_PATH = "hf_trades.db"
-
-def parse_ticker_hour(ticker: str) -> datetime:
-    """
-    Extract the settlement hour from a ticker.
-    e.g., KXBTCD-25DEC1410-T89249.99 -> 2025-12-25 14:10 ET
-    """
-    # Pattern: KXBTCD-YYMmmDDHH-T...
-    match = re.match(r'KXBTCD-(\d{2})([A-Z]{3})(\d{2})(\d{2})', ticker)
-    if not match:
-        return None
-    
-    year = 2000 + int(match.group(1))
-    month_str = match.group(2)
-    day = int(match.group(3))
-    hour = int(match.group(4))
-    
-    months = {'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
-              'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12}
-    month = months.get(month_str, 1)
-    
-    et_tz = ZoneInfo("America/New_York")
-    return datetime(year, month, day, hour, 0, 0, tzinfo=et_tz)
-
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def get_event_ticker(ticker: str) -> str:
-    """Extract event ticker from position ticker (e.g., KXBTCD-25DEC1817-T85749.99 -> KXBTCD-25DEC1817)"""
-    parts = ticker.rsplit('-', 1)
-    return parts[0] if len(parts) >= 1 else None
-
-
-def fetch_settlement_results(event_ticker: str) -> dict:
-    """
-    Fetch settlement results for an event from Kalshi API.
-    Returns dict mapping strike -> result ('yes' or 'no')
-    """
-    results = {}
-    try:
-        resp = requests.get(
-            f'https://api.elections.kalshi.com/trade-api/v2/events/{event_ticker}',
-            timeout=10
-        )
-        if resp.status_code == 200:
-            markets = resp.json().get('markets', [])
-            for m in markets:
-                strike = m.get('floor_strike')
-                result = m.get('result')  # 'yes', 'no', or None if not settled
-                status = m.get('status')  # 'determined' if settled
-                if strike and result:
-                    results[strike] = result
-    except Exception as e:
-        print(f"  ⚠️ Could not fetch settlement for {event_ticker}: {e}")
-    return results
+from db_schema import connect
+from lambda_package.pnl_projection import closed_trade, sqlite_record_close
+from lambda_package.projector import PNL, TRADE, feed_event, sqlite_projector
+from settlement_service import SettlementService, get_event_ticker, parse_ticker_hour
 
+DB_PATH = "hf_trades.db"
 
 def close_expired_positions(dry_run: bool = True):
     """
@@ -76,8 +29,9 @@ def close_expired_positions(dry_run: bool = True):
     Args:
         dry_run: If True, just print what would be done. If False, actually update DB.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)  # Migrates the schema if needed
     cursor = conn.cursor()
+    events = sqlite_projector(conn)  # Keeps the dashboard views in step
     
     # Get current ET time
     utc_now = datetime.now(timezone.utc)
@@ -116,10 +70,9 @@ def close_expired_positions(dry_run: bool = True):
         if settlement_time and et_now >= settlement_time:
             events_to_check.add(event_ticker)
     
-    # Fetch settlement results for all expired events
-    settlement_cache = {}
-    for event in events_to_check:
-        settlement_cache[event] = fetch_settlement_results(event)
+    # Fetch settlement results for all expired events (one call per event, in parallel)
+    settlements = SettlementService(conn)
+    settlements.resolve(events_to_check)
     
     closed_count = 0
     total_pnl = 0
@@ -139,19 +92,9 @@ def close_expired_positions(dry_run: bool = True):
             continue
         
         # Get actual settlement result from Kalshi
-        event_ticker = get_event_ticker(ticker)
-        results = settlement_cache.get(event_ticker, {})
+        result = settlements.outcome(ticker, strike)
         
-        # Find result for this strike
-        result = results.get(strike)
-        if not result:
-            # Try to find close match (floating point issues)
-            for s, r in results.items():
-                if abs(s - strike) < 1:
-                    result = r
-                    break
-        
-        if not result:
+        if not result:  # Not published yet, or not a yes/no result
             print(f"  ⚠️ No settlement result for {ticker} (strike {strike})")
             continue
         
@@ -177,14 +120,14 @@ def close_expired_positions(dry_run: bool = True):
         
         if not dry_run:
             # Insert liquidate record with UTC timestamp for consistency
+            closed_at = datetime.now(timezone.utc).isoformat()
             cursor.execute("""
                 INSERT INTO trades (timestamp, ticker, action, side, contracts, price_cents,
                                    edge_pct, btc_price, strike_price, model_prob, market_prob,
                                    order_id, settlement_result, realized_pnl)
                 VALUES (?, ?, 'liquidate', 'NO', ?, ?, 0, 0, ?, 0, 0, ?, ?, ?)
             """, (
-                datetime.now(timezone.utc).isoformat(),
-
+                closed_at,
                 ticker,
                 contracts,
                 exit_price,
@@ -193,6 +136,14 @@ def close_expired_positions(dry_run: bool = True):
                 settlement_result,
                 pnl
             ))
+            events.append(feed_event(TRADE, {
+                'timestamp': closed_at, 'ticker': ticker, 'action': 'liquidate',
+                'contracts': contracts, 'price_cents': exit_price, 'edge_pct': 0, 'strike_price': strike,
+            }))
+            # Settlements pay no exit fee
+            projection = sqlite_record_close(conn, closed_trade(ticker, contracts, entry_price, exit_price,
+                                                                closed_at, opened_at=opened_ts, exit_fee=0))
+            events.append(feed_event(PNL, projection))
 
         
         closed_count += 1
@@ -202,9 +153,10 @@ def close_expired_positions(dry_run: bool = True):
     print(f"Positions to close: {closed_count}")
     print(f"Total P&L: ${total_pnl:.2f}")
     
-    if not dry_run and closed_count > 0:
-        conn.commit()
-        print("✅ Changes committed to database")
+    if not dry_run:
+        conn.commit()  # Also keeps the P&L projection/views if this run created them
+        if closed_count > 0:
+            print("✅ Changes committed to database")
     
     conn.close()
     return closed_count, total_pnl
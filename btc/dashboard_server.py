@@ -5,9 +5,14 @@ Serves the HTML UI and provides JSON API endpoint
 """
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import json
-import sqlite3
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db_schema import connect
+from lambda_package.projector import sqlite_load_views, trades_since
 
 DB_PATH = "hf_trades.db"
 
@@ -29,11 +34,15 @@ class DashboardHandler(SimpleHTTPRequestHandler):
     
     def get_status_data(self):
         """Get current trading status"""
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect(DB_PATH)  # Migrates the schema if needed
         cursor = conn.cursor()
         
+        # Positions and trade summaries come from the projector's read models
+        views = sqlite_load_views(conn)
+        hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+        
         # Get latest BTC price
-        cursor.execute("SELECT btc_price FROM price_observations ORDER BY timestamp DESC LIMIT 1")
+        cursor.execute("SELECT btc_price FROM price_observations ORDER BY COALESCE(last_seen, timestamp) DESC LIMIT 1")
         row = cursor.fetchone()
         btc_price = row[0] if row else 0
         
@@ -43,36 +52,27 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         minutes_to_settlement = int((next_hour - now).total_seconds() / 60)
         
         # Get open positions
-        cursor.execute("""
-            SELECT ticker, contracts, price_cents, edge_pct, strike_price, timestamp
-            FROM trades
-            WHERE action = 'open'
-            AND ticker NOT IN (SELECT ticker FROM trades WHERE action = 'liquidate')
-            ORDER BY timestamp DESC
-        """)
-        
         open_positions = []
         total_exposure = 0
-        for row in cursor.fetchall():
-            ticker, contracts, price, edge, strike, ts = row
-            exposure = contracts * price / 100
+        for pos in sorted(views['open_positions'].values(), key=lambda p: p['opened_at'], reverse=True):
+            exposure = pos['contracts'] * pos['avg_price_cents'] / 100
             total_exposure += exposure
             open_positions.append({
-                'ticker': ticker,
-                'contracts': contracts,
-                'price_cents': int(price),
-                'edge': edge,
-                'strike': strike,
-                'opened': datetime.fromisoformat(ts).strftime("%m/%d %H:%M")
+                'ticker': pos['ticker'],
+                'contracts': pos['contracts'],
+                'price_cents': int(pos['avg_price_cents']),
+                'edge': pos['entry_edge'],
+                'strike': pos['strike_price'],
+                'opened': datetime.fromisoformat(pos['opened_at']).strftime("%m/%d %H:%M")
             })
         
         # Get recent opportunities
         cursor.execute("""
-            SELECT ticker, price_cents, edge_pct, strike_price, timestamp
+            SELECT ticker, price_cents, edge_pct, strike_price, COALESCE(last_seen, timestamp) AS seen
             FROM price_observations
             WHERE edge_pct >= 10
-            AND timestamp > datetime('now', '-10 minutes')
-            ORDER BY timestamp DESC
+            AND COALESCE(last_seen, timestamp) > datetime('now', '-10 minutes')
+            ORDER BY seen DESC
             LIMIT 10
         """)
         
@@ -88,38 +88,21 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             })
         
         # Get hourly summary
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_trades,
-                AVG(edge_pct) as avg_edge
-            FROM trades
-            WHERE timestamp > datetime('now', '-1 hour')
-        """)
-        
-        row = cursor.fetchone()
+        last_hour = trades_since(views, hour_ago)
         hourly_summary = {
-            'trades': row[0] if row else 0,
-            'avg_edge': row[1] if row and row[1] else 0
+            'trades': len(last_hour),
+            'avg_edge': sum(t['edge_pct'] for t in last_hour) / len(last_hour) if last_hour else 0
         }
         
         # Get closed trades
-        cursor.execute("""
-            SELECT ticker, contracts, price_cents, edge_pct, timestamp
-            FROM trades
-            WHERE action = 'liquidate'
-            AND timestamp > datetime('now', '-1 hour')
-            ORDER BY timestamp DESC
-        """)
-        
         closed_trades = []
-        for row in cursor.fetchall():
-            ticker, contracts, price, edge, ts = row
+        for t in trades_since(views, hour_ago, actions=('liquidate',)):
             closed_trades.append({
-                'ticker': ticker,
-                'contracts': contracts,
-                'price': int(price),
-                'edge': edge,
-                'closed': datetime.fromisoformat(ts).strftime("%H:%M:%S")
+                'ticker': t['ticker'],
+                'contracts': t['contracts'],
+                'price': int(t['price_cents']),
+                'edge': t['edge_pct'],
+                'closed': datetime.fromisoformat(t['timestamp']).strftime("%H:%M:%S")
             })
         
         conn.close()
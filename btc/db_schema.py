@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Versioned schema for the HF bot's SQLite database (hf_trades.db).
+
+Each migration is a list of steps applied in one transaction; the
+database's PRAGMA user_version records the last one applied, and
+schema_migrations keeps a row per migration with when it ran. migrate()
+is cheap once a database is current (one PRAGMA read), so every process
+that opens the database calls it.
+
+Add a migration by appending to MIGRATIONS - never edit one that has
+shipped. A step is an SQL statement or a callable taking the connection
+(for backfills), run inside the migration's transaction.
+
+Usage:
+    python db_schema.py                 # migrate hf_trades.db, print version
+    python db_schema.py other.db
+"""
+
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple, Union
+
+DB_PATH = "hf_trades.db"
+
+
+def _backfill_pnl_projection(conn: sqlite3.Connection):
+    from lambda_package.pnl_projection import sqlite_backfill
+    sqlite_backfill(conn)
+
+
+def _backfill_read_models(conn: sqlite3.Connection):
+    from lambda_package.projector import sqlite_backfill_views
+    sqlite_backfill_views(conn)
+
+
+Step = Union[str, Callable[[sqlite3.Connection], None]]
+
+# (version, name, steps)
+MIGRATIONS: List[Tuple[int, str, List[Step]]] = [
+    (1, "baseline tables", [
+        """
+        CREATE TABLE IF NOT EXISTS trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            action TEXT NOT NULL,
+            side TEXT NOT NULL,
+            contracts INTEGER NOT NULL,
+            price_cents INTEGER NOT NULL,
+            edge_pct REAL NOT NULL,
+            btc_price REAL NOT NULL,
+            strike_price REAL NOT NULL,
+            model_prob REAL NOT NULL,
+            market_prob REAL NOT NULL,
+            order_id TEXT,
+            settlement_result TEXT,
+            realized_pnl REAL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            start_time TEXT NOT NULL,
+            end_time TEXT,
+            stats_json TEXT
+        )
+        """,
+        # Price level observations - tracks ALL edge opportunities (traded or not)
+        # Enhanced with outcome tracking and slippage data
+        """
+        CREATE TABLE IF NOT EXISTS price_observations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            price_cents INTEGER NOT NULL,
+            edge_pct REAL NOT NULL,
+            model_prob REAL NOT NULL,
+            market_prob REAL NOT NULL,
+            btc_price REAL NOT NULL,
+            strike_price REAL NOT NULL,
+            bps_above_current REAL NOT NULL,
+            minutes_to_settlement INTEGER NOT NULL,
+            was_traded INTEGER DEFAULT 0,
+            -- Slippage tracking
+            bid_price_cents INTEGER,
+            spread_cents INTEGER,
+            -- Settlement outcome tracking (updated after contract settles)
+            actual_outcome TEXT,  -- 'NO_WIN', 'NO_LOSE', or NULL if not settled
+            settlement_btc_price REAL,
+            model_was_correct INTEGER  -- 1 if model prediction matched outcome
+        )
+        """,
+        # Pending settlements - contracts we're tracking for outcome
+        """
+        CREATE TABLE IF NOT EXISTS pending_settlements (
+            ticker TEXT PRIMARY KEY,
+            strike_price REAL NOT NULL,
+            expiry_time TEXT NOT NULL,
+            observation_count INTEGER DEFAULT 0
+        )
+        """,
+    ]),
+    (2, "query indexes", [
+        # settlement_service: UPDATE ... FROM settlement_results (joined on ticker)
+        "CREATE INDEX IF NOT EXISTS idx_observations_ticker ON price_observations(ticker)",
+        # Latest BTC price: ORDER BY timestamp DESC LIMIT 1
+        "CREATE INDEX IF NOT EXISTS idx_observations_timestamp ON price_observations(timestamp)",
+        # Outcome analysis / calibration: WHERE actual_outcome IS NOT NULL
+        "CREATE INDEX IF NOT EXISTS idx_observations_outcome ON price_observations(actual_outcome)",
+        # close_expired NOT EXISTS (ticker = ? AND action = 'liquidate' AND id > ?),
+        # update_settlement WHERE ticker = ?
+        "CREATE INDEX IF NOT EXISTS idx_trades_ticker_action_id ON trades(ticker, action, id)",
+        # Recent trades: ORDER BY timestamp DESC
+        "CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)",
+        # expiry_time < now
+        "CREATE INDEX IF NOT EXISTS idx_pending_settlements_expiry ON pending_settlements(expiry_time)",
+    ]),
+    # Change-only observations (observation_recorder.py): a row is a state that
+    # lasted from timestamp to last_seen over sample_count evaluations. Existing
+    # rows are single samples (last_seen NULL, sample_count 1) - no table rewrite.
+    (3, "observation states", [
+        "ALTER TABLE price_observations ADD COLUMN last_seen TEXT",
+        "ALTER TABLE price_observations ADD COLUMN sample_count INTEGER NOT NULL DEFAULT 1",
+    ]),
+    # Realized P&L projection (lambda_package/pnl_projection.py), built from the
+    # trades so far. IF NOT EXISTS / the backfill's existence check: databases
+    # from before this migration may already have it.
+    (4, "pnl projection", [
+        """
+        CREATE TABLE IF NOT EXISTS pnl_projection (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            state_json TEXT NOT NULL
+        )
+        """,
+        _backfill_pnl_projection,
+    ]),
+    # Dashboard read models (lambda_package/projector.py), built from the trades
+    # and the P&L projection
+    (5, "dashboard read models", [
+        """
+        CREATE TABLE IF NOT EXISTS read_models (
+            name TEXT PRIMARY KEY,
+            state_json TEXT NOT NULL
+        )
+        """,
+        _backfill_read_models,
+    ]),
+    # Latest BTC price: a change-only state is current until last_seen, so the
+    # newest row is ORDER BY COALESCE(last_seen, timestamp) DESC LIMIT 1
+    (6, "latest observation index", [
+        "CREATE INDEX IF NOT EXISTS idx_observations_latest "
+        "ON price_observations(COALESCE(last_seen, timestamp))",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+    """
+    Apply pending migrations up to target (default: latest), each in its own
+    transaction. Returns the resulting schema version.
+    """
+    target = LATEST_VERSION if target is None else target
+    current = schema_version(conn)
+    for version, name, steps in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        # Explicit transaction: sqlite3 would otherwise autocommit the DDL
+        conn.commit()
+        isolation, conn.isolation_level = conn.isolation_level, None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if schema_version(conn) >= version:
+                conn.execute("ROLLBACK")  # Another process got there first
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR REPLACE INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                         (version, name, datetime.now(timezone.utc).isoformat()))
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.isolation_level = isolation
+        print(f"[db_schema] Migrated to v{version}: {name}")
+    return schema_version(conn)
+
+
+def connect(path: str = DB_PATH) -> sqlite3.Connection:
+    """Open the database and bring its schema up to date."""
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    return conn
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    conn = connect(path)
+    print(f"✅ {path} at schema v{schema_version(conn)}")
+    conn.close()
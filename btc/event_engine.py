@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Event-Driven Engine for the BTC High-Frequency Trading Bot
+
+Instead of rescanning every strike on a fixed timer, producer threads watch
+for changes and push events onto a queue:
+
+- SPOT_TICK: BTC spot moved           → re-evaluate strikes near spot + open positions
+- QUOTE:     a market's bid/ask moved → re-evaluate that strike only
+- FILL:      one of our orders filled → re-check that position
+- TIMER:     periodic full rebuild    → fresh vol/markets/bankroll + settlements
+             (the only retry after a failed rebuild; ticks are dropped until then)
+
+The rebuild is the bot's scan_and_trade (the next BTC hour) or, with
+--multi-event, EventScheduler.run_cycle: every active event of every asset
+gets a context, spot is polled per asset, quotes per event, and each update
+is evaluated against the context of the event it belongs to.
+
+A single dispatcher thread drains the queue and coalesces bursts (latest spot
+tick wins, latest quote per ticker wins) so a flood of updates costs one
+evaluation each. All bot state is mutated from the dispatcher thread only.
+
+Usage:
+    python btc_hf_bot.py --dry-run --event-driven
+    python btc_hf_bot.py --dry-run --event-driven --multi-event --assets BTC,ETH
+"""
+
+import math
+import queue
+import threading
+import time
+import traceback
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from asset_spec import BTC, AssetSpec
+from event_scheduler import parse_close_time
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# How often producers poll their sources
+SPOT_POLL_SEC = 1.0
+QUOTE_POLL_SEC = 2.0
+
+# Spot ticks only re-evaluate strikes within this many bps above spot
+# (further out the fair value is ~100¢ and a small move cannot create edge)
+SPOT_TICK_BAND_BPS = 150
+
+# Ignore spot changes smaller than this (dollars)
+MIN_SPOT_CHANGE = 1.0
+
+# Dispatcher wait for the first event of a batch
+DISPATCH_TIMEOUT_SEC = 0.5
+
+
+class EventType(Enum):
+    SPOT_TICK = "SPOT_TICK"
+    QUOTE = "QUOTE"
+    FILL = "FILL"
+    TIMER = "TIMER"
+
+
+@dataclass
+class Event:
+    """A market/bot state change. created_at is a time.perf_counter() reading."""
+    type: EventType
+    ticker: Optional[str] = None
+    btc_price: Optional[float] = None     # spot of `symbol` (BTC unless multi-asset)
+    symbol: str = BTC.symbol
+    market: Optional[Dict] = None
+    created_at: float = field(default_factory=time.perf_counter)
+
+
+class EventEngine:
+    """Runs an HFTradingBot off price/quote/fill events."""
+
+    def __init__(self, bot, scan: Optional[Callable] = None,
+                 assets: Optional[List[AssetSpec]] = None,
+                 spot_poll_sec: float = SPOT_POLL_SEC,
+                 quote_poll_sec: float = QUOTE_POLL_SEC,
+                 band_bps: float = SPOT_TICK_BAND_BPS):
+        self.bot = bot
+        # Full rebuild: returns one ScanContext, a list of them, or None
+        self.scan = scan or bot.scan_and_trade
+        self.assets = assets or [BTC]
+        self.spot_poll_sec = spot_poll_sec
+        self.quote_poll_sec = quote_poll_sec
+        self.rebuild_sec = bot.refresh_interval
+        self.band_bps = band_bps
+
+        self.events: "queue.Queue[Event]" = queue.Queue()
+        self.contexts: Dict[str, object] = {}  # event_ticker -> ScanContext from the last rebuild
+        self._event_tickers: List[str] = []    # read by the quote poller
+
+        bot.event_engine = self
+
+    # -------------------------------------------------------------------------
+    # Producers
+    # -------------------------------------------------------------------------
+
+    def publish(self, event: Event):
+        self.events.put(event)
+
+    def publish_fill(self, ticker: str):
+        self.publish(Event(EventType.FILL, ticker=ticker))
+
+    def _sleep(self, seconds: float):
+        """Sleep in small steps so producers exit promptly on shutdown."""
+        deadline = time.monotonic() + seconds
+        while self.bot.running and time.monotonic() < deadline:
+            time.sleep(min(0.2, max(deadline - time.monotonic(), 0)))
+
+    def _spot_loop(self):
+        last_prices: Dict[str, float] = {}
+        while self.bot.running:
+            for asset in self.assets:
+                price = self.bot.get_spot_price(asset)
+                last_price = last_prices.get(asset.symbol)
+                if price and (last_price is None or abs(price - last_price) >= MIN_SPOT_CHANGE):
+                    last_prices[asset.symbol] = price
+                    self.publish(Event(EventType.SPOT_TICK, btc_price=price, symbol=asset.symbol))
+            self._sleep(self.spot_poll_sec)
+
+    def _quote_loop(self):
+        last_quotes: Dict[str, tuple] = {}
+        while self.bot.running:
+            for event_ticker in self._event_tickers:
+                for market in self.bot.get_markets(event_ticker):
+                    ticker = market.get('ticker')
+                    quote = (market.get('no_bid', 0), market.get('no_ask', 0))
+                    if last_quotes.get(ticker) != quote:
+                        last_quotes[ticker] = quote
+                        self.publish(Event(EventType.QUOTE, ticker=ticker, market=market))
+            self._sleep(self.quote_poll_sec)
+
+    def _timer_loop(self):
+        while self.bot.running:
+            self._sleep(self.rebuild_sec)
+            if self.bot.running:
+                self.publish(Event(EventType.TIMER))
+
+    # -------------------------------------------------------------------------
+    # Dispatcher
+    # -------------------------------------------------------------------------
+
+    def _drain(self):
+        """Block for one event, then take everything else already queued."""
+        try:
+            batch = [self.events.get(timeout=DISPATCH_TIMEOUT_SEC)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                batch.append(self.events.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _rebuild(self):
+        """Full scan: refresh contexts, evaluate everything, settle observations."""
+        result = self.scan()
+        contexts = result if isinstance(result, list) else [result] if result else []
+        self.contexts = {ctx.event_ticker: ctx for ctx in contexts}
+        if contexts:
+            self._event_tickers = list(self.contexts)
+        self.bot.flush_observations()
+        self.bot.settle_expired_observations()
+        self.bot.position_tracker.flush_edges()
+        self.bot.maybe_emit_metrics()
+
+    def _clock_rolled(self) -> bool:
+        """Refresh minutes-to-settlement; True once any event has settled."""
+        now = datetime.now(timezone.utc)
+        for ctx in self.contexts.values():
+            minutes_left = math.ceil((parse_close_time(ctx.expiry_time) - now).total_seconds() / 60)
+            if minutes_left <= 0:
+                return True
+            ctx.minutes_to_hour = minutes_left
+        return False
+
+    def _context_for(self, ticker: str):
+        """Context of the event a market ticker belongs to (None if not active)."""
+        return self.contexts.get(ticker.rsplit('-', 1)[0])
+
+    def _on_spot_tick(self, event: Event):
+        # Exits only for positions in an active event; the rest wait for the rebuild
+        positions_by_event = defaultdict(list)
+        for pos in self.bot.position_tracker.get_all_positions():
+            positions_by_event[pos.event_ticker].append(pos)
+        for ctx in list(self.contexts.values()):
+            if ctx.asset.symbol != event.symbol:
+                continue
+            ctx.spot_price = event.btc_price
+            self.bot._refresh_exposure(ctx)
+            for market in ctx.ladder.above(ctx.spot_price, max_bps=self.band_bps):
+                self.bot._evaluate_market(ctx, market)
+            for pos in positions_by_event.get(ctx.event_ticker, []):
+                self.bot._evaluate_position(ctx, pos, ctx.ladder.get(pos.ticker))
+
+    def _on_quote(self, event: Event):
+        ctx = self._context_for(event.ticker)
+        market = ctx.ladder.update(event.market) if ctx else None
+        if market is None:
+            return  # new strike or event listed - picked up on the next rebuild
+        self.bot._refresh_exposure(ctx)
+        self.bot._evaluate_market(ctx, market)
+        pos = self.bot.position_tracker.get_position(event.ticker)
+        if pos:
+            self.bot._evaluate_position(ctx, pos, market)
+
+    def _on_fill(self, event: Event):
+        ctx = self._context_for(event.ticker)
+        pos = self.bot.position_tracker.get_position(event.ticker)
+        if ctx and pos:
+            self.bot._evaluate_position(ctx, pos, ctx.ladder.get(event.ticker))
+
+    def _dispatch(self, batch):
+        # Coalesce: any TIMER subsumes the rest, latest spot/quote wins
+        if any(e.type == EventType.TIMER for e in batch):
+            self._rebuild()
+            return
+        if not self.contexts:
+            # Last rebuild failed: wait for the next TIMER rather than hit the
+            # API on every tick while it is failing
+            return
+
+        spot: Optional[Event] = None
+        quotes: Dict[str, Event] = {}
+        fills: Dict[str, Event] = {}
+        for e in batch:
+            if e.type == EventType.SPOT_TICK:
+                spot = e
+            elif e.type == EventType.QUOTE:
+                quotes[e.ticker] = e
+            elif e.type == EventType.FILL:
+                fills[e.ticker] = e
+
+        if self._clock_rolled():
+            self._rebuild()
+            return
+
+        tick_to_decision = self.bot.latency['tick_to_decision']
+        for handler, events in ((self._on_spot_tick, [spot] if spot else []),
+                                (self._on_quote, quotes.values()),
+                                (self._on_fill, fills.values())):
+            for e in events:
+                handler(e)
+                tick_to_decision.record_since(e.created_at, time.perf_counter())
+
+    def run(self):
+        """Start producers and dispatch until the bot stops running."""
+        producers = [
+            threading.Thread(target=self._spot_loop, name="spot-poller", daemon=True),
+            threading.Thread(target=self._quote_loop, name="quote-poller", daemon=True),
+            threading.Thread(target=self._timer_loop, name="rebuild-timer", daemon=True),
+        ]
+        print(f"⚡ Event-driven mode ({', '.join(a.symbol for a in self.assets)}): "
+              f"spot every {self.spot_poll_sec}s, quotes every "
+              f"{self.quote_poll_sec}s, full rebuild every {self.rebuild_sec}s "
+              f"(spot band {self.band_bps:.0f}bps)")
+
+        self.publish(Event(EventType.TIMER))
+        for t in producers:
+            t.start()
+
+        while self.bot.running:
+            batch = self._drain()
+            if not batch:
+                continue
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                print(f"\n[ERROR] Event dispatch failed: {e}")
+                traceback.print_exc()
+
+        for t in producers:
+            t.join(timeout=2)
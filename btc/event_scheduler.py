@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Multi-Event Scheduler for the BTC High-Frequency Trading Bot
+
+Runs the per-event strategy (HFTradingBot._evaluate_market/_evaluate_position)
+over every open event for one or more assets (see asset_spec.py) from one
+process.
+
+Per cycle the expensive work is shared, so cost grows with the number of
+strikes evaluated rather than with network round trips per event:
+- ONE paginated /markets?series_ticker=...&status=open listing per series,
+  grouped by event_ticker (instead of one /events call per event)
+- ONE price and volatility fetch per asset, ONE balance fetch, all in
+  parallel with the listings
+- ONE theta surface per asset, one HTTP connection pool and one exposure
+  budget across every asset
+Minutes to settlement come from each event's close_time, so events closing
+at different times are priced correctly side by side.
+
+Usage:
+    python btc_hf_bot.py --dry-run --multi-event
+    python btc_hf_bot.py --dry-run --multi-event --assets BTC,ETH
+    python btc_hf_bot.py --dry-run --multi-event --event-driven
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from asset_spec import AssetSpec
+from lambda_package.concurrent_fetch import gather
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+KALSHI_API = "https://api.elections.kalshi.com/trade-api/v2"
+
+# Page size for the /markets listing (Kalshi max is 1000)
+MARKETS_PAGE_LIMIT = 1000
+
+# Safety cap on pagination per series per cycle
+MAX_PAGES = 10
+
+# Only trade events settling within this many minutes. The hourly series list
+# several hours ahead; past the theta surface's 60 minutes the model prices in
+# closed form. 60 here would only ever admit the next hour's event.
+MAX_EVENT_MINUTES = 4 * 60
+
+
+def parse_close_time(close_time: str) -> Optional[datetime]:
+    """Parse Kalshi's ISO close_time into an aware UTC datetime."""
+    try:
+        dt = datetime.fromisoformat(close_time.replace('Z', '+00:00'))
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except (AttributeError, ValueError):
+        return None
+
+
+def fetch_open_markets(session, series_ticker: str) -> Dict[str, List[Dict]]:
+    """
+    List every open market in a series with one paginated request chain.
+
+    Returns {event_ticker: [markets]}.
+    """
+    by_event: Dict[str, List[Dict]] = defaultdict(list)
+    cursor = None
+    for _ in range(MAX_PAGES):
+        params = {'series_ticker': series_ticker, 'status': 'open', 'limit': MARKETS_PAGE_LIMIT}
+        if cursor:
+            params['cursor'] = cursor
+        response = session.get(f"{KALSHI_API}/markets", params=params,
+                               headers={'Accept': 'application/json'}, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        for market in data.get('markets', []):
+            by_event[market.get('event_ticker')].append(market)
+        cursor = data.get('cursor')
+        if not cursor:
+            break
+    return dict(by_event)
+
+
+class EventScheduler:
+    """Keeps the set of active events and runs the bot's strategy on each."""
+
+    def __init__(self, bot, assets: List[AssetSpec], max_event_minutes: int = MAX_EVENT_MINUTES):
+        self.bot = bot
+        self.assets = assets
+        self.max_event_minutes = max_event_minutes
+        self.active_events: Dict[str, datetime] = {}  # event_ticker -> close time (UTC)
+
+    def _fetch(self):
+        """Balance plus per-asset price, vol and series listings, in parallel."""
+        calls = {'bankroll': self.bot.get_account_balance}
+        for asset in self.assets:
+            calls[f"price:{asset.symbol}"] = lambda a=asset: self.bot.get_spot_price(a)
+            calls[f"vol:{asset.symbol}"] = lambda a=asset: self.bot.get_volatility(a)
+            for series in asset.series:
+                calls[f"series:{series}"] = lambda s=series: fetch_open_markets(self.bot.http, s)
+        return gather(calls)
+
+    def build_contexts(self):
+        """One ScanContext per active event, sharing price/vol per asset and the bankroll."""
+        now = datetime.now(timezone.utc)
+        et_time = self.bot.get_et_time()
+
+        print(f"\n{'='*60}")
+        print(f"🔍 Multi-event scan at {et_time.strftime('%H:%M:%S')} ET ({', '.join(a.symbol for a in self.assets)})")
+        print(f"{'='*60}")
+
+        self.bot.position_tracker.seed_journal()
+        self.bot.position_tracker.cleanup_expired_positions()
+
+        fetched = self._fetch()
+        for name, err in fetched.errors.items():
+            print(f"[ERROR] Fetch {name} failed: {err}")
+        print(f"⚡ Fetched in {fetched.summary()}")
+
+        bankroll = fetched.get('bankroll')
+        if bankroll is None:
+            print("[SKIP] Could not get account balance - cannot size positions safely")
+            return []
+        print(f"💰 Bankroll: ${bankroll:.2f}")
+
+        contexts = []
+        self.active_events = {}
+        for asset in self.assets:
+            # A missing price/vol only sidelines that asset
+            spot = fetched.get(f"price:{asset.symbol}")
+            vol_data = fetched.get(f"vol:{asset.symbol}")
+            if not spot:
+                print(f"[SKIP] {asset.symbol}: could not get price")
+                continue
+            if not vol_data or vol_data['15m_samples'] < 10:
+                print(f"[SKIP] {asset.symbol}: insufficient volatility data")
+                continue
+            vol_15m = vol_data['15m_std']
+            self.bot._refresh_theta_surface(vol_15m, asset)
+            print(f"📊 {asset.symbol}: ${spot:,.2f} | 📈 Vol (15m): {vol_15m:.4f}%")
+
+            for series in asset.series:
+                for event_ticker, markets in (fetched.get(f"series:{series}") or {}).items():
+                    close = parse_close_time(markets[0].get('close_time'))
+                    if close is None:
+                        continue
+                    minutes_left = math.ceil((close - now).total_seconds() / 60)
+                    if not 0 < minutes_left <= self.max_event_minutes:
+                        continue
+                    self.active_events[event_ticker] = close
+                    contexts.append(self.bot._make_scan_context(
+                        et_time, minutes_left, spot, vol_15m, event_ticker,
+                        markets, close.isoformat(), bankroll, asset,
+                    ))
+
+        contexts.sort(key=lambda c: c.minutes_to_hour)
+        for ctx in contexts:
+            print(f"📋 {ctx.event_ticker}: {len(ctx.ladder)} markets, {ctx.minutes_to_hour} min to settlement")
+        if not contexts:
+            print(f"[SKIP] No open events within {self.max_event_minutes} min")
+        return contexts
+
+    def run_cycle(self) -> List:
+        """Evaluate every active event; exposure is shared across all events and assets."""
+        contexts = self.build_contexts()
+
+        # Entries - soonest-settling event first
+        for ctx in contexts:
+            # Earlier events may have opened positions - recompute the shared budget
+            self.bot._refresh_exposure(ctx)
+            self.bot._evaluate_markets(ctx)
+
+        # Exits - group positions by event once rather than per event
+        positions_by_event = defaultdict(list)
+        for pos in self.bot.position_tracker.get_all_positions():
+            positions_by_event[pos.event_ticker].append(pos)
+        for ctx in contexts:
+            for pos in positions_by_event.get(ctx.event_ticker, []):
+                self.bot._evaluate_position(ctx, pos, ctx.ladder.get(pos.ticker))
+
+        self.bot._print_position_summary()
+        return contexts
@@ -4,12 +4,21 @@ Generate static status.json file for CloudFront deployment
 Run this periodically (e.g., every 10 seconds) to update the dashboard
 """
 import json
-import sqlite3
+import os
 import math
+import sys
 import requests
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db_schema import connect
+from lambda_package.theta_surface import ThetaSurface
+from lambda_package.pnl_projection import empty_projection
+from lambda_package.position_store import query_open_positions
+from lambda_package.projector import load_views, sqlite_load_views, trades_since
+
 DB_PATH = "hf_trades.db"
 OUTPUT_FILE = "status.json"
 VOL_TABLE = "BTCPriceHistory"
@@ -49,14 +58,14 @@ def calculate_kalshi_fee(contracts, price_cents):
 
 def generate_status():
     """Generate status JSON file"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)  # Migrates the schema if needed
     cursor = conn.cursor()
     
     # Get current volatility from DynamoDB
     vol_std = get_volatility()
     
     # Get latest BTC price
-    cursor.execute("SELECT btc_price FROM price_observations ORDER BY timestamp DESC LIMIT 1")
+    cursor.execute("SELECT btc_price FROM price_observations ORDER BY COALESCE(last_seen, timestamp) DESC LIMIT 1")
     row = cursor.fetchone()
     btc_price = row[0] if row else 0
     
@@ -76,28 +85,27 @@ def generate_status():
     hour = next_hour_dt.strftime('%H')
     current_event_prefix = f"KXBTCD-{year}{month}{day}{hour}"  # e.g., KXBTCD-25DEC1912
     
-    # Read positions from DynamoDB (source of truth - bot's position tracker)
-    # This is more reliable than SQLite which has complex open/add/liquidate sequences
+    # Read positions from DynamoDB (source of truth - bot's position tracker),
+    # via the views the stream projector keeps (projector.py)
     rows = []
     try:
         import boto3
         dynamodb = boto3.resource('dynamodb')
         table = dynamodb.Table('BTCHFPositions-DryRun')
-        resp = table.scan(
-            FilterExpression='begins_with(pk, :prefix)',
-            ExpressionAttributeValues={':prefix': 'POS#'}
-        )
-        for item in resp.get('Items', []):
-            ticker = item.get('ticker', '')
-            if ticker.startswith(current_event_prefix):
-                rows.append((
-                    ticker,
-                    int(item.get('contracts', 0)),
-                    float(item.get('avg_price_cents', 0)),
-                    float(item.get('last_edge', 0)),
-                    float(item.get('strike_price', 0)),
-                    item.get('opened_at', '')
-                ))
+        views = load_views(table)
+        if views is not None:
+            items = [p for t, p in views['open_positions'].items() if t.startswith(current_event_prefix)]
+        else:
+            items = query_open_positions(table, current_event_prefix)  # Projector not deployed yet
+        for item in items:
+            rows.append((
+                item.get('ticker', ''),
+                int(item.get('contracts', 0)),
+                float(item.get('avg_price_cents', 0)),
+                float(item.get('last_edge', 0)),
+                float(item.get('strike_price', 0)),
+                item.get('opened_at', '')
+            ))
     except Exception as e:
         print(f"[WARNING] Could not read from DynamoDB: {e}")
 
@@ -299,115 +307,38 @@ def generate_status():
         print(f"Error fetching fair values: {e}")
     
 
-    # Get hourly summary
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as total_trades,
-            AVG(edge_pct) as avg_edge
-        FROM trades
-        WHERE timestamp > datetime('now', '-1 hour')
-    """)
+    # Trade summaries, closed trades and realized P&L from the local read models
+    local_views = sqlite_load_views(conn)
+    projection = local_views['pnl'] or empty_projection()
+    hour_ago = utc_now - timedelta(hours=1)
     
-    row = cursor.fetchone()
+    last_hour = trades_since(local_views, hour_ago)
     hourly_summary = {
-        'trades': row[0] if row else 0,
-        'avg_edge': row[1] if row and row[1] else 0
+        'trades': len(last_hour),
+        'avg_edge': sum(t['edge_pct'] for t in last_hour) / len(last_hour) if last_hour else 0
     }
     
-    # Get closed trades with entry price and P&L
-    cursor.execute("""
-        SELECT 
-            t_close.ticker, 
-            t_close.contracts, 
-            t_open.price_cents as entry_price,
-            t_close.price_cents as exit_price, 
-            t_close.timestamp,
-            t_close.realized_pnl
-        FROM trades t_close
-        JOIN trades t_open ON t_open.ticker = t_close.ticker 
-            AND t_open.action = 'open'
-            AND t_open.id < t_close.id
-            AND NOT EXISTS (
-                SELECT 1 FROM trades t_mid 
-                WHERE t_mid.ticker = t_close.ticker 
-                AND t_mid.action = 'liquidate'
-                AND t_mid.id > t_open.id 
-                AND t_mid.id < t_close.id
-            )
-        WHERE t_close.action = 'liquidate'
-        AND t_close.timestamp > datetime('now', '-1 hour')
-        ORDER BY t_close.timestamp DESC
-    """)
-    
+    # Closes in the last hour, newest first
     closed_trades = []
-    for row in cursor.fetchall():
-        ticker, contracts, entry_price, exit_price, ts, realized_pnl = row
-        # Calculate P&L if not stored
-        entry_cost = contracts * entry_price / 100
-        if realized_pnl is None:
-            proceeds = contracts * exit_price / 100
-            entry_fee = calculate_kalshi_fee(contracts, entry_price)
-            exit_fee = calculate_kalshi_fee(contracts, exit_price)
-            realized_pnl = proceeds - entry_cost - entry_fee - exit_fee
-        # Calculate percentage gain/loss
-        pnl_pct = (realized_pnl / entry_cost * 100) if entry_cost > 0 else 0
-        # All timestamps are stored in UTC - convert to ET for display
-        closed_dt = datetime.fromisoformat(ts.replace('+00:00', '').replace('Z', ''))
-        # Treat as UTC and convert to ET
-        closed_dt = closed_dt.replace(tzinfo=timezone.utc).astimezone(et_tz)
+    for t in projection['recent']:
+        closed_dt = datetime.fromisoformat(t['closed_at'].replace('Z', '+00:00'))
+        if closed_dt.tzinfo is None:
+            closed_dt = closed_dt.replace(tzinfo=timezone.utc)  # Stored in UTC
+        if closed_dt < hour_ago:
+            break
         closed_trades.append({
-            'ticker': ticker,
-            'contracts': contracts,
-            'entry_price': int(entry_price),
-            'exit_price': int(exit_price),
-            'pnl': realized_pnl,
-            'pnl_pct': pnl_pct,
-            'closed': closed_dt.strftime("%H:%M:%S")
+            'ticker': t['ticker'],
+            'contracts': t['contracts'],
+            'entry_price': int(t['entry_price']),
+            'exit_price': int(t['exit_price']),
+            'pnl': t['pnl'],
+            'pnl_pct': t['pnl_pct'],
+            'closed': closed_dt.astimezone(et_tz).strftime("%H:%M:%S")
         })
-
-
-
-
-
-
-    
-    # Calculate P&L (for dry-run mode)
-    # Get all closed positions (opened then liquidated)
-    cursor.execute("""
-        SELECT 
-            t_open.id,
-            t_open.ticker,
-            t_open.contracts,
-            t_open.price_cents as entry_price,
-            t_close.price_cents as exit_price
-        FROM trades t_open
-        JOIN trades t_close ON t_open.ticker = t_close.ticker 
-            AND t_close.action = 'liquidate'
-            AND t_close.id > t_open.id
-        WHERE t_open.action = 'open'
-        GROUP BY t_open.id
-    """)
     
-    realized_pnl = 0
-    closed_count = 0
-    total_fees_paid = 0
-    
-    for row in cursor.fetchall():
-        open_id, ticker, contracts, entry_price, exit_price = row
-        
-        # Cost to enter
-        cost = contracts * entry_price / 100
-        entry_fee = calculate_kalshi_fee(contracts, entry_price)
-        
-        # Proceeds from exit
-        proceeds = contracts * exit_price / 100
-        exit_fee = calculate_kalshi_fee(contracts, exit_price)
-        
-        # Net P&L = proceeds - cost - fees
-        position_pnl = proceeds - cost - entry_fee - exit_fee
-        realized_pnl += position_pnl
-        total_fees_paid += entry_fee + exit_fee
-        closed_count += 1
+    realized_pnl = projection['realized_pnl']
+    closed_count = projection['closed_count']
+    total_fees_paid = projection['total_fees']
     
     # Unrealized P&L from open positions
     unrealized_pnl = sum(pos['unrealized_pnl'] for pos in open_positions)
@@ -439,6 +370,7 @@ def generate_status():
         'hourly_summary': hourly_summary,
         'closed_trades': closed_trades,
         'pnl': pnl_data,
+        'theta_surface': ThetaSurface.build(vol_std).to_dict(minutes_left=minutes_to_settlement) if vol_std > 0 else None,
         'last_updated': datetime.now().isoformat()
     }
 
@@ -12,12 +12,22 @@ Full trading logic running on AWS Lambda 24/7:
 import json
 import math
 import os
-import boto3
+import threading
+import time
 import requests
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from zoneinfo import ZoneInfo
 
+from concurrent_fetch import gather
+from latency_metrics import StageTimers
+from pnl_projection import (MAX_WRITE_ATTEMPTS, apply_close, closed_trade, conditional_put,
+                            empty_projection, is_conflict, load_projection)
+from position_store import position_item, position_key, query_open_positions
+from trade_log import trade_keys
+from trade_writer import TradeUnit
+from strike_ladder import StrikeLadder
+
 
 # =============================================================================
 # CONFIGURATION - Matches local bot
@@ -26,6 +36,7 @@ from zoneinfo import ZoneInfo
 # Entry parameters
 MIN_EDGE_PCT = 10.0           # Only trade if edge >= 10%
 MIN_BPS_ABOVE = 5             # Minimum basis points above current price
+MAX_BPS_ABOVE = 300           # Ignore strikes further out (fair ~100¢, no edge)
 MIN_FAIR_VALUE = 95.0         # Never trade if fair value < 95%
 MAX_VOLATILITY = 0.07         # Stop trading if volatility > 7%
 
@@ -65,8 +76,39 @@ POSITIONS_TABLE = os.environ.get('POSITIONS_TABLE', 'BTCHFPositions-DryRun')
 STARTING_BALANCE = float(os.environ.get('STARTING_BALANCE', '200.0'))
 VOL_TABLE = os.environ.get('VOL_TABLE', 'BTCPriceHistory')
 
-# AWS clients
-dynamodb = boto3.resource('dynamodb')
+# Sub-minute loop: scans per invocation and spacing between scan starts.
+# LOOP_ITERATIONS=6, LOOP_INTERVAL_SEC=10 gives a 10s reaction time from one
+# invocation per minute. The loop ends LOOP_SAFETY_MARGIN_SEC before the next
+# scheduled invocation, so a function timeout of SCHEDULE_PERIOD_SEC is enough.
+LOOP_ITERATIONS = max(1, int(os.environ.get('LOOP_ITERATIONS', '1')))
+LOOP_INTERVAL_SEC = float(os.environ.get('LOOP_INTERVAL_SEC', '10'))
+# Invocations are scheduled this far apart (EventBridge rate). The loop must
+# finish before the next one starts: scan state and the BALANCE write assume
+# a single writer (reserved concurrency 1 backs this up in deploy).
+SCHEDULE_PERIOD_SEC = float(os.environ.get('SCHEDULE_PERIOD_SEC', '60'))
+LOOP_SAFETY_MARGIN_SEC = 5    # Never start a scan this close to the next invocation or the timeout
+
+# AWS clients - created on first use so importing this module stays cheap
+_dynamodb = None
+_tables = {}
+_aws_lock = threading.Lock()
+
+
+# Per-stage timings for this execution environment, emitted once per
+# invocation as a JSON/EMF log line when LATENCY_METRICS is set
+timers = StageTimers('lambda')
+
+
+def get_table(name):
+    """DynamoDB Table (cached); the boto3 resource is created on first call."""
+    global _dynamodb
+    with _aws_lock:  # boto3 resource creation isn't thread-safe (see concurrent_fetch)
+        if name not in _tables:
+            if _dynamodb is None:
+                import boto3
+                _dynamodb = boto3.resource('dynamodb')
+            _tables[name] = _dynamodb.Table(name)
+        return _tables[name]
 
 
 # =============================================================================
@@ -131,7 +173,7 @@ def get_volatility(minutes_to_settlement=15):
     window = max(2, min(60, minutes_to_settlement))
     
     try:
-        table = dynamodb.Table(VOL_TABLE)
+        table = get_table(VOL_TABLE)
         now = datetime.now(timezone.utc)
         start_time = now - timedelta(minutes=window)
         
@@ -244,82 +286,107 @@ def get_open_positions(event_prefix):
     """Get all open positions for current hour from DynamoDB."""
     positions = []
     try:
-        table = dynamodb.Table(POSITIONS_TABLE)
-        response = table.scan(
-            FilterExpression='begins_with(pk, :prefix)',
-            ExpressionAttributeValues={':prefix': 'POS#'}
-        )
-        for item in response.get('Items', []):
-            ticker = item.get('ticker', '')
-            if ticker.startswith(event_prefix):
-                positions.append({
-                    'ticker': ticker,
-                    'contracts': int(item.get('contracts', 0)),
-                    'avg_price_cents': float(item.get('avg_price_cents', 0)),
-                    'strike_price': float(item.get('strike_price', 0)),
-                    'last_edge': float(item.get('last_edge', 0)),
-                    'cost_basis': float(item.get('cost_basis', 0)),
-                })
+        table = get_table(POSITIONS_TABLE)
+        for item in query_open_positions(table, event_prefix):
+            positions.append({
+                'ticker': item.get('ticker', ''),
+                'contracts': int(item.get('contracts', 0)),
+                'avg_price_cents': float(item.get('avg_price_cents', 0)),
+                'strike_price': float(item.get('strike_price', 0)),
+                'last_edge': float(item.get('last_edge', 0)),
+                'cost_basis': float(item.get('cost_basis', 0)),
+                'opened_at': item.get('opened_at', ''),
+                'model_fair': float(item.get('model_fair', 0) or 0),
+                'entry_edge': float(item.get('entry_edge', item.get('last_edge', 0)) or 0),
+                'vol_std': float(item.get('vol_std', 0) or 0),
+            })
     except Exception as e:
         print(f"Error getting positions: {e}")
     return positions
 
 
-def save_position(ticker, contracts, avg_price_cents, strike_price, edge, cost_basis):
-    """Save or update position in DynamoDB."""
-    try:
-        table = dynamodb.Table(POSITIONS_TABLE)
-        table.put_item(Item={
-            'pk': f'POS#{ticker}',
-            'sk': 'CURRENT',
-            'ticker': ticker,
-            'contracts': contracts,
-            'avg_price_cents': Decimal(str(avg_price_cents)),
-            'strike_price': Decimal(str(strike_price)),
-            'last_edge': Decimal(str(edge)),
-            'cost_basis': Decimal(str(cost_basis)),
-            'opened_at': datetime.now(timezone.utc).isoformat(),
-        })
-        print(f"✅ Saved position: {ticker} {contracts}@{avg_price_cents}¢")
-    except Exception as e:
-        print(f"Error saving position: {e}")
-
-
-def delete_position(ticker):
-    """Delete position from DynamoDB."""
-    try:
-        table = dynamodb.Table(POSITIONS_TABLE)
-        table.delete_item(Key={'pk': f'POS#{ticker}', 'sk': 'CURRENT'})
-        print(f"🗑️ Deleted position: {ticker}")
-    except Exception as e:
-        print(f"Error deleting position: {e}")
-
-
-def record_trade(ticker, action, contracts, price_cents, edge, btc_price, strike, realized_pnl=None, model_fair=None, vol_std=None):
-    """Record trade to DynamoDB for history."""
-    try:
-        table = dynamodb.Table(POSITIONS_TABLE)
-        item = {
-            'pk': 'HF_TRADE',
-            'sk': datetime.now(timezone.utc).isoformat(),
-            'ticker': ticker,
-            'action': action,
-            'contracts': contracts,
-            'price_cents': price_cents,
-            'edge_pct': Decimal(str(edge)),
-            'btc_price': Decimal(str(btc_price)),
-            'strike_price': Decimal(str(strike)),
-            'realized_pnl': Decimal(str(realized_pnl)) if realized_pnl is not None else None,
-        }
-        # Add open-specific fields
-        if model_fair is not None:
-            item['model_fair'] = Decimal(str(model_fair))
-        if vol_std is not None:
-            item['vol_std'] = Decimal(str(vol_std))
-        table.put_item(Item=item)
-        print(f"📝 Recorded trade: {action} {ticker}")
-    except Exception as e:
-        print(f"Error recording trade: {e}")
+def position_record(ticker, contracts, avg_price_cents, strike_price, edge, cost_basis,
+                    model_fair=None, vol_std=None):
+    """Position item for the positions table (entry details feed the P&L projection on close)."""
+    return position_item(
+        ticker,
+        contracts=contracts,
+        avg_price_cents=Decimal(str(avg_price_cents)),
+        strike_price=Decimal(str(strike_price)),
+        last_edge=Decimal(str(edge)),
+        cost_basis=Decimal(str(cost_basis)),
+        opened_at=datetime.now(timezone.utc).isoformat(),
+        entry_edge=Decimal(str(edge)),
+        model_fair=Decimal(str(model_fair)) if model_fair is not None else None,
+        vol_std=Decimal(str(vol_std)) if vol_std is not None else None,
+    )
+
+
+def trade_record(ticker, action, contracts, price_cents, edge, btc_price, strike, realized_pnl=None, model_fair=None, vol_std=None):
+    """HF_TRADE history item."""
+    item = {
+        **trade_keys(),  # Day-partitioned, time-ordered (see trade_log.py)
+        'ticker': ticker,
+        'action': action,
+        'contracts': contracts,
+        'price_cents': price_cents,
+        'edge_pct': Decimal(str(edge)),
+        'btc_price': Decimal(str(btc_price)),
+        'strike_price': Decimal(str(strike)),
+        'realized_pnl': Decimal(str(realized_pnl)) if realized_pnl is not None else None,
+    }
+    # Add open-specific fields
+    if model_fair is not None:
+        item['model_fair'] = Decimal(str(model_fair))
+    if vol_std is not None:
+        item['vol_std'] = Decimal(str(vol_std))
+    return item
+
+
+def position_close(pos, exit_price, closed_at, exit_fee=None):
+    """Closed-trade entry for the P&L projection from a position dict."""
+    return closed_trade(
+        pos['ticker'], pos['contracts'], pos['avg_price_cents'], exit_price, closed_at,
+        opened_at=pos.get('opened_at', ''), exit_fee=exit_fee,
+        model_fair=pos.get('model_fair', 0), open_edge=pos.get('entry_edge', pos.get('last_edge', 0)),
+        vol_std=pos.get('vol_std', 0),
+    )
+
+
+def commit_trade(trade, position=None, close_ticker=None, balance=None, closed=None):
+    """
+    Write one trade's history record, position change, balance update and
+    (for closes) P&L projection update in a single TransactWriteItems call -
+    all or nothing. Returns True on success.
+    
+    The projection write is conditional on the version read; if another
+    writer got there first, the projection is re-read and the unit retried
+    (every other write in it is idempotent).
+    """
+    table = get_table(POSITIONS_TABLE)
+    for attempt in range(MAX_WRITE_ATTEMPTS):
+        unit = TradeUnit(table)
+        unit.put(trade)
+        if position is not None:
+            unit.put(position)
+        if close_ticker is not None:
+            unit.delete(position_key(close_ticker))
+        if balance is not None:
+            unit.put(balance_record(balance))
+        try:
+            if closed is not None:
+                projection = load_projection(table) or empty_projection()
+                unit.put(**conditional_put(apply_close(projection, closed)))
+            writes = len(unit)
+            unit.commit()
+            print(f"📝 Recorded trade: {trade['action']} {trade['ticker']} ({writes} writes, 1 transaction)")
+            return True
+        except Exception as e:
+            if closed is not None and is_conflict(e) and attempt < MAX_WRITE_ATTEMPTS - 1:
+                continue  # P&L projection changed under us - rebuild and retry
+            print(f"Error committing trade {trade['ticker']}: {e}")
+            return False
+    return False
 
 
 def cleanup_expired_positions(current_event_prefix, btc_price):
@@ -331,13 +398,10 @@ def cleanup_expired_positions(current_event_prefix, btc_price):
     total_pnl = 0.0
     
     try:
-        table = dynamodb.Table(POSITIONS_TABLE)
-        response = table.scan(
-            FilterExpression='begins_with(pk, :prefix)',
-            ExpressionAttributeValues={':prefix': 'POS#'}
-        )
+        table = get_table(POSITIONS_TABLE)
+        balance = None
         
-        for item in response.get('Items', []):
+        for item in query_open_positions(table):
             ticker = item.get('ticker', '')
             
             # Skip current hour positions
@@ -345,9 +409,20 @@ def cleanup_expired_positions(current_event_prefix, btc_price):
                 continue
             
             # This is an expired position from a previous hour
+            if balance is None:
+                balance = get_simulated_balance()
             contracts = int(item.get('contracts', 0))
             entry_price = float(item.get('avg_price_cents', 0))
             strike = float(item.get('strike_price', 0))
+            pos = {
+                'ticker': ticker,
+                'contracts': contracts,
+                'avg_price_cents': entry_price,
+                'opened_at': item.get('opened_at', ''),
+                'model_fair': float(item.get('model_fair', 0) or 0),
+                'entry_edge': float(item.get('entry_edge', item.get('last_edge', 0)) or 0),
+                'vol_std': float(item.get('vol_std', 0) or 0),
+            }
             
             # Determine if we won (settling price 100¢) or lost (0¢)
             # For NO contracts: we win if BTC stayed below strike
@@ -361,14 +436,13 @@ def cleanup_expired_positions(current_event_prefix, btc_price):
             exit_fee = 0  # No fee on expiry
             pnl = exit_value - entry_cost - entry_fee
             
-            # Record and delete
-            record_trade(ticker, 'expired_win', contracts, exit_price, 0, btc_price, strike, pnl)
-            delete_position(ticker)
-            
-            # Update balance
-            current_balance = get_simulated_balance()
-            new_balance = current_balance + entry_cost + pnl  # Return the cost + profit
-            update_simulated_balance(new_balance)
+            # Record, delete and credit the balance together
+            new_balance = balance + entry_cost + pnl  # Return the cost + profit
+            trade = trade_record(ticker, 'expired_win', contracts, exit_price, 0, btc_price, strike, pnl)
+            closed = position_close(pos, exit_price, trade['sk'], exit_fee=exit_fee)
+            if not commit_trade(trade, close_ticker=ticker, balance=new_balance, closed=closed):
+                continue
+            balance = new_balance
             
             closed_count += 1
             total_pnl += pnl
@@ -390,7 +464,7 @@ def cleanup_expired_positions(current_event_prefix, btc_price):
 def get_simulated_balance():
     """Get simulated balance from DynamoDB."""
     try:
-        table = dynamodb.Table(POSITIONS_TABLE)
+        table = get_table(POSITIONS_TABLE)
         response = table.get_item(Key={'pk': 'BALANCE', 'sk': 'CURRENT'})
         item = response.get('Item')
         if item:
@@ -421,18 +495,14 @@ def get_balance():
         return get_real_kalshi_balance()
 
 
-def update_simulated_balance(balance):
-    """Update simulated balance in DynamoDB."""
-    try:
-        table = dynamodb.Table(POSITIONS_TABLE)
-        table.put_item(Item={
-            'pk': 'BALANCE',
-            'sk': 'CURRENT',
-            'balance': Decimal(str(balance)),
-            'updated_at': datetime.now(timezone.utc).isoformat(),
-        })
-    except Exception as e:
-        print(f"Error updating balance: {e}")
+def balance_record(balance):
+    """Simulated balance item (written with the trade that changed it - see commit_trade)."""
+    return {
+        'pk': 'BALANCE',
+        'sk': 'CURRENT',
+        'balance': Decimal(str(balance)),
+        'updated_at': datetime.now(timezone.utc).isoformat(),
+    }
 
 
 # =============================================================================
@@ -530,29 +600,25 @@ def check_add_conditions(pos, btc_price, vol_std, minutes_left, market_ask, bank
     return add_contracts > 0, add_contracts, None
 
 
-def find_new_entry(markets, btc_price, vol_std, minutes_left, bankroll, existing_tickers, late_game=False):
+def find_new_entry(ladder, btc_price, vol_std, minutes_left, bankroll, existing_tickers, late_game=False):
     """
     Find new entry opportunity.
     In late game mode (inside cutoff), only trade if model is highly confident.
     Returns: (market, contracts, edge) or (None, 0, 0)
     """
-    for market in markets:
+    # Only strikes in the [MIN_BPS_ABOVE, MAX_BPS_ABOVE] band, nearest first
+    for market in ladder.above(btc_price, min_bps=MIN_BPS_ABOVE, max_bps=MAX_BPS_ABOVE):
         ticker = market.get('ticker', '')
         strike = market.get('floor_strike')
         ask = market.get('no_ask')
         
-        if not strike or not ask or ask <= 0:
+        if not ask or ask <= 0:
             continue
         
         # Skip existing positions
         if ticker in existing_tickers:
             continue
         
-        # Check if strike is above BTC price
-        bps_above = (strike - btc_price) / btc_price * 10000
-        if bps_above < MIN_BPS_ABOVE:
-            continue
-        
         # Calculate edge
         model_fair = calculate_model_fair(btc_price, strike, vol_std, minutes_left)
         edge = calculate_edge(model_fair, ask)
@@ -605,129 +671,203 @@ def find_new_entry(markets, btc_price, vol_std, minutes_left, bankroll, existing
 # MAIN LAMBDA HANDLER
 # =============================================================================
 
-def lambda_handler(event, context):
-    """Main Lambda handler - runs every minute."""
-    try:
-        et_time = get_et_time()
-        minutes_left = get_minutes_to_settlement()
-        event_ticker = get_event_ticker()
-        
-        print(f"{'='*60}")
-        print(f"🔍 Scan at {et_time.strftime('%H:%M:%S')} ET ({minutes_left} min to settlement)")
-        print(f"{'='*60}")
-        
-        # Get market data
-        btc_price = get_btc_price()
-        if not btc_price:
-            return {'statusCode': 500, 'body': json.dumps({'error': 'No BTC price'})}
-        
-        vol_std = get_volatility(minutes_left)  # Use volatility matching time to settlement
-        markets = get_markets(event_ticker)
-        bankroll = get_balance()
-        
-        # Clean up any expired positions from previous hour
-        cleanup_expired_positions(event_ticker, btc_price)
-        bankroll = get_balance()  # Refresh balance after cleanup
-        
-        print(f"📊 BTC: ${btc_price:,.2f}")
-        print(f"📈 Volatility: {vol_std:.4f}%")
-        print(f"💰 Bankroll: ${bankroll:.2f}")
-        
-        # Get existing positions
-        positions = get_open_positions(event_ticker)
-        existing_tickers = {p['ticker'] for p in positions}
-        total_exposure = sum(p['contracts'] * p['avg_price_cents'] / 100 for p in positions)
+def load_scan_state(event_ticker, minutes_left):
+    """
+    Full fetch for the first scan of an invocation.
+    Returns a state dict, or an error string if we can't trade.
+    """
+    # Get market data - independent calls, fetched in parallel
+    fetched = gather({
+        'btc_price': get_btc_price,
+        'vol_std': lambda: get_volatility(minutes_left),  # Volatility matching time to settlement
+        'markets': lambda: get_markets(event_ticker),
+        'bankroll': get_balance,
+        'positions': lambda: get_open_positions(event_ticker),
+    })
+    for name, err in fetched.errors.items():
+        print(f"Error fetching {name}: {err}")
+    print(f"⚡ Fetched in {fetched.summary()}")
+    timers.record_fetch(fetched)
+    
+    btc_price = fetched.get('btc_price')
+    if not btc_price:
+        return 'No BTC price'
+    bankroll = fetched.get('bankroll')
+    if bankroll is None:
+        return 'No balance'
+    
+    # Clean up any expired positions from previous hour
+    with timers.stage('cleanup'):
+        closed_count, _ = cleanup_expired_positions(event_ticker, btc_price)
+    if closed_count:
+        bankroll = get_balance()  # Settlements credited the balance
+    
+    return {
+        'event_ticker': event_ticker,
+        'minutes_left': minutes_left,
+        'btc_price': btc_price,
+        'vol_std': fetched.get('vol_std', 0.02),
+        'ladder': StrikeLadder(fetched.get('markets', [])),
+        'bankroll': bankroll,
+        # Existing positions (current hour only - unaffected by cleanup)
+        'positions': fetched.get('positions', []),
+    }
+
+
+def refresh_scan_state(state, minutes_left):
+    """
+    Incremental refresh between loop iterations: only price and quotes move.
+    Vol, balance and positions are carried over (we are the only writer of
+    the latter two, and run_scan keeps them current).
+    """
+    fetched = gather({
+        'btc_price': get_btc_price,
+        'markets': lambda: get_markets(state['event_ticker']),
+    })
+    for name, err in fetched.errors.items():
+        print(f"Error fetching {name}: {err}")
+    print(f"⚡ Refreshed in {fetched.summary()}")
+    timers.record_fetch(fetched)
+    
+    btc_price = fetched.get('btc_price')
+    if not btc_price:
+        return False
+    state['btc_price'] = btc_price
+    state['minutes_left'] = minutes_left
+    markets = fetched.get('markets')
+    if markets:
+        state['ladder'] = StrikeLadder(markets)
+    return True
+
+
+def run_scan(state):
+    """One decision pass over positions and entries. Returns trades made."""
+    btc_price = state['btc_price']
+    vol_std = state['vol_std']
+    minutes_left = state['minutes_left']
+    ladder = state['ladder']
+    bankroll = state['bankroll']
+    positions = state['positions']
+    
+    print(f"📊 BTC: ${btc_price:,.2f}")
+    print(f"📈 Volatility: {vol_std:.4f}%")
+    print(f"💰 Bankroll: ${bankroll:.2f}")
+    
+    existing_tickers = {p['ticker'] for p in positions}
+    total_exposure = sum(p['contracts'] * p['avg_price_cents'] / 100 for p in positions)
+    
+    print(f"📦 Open positions: {len(positions)}, exposure: ${total_exposure:.2f}")
+    
+    trades_made = []
+    
+    # Check existing positions for exits and adds
+    for pos in list(positions):
+        ticker = pos['ticker']
+        contracts = pos['contracts']
+        strike = pos['strike_price']
         
-        print(f"📦 Open positions: {len(positions)}, exposure: ${total_exposure:.2f}")
+        # Get current market data
+        market_data = ladder.get(ticker)
+        if not market_data:
+            continue
         
-        trades_made = []
+        market_bid = market_data.get('no_bid', 0)
+        market_ask = market_data.get('no_ask', 0)
         
-        # Check existing positions for exits and adds
-        for pos in positions:
-            ticker = pos['ticker']
-            contracts = pos['contracts']
-            strike = pos['strike_price']
-            
-            # Get current market data
-            market_data = next((m for m in markets if m.get('ticker') == ticker), None)
-            if not market_data:
-                continue
-            
-            market_bid = market_data.get('no_bid', 0)
-            market_ask = market_data.get('no_ask', 0)
-            
-            # Check exit conditions
+        # Check exit conditions
+        with timers.stage('evaluate_exit'):
             should_exit, reason, pnl = check_exit_conditions(
                 pos, btc_price, vol_std, minutes_left, market_bid
             )
+        
+        if should_exit:
+            # Exit position - add back the PROCEEDS (sale value minus exit fee)
+            # Entry cost was already deducted when opening, so we get back the full sale proceeds
+            proceeds = contracts * market_bid / 100
+            exit_fee = calculate_fee(contracts, market_bid)
+            new_balance = bankroll + proceeds - exit_fee
+            trade = trade_record(ticker, 'liquidate', contracts, market_bid,
+                                 pos['last_edge'], btc_price, strike, pnl)
+            closed = position_close(pos, market_bid, trade['sk'])
+            with timers.stage('persistence'):
+                committed = commit_trade(trade, close_ticker=ticker, balance=new_balance, closed=closed)
+            if not committed:
+                continue  # Still open in DynamoDB - retried next scan
+            bankroll = new_balance
+            positions.remove(pos)
+            total_exposure -= contracts * pos['avg_price_cents'] / 100
             
-            if should_exit:
-                # Exit position
-                delete_position(ticker)
-                record_trade(ticker, 'liquidate', contracts, market_bid, 
-                           pos['last_edge'], btc_price, strike, pnl)
-                
-                # Update balance - add back the PROCEEDS (sale value minus exit fee)
-                # Entry cost was already deducted when opening, so we get back the full sale proceeds
-                proceeds = contracts * market_bid / 100
-                exit_fee = calculate_fee(contracts, market_bid)
-                new_balance = bankroll + proceeds - exit_fee
-                update_simulated_balance(new_balance)
-                bankroll = new_balance
-                
-                trades_made.append({
-                    'action': 'exit',
-                    'ticker': ticker,
-                    'contracts': contracts,
-                    'reason': reason,
-                    'pnl': pnl
-                })
-                print(f"  🔴 EXIT {ticker}: {reason}, P&L ${pnl:.2f}")
-                continue
-            
-            # Check add conditions (only in late game OR if very high confidence)
-            # Calculate fair value to check if we should allow early avg down
-            model_fair = calculate_model_fair(btc_price, strike, vol_std, minutes_left)
-            in_late_game = minutes_left <= TRADING_CUTOFF_MINUTES
-            high_confidence = model_fair >= LATE_GAME_MIN_FAIR  # 98%+
-            
-            # DISABLED: Cost averaging / adding to positions
-            # if in_late_game or high_confidence:
-            #     should_add, add_contracts, skip_reason = check_add_conditions(
-            #         pos, btc_price, vol_std, minutes_left, market_ask, bankroll
-            #     )
-            #     
-            #     if should_add and add_contracts > 0:
-            #         ... (averaging down logic disabled)
+            trades_made.append({
+                'action': 'exit',
+                'ticker': ticker,
+                'contracts': contracts,
+                'reason': reason,
+                'pnl': pnl
+            })
+            print(f"  🔴 EXIT {ticker}: {reason}, P&L ${pnl:.2f}")
+            continue
         
-        # Look for new entries
-        # Normal mode outside cutoff, late game mode inside cutoff (high confidence only)
-        # SKIP if volatility is too high
-        in_cutoff = minutes_left <= TRADING_CUTOFF_MINUTES
-        remaining_exposure = bankroll * MAX_EXPOSURE_FRACTION - total_exposure
+        # Check add conditions (only in late game OR if very high confidence)
+        # Calculate fair value to check if we should allow early avg down
+        model_fair = calculate_model_fair(btc_price, strike, vol_std, minutes_left)
+        in_late_game = minutes_left <= TRADING_CUTOFF_MINUTES
+        high_confidence = model_fair >= LATE_GAME_MIN_FAIR  # 98%+
         
-        if vol_std > MAX_VOLATILITY:
-            print(f"⚠️ VOLATILITY TOO HIGH ({vol_std:.4f}% > {MAX_VOLATILITY:.2f}%) - Skipping new entries")
-        elif remaining_exposure > 1:  # At least $1 available
+        # DISABLED: Cost averaging / adding to positions
+        # if in_late_game or high_confidence:
+        #     should_add, add_contracts, skip_reason = check_add_conditions(
+        #         pos, btc_price, vol_std, minutes_left, market_ask, bankroll
+        #     )
+        #     
+        #     if should_add and add_contracts > 0:
+        #         ... (averaging down logic disabled)
+    
+    # Look for new entries
+    # Normal mode outside cutoff, late game mode inside cutoff (high confidence only)
+    # SKIP if volatility is too high
+    in_cutoff = minutes_left <= TRADING_CUTOFF_MINUTES
+    remaining_exposure = bankroll * MAX_EXPOSURE_FRACTION - total_exposure
+    
+    if vol_std > MAX_VOLATILITY:
+        print(f"⚠️ VOLATILITY TOO HIGH ({vol_std:.4f}% > {MAX_VOLATILITY:.2f}%) - Skipping new entries")
+    elif remaining_exposure > 1:  # At least $1 available
+        with timers.stage('evaluate_entries'):
             market, contracts, edge, model_fair = find_new_entry(
-                markets, btc_price, vol_std, minutes_left, bankroll, existing_tickers,
+                ladder, btc_price, vol_std, minutes_left, bankroll, existing_tickers,
                 late_game=in_cutoff
             )
+        
+        if market and contracts > 0:
+            ticker = market['ticker']
+            strike = market['floor_strike']
+            ask = market['no_ask']
             
-            if market and contracts > 0:
-                ticker = market['ticker']
-                strike = market['floor_strike']
-                ask = market['no_ask']
-                
-                # Open new position
-                cost_basis = contracts * ask / 100
-                save_position(ticker, contracts, ask, strike, edge, cost_basis)
-                record_trade(ticker, 'open', contracts, ask, edge, btc_price, strike, model_fair=model_fair, vol_std=vol_std)
-                
-                # Update balance
-                cost = cost_basis + calculate_fee(contracts, ask)
-                new_balance = bankroll - cost
-                update_simulated_balance(new_balance)
+            # Open new position
+            cost_basis = contracts * ask / 100
+            # Update balance
+            cost = cost_basis + calculate_fee(contracts, ask)
+            new_balance = bankroll - cost
+            trade = trade_record(ticker, 'open', contracts, ask, edge, btc_price, strike,
+                                 model_fair=model_fair, vol_std=vol_std)
+            position = position_record(ticker, contracts, ask, strike, edge, cost_basis,
+                                       model_fair=model_fair, vol_std=vol_std)
+            with timers.stage('persistence'):
+                committed = commit_trade(trade, position=position, balance=new_balance)
+            if committed:
+                bankroll = new_balance
+                positions.append({
+                    'ticker': ticker,
+                    'contracts': contracts,
+                    'avg_price_cents': float(ask),
+                    'strike_price': float(strike),
+                    'last_edge': edge,
+                    'cost_basis': cost_basis,
+                    'opened_at': position['opened_at'],
+                    'model_fair': model_fair,
+                    'entry_edge': edge,
+                    'vol_std': vol_std,
+                })
+                total_exposure += cost_basis
                 
                 trades_made.append({
                     'action': 'open',
@@ -737,16 +877,85 @@ def lambda_handler(event, context):
                     'edge': edge
                 })
                 print(f"  🟢 OPEN {ticker}: {contracts} @ {ask}¢, edge={edge:.1f}%")
+    
+    state['bankroll'] = bankroll
+    state['total_exposure'] = total_exposure
+    return trades_made
+
+
+def _time_for_another_scan(context, invocation_started, wait_sec, longest_scan_sec):
+    """
+    True if waiting wait_sec and running one more scan ends before both the
+    next scheduled invocation (measured from invocation_started, a
+    time.monotonic() reading) and the Lambda timeout.
+    """
+    needed = wait_sec + longest_scan_sec + LOOP_SAFETY_MARGIN_SEC
+    if time.monotonic() - invocation_started + needed > SCHEDULE_PERIOD_SEC:
+        return False
+    return context is None or context.get_remaining_time_in_millis() / 1000 > needed
+
+
+def lambda_handler(event, context):
+    """
+    Main Lambda handler - runs every minute.
+    
+    With LOOP_ITERATIONS > 1 it scans repeatedly (LOOP_INTERVAL_SEC apart)
+    within the invocation, reusing vol/balance/positions and refreshing only
+    price and markets, and stops early rather than run into the next
+    scheduled invocation or the timeout.
+    """
+    invocation_started = time.monotonic()
+    try:
+        state = None
+        trades_made = []
+        scans = 0
+        longest_scan = 0.0
+        
+        for iteration in range(LOOP_ITERATIONS):
+            scan_started = time.monotonic()
+            et_time = get_et_time()
+            minutes_left = get_minutes_to_settlement()
+            event_ticker = get_event_ticker()
+            
+            print(f"{'='*60}")
+            print(f"🔍 Scan {iteration + 1}/{LOOP_ITERATIONS} at {et_time.strftime('%H:%M:%S')} ET ({minutes_left} min to settlement)")
+            print(f"{'='*60}")
+            
+            if state is None:
+                state = load_scan_state(event_ticker, minutes_left)
+                if isinstance(state, str):
+                    return {'statusCode': 500, 'body': json.dumps({'error': state})}
+            elif event_ticker != state['event_ticker']:
+                print("⏰ Contract hour rolled over - leaving it to the next invocation")
+                break
+            elif not refresh_scan_state(state, minutes_left):
+                print("⚠️ No BTC price on refresh - ending loop")
+                break
+            
+            trades_made.extend(run_scan(state))
+            scans += 1
+            elapsed = time.monotonic() - scan_started
+            timers.record('scan', elapsed * 1000)
+            
+            if iteration == LOOP_ITERATIONS - 1:
+                break
+            longest_scan = max(longest_scan, elapsed)
+            wait = max(0.0, LOOP_INTERVAL_SEC - elapsed)
+            if not _time_for_another_scan(context, invocation_started, wait, longest_scan):
+                print("⏱️ Stopping loop early - another scan would overlap the next invocation or the timeout")
+                break
+            time.sleep(wait)
         
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'status': 'success',
-                'btc_price': btc_price,
-                'positions': len(positions),
+                'btc_price': state['btc_price'],
+                'positions': len(state['positions']),
                 'trades': len(trades_made),
-                'exposure': total_exposure,
-                'balance': bankroll
+                'scans': scans,
+                'exposure': state.get('total_exposure', 0),
+                'balance': state['bankroll']
             })
         }
         
@@ -758,6 +967,9 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
+    
+    finally:
+        timers.emit()
 
 
 # For local testing
@@ -0,0 +1,74 @@
+"""
+Parallel fetch stage for independent per-scan network calls.
+
+Price, volatility, markets and balance don't depend on each other, so each
+scan issues them together on a shared thread pool and waits once against a
+common deadline. Cycle latency becomes roughly the slowest call rather than
+the sum. Failures are partial: each call either yields a value, an error or
+a timeout, and the caller decides which ones it can live without.
+
+The pool is module-level so warm Lambda invocations reuse its threads.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+# Shared deadline for one gather (seconds) - the slowest single call we accept
+FETCH_DEADLINE_SEC = 10.0
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fetch")
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a gather: values for calls that finished, errors for the rest."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    def ok(self, name: str) -> bool:
+        return name in self.values
+
+    def summary(self) -> str:
+        parts = [f"{name}={ms:.0f}ms" for name, ms in self.timings_ms.items()]
+        parts += [f"{name}={err}" for name, err in self.errors.items()]
+        return f"{self.elapsed_ms:.0f}ms ({', '.join(parts)})"
+
+
+def _timed(fn: Callable[[], Any]):
+    start = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def gather(calls: Dict[str, Callable[[], Any]], deadline_sec: float = FETCH_DEADLINE_SEC) -> FetchResult:
+    """
+    Run zero-argument callables concurrently and collect their results.
+
+    A call that raises is recorded in `errors` with its exception message;
+    a call still running at the deadline is recorded as 'timeout' and left
+    to finish in the background (its result is discarded).
+    """
+    start = time.perf_counter()
+    futures = {name: _EXECUTOR.submit(_timed, fn) for name, fn in calls.items()}
+    wait(futures.values(), timeout=deadline_sec)
+
+    result = FetchResult()
+    for name, future in futures.items():
+        if not future.done():
+            result.errors[name] = 'timeout'
+            continue
+        try:
+            value, ms = future.result()
+            result.values[name] = value
+            result.timings_ms[name] = ms
+        except Exception as e:
+            result.errors[name] = f"{type(e).__name__}: {e}"
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
@@ -6,11 +6,23 @@ Replaces the local generate_status.py script.
 import json
 import math
 import os
-import boto3
+import threading
 import requests
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+from pnl_projection import empty_projection, load_projection, replay
+from position_store import query_open_positions
+from projector import load_views
+from trade_log import query_trades
+
+# numpy-backed fair-value surface is optional - dashboard still renders without it
+try:
+    from theta_surface import ThetaSurface
+    THETA_SURFACE_AVAILABLE = True
+except ImportError:
+    THETA_SURFACE_AVAILABLE = False
+
 # Environment-driven configuration (for dry-run vs live)
 S3_BUCKET = os.environ.get('S3_BUCKET', 'btc-trading-dashboard-1765598917')
 S3_KEY = os.environ.get('S3_KEY', 'status.json')
@@ -20,9 +32,59 @@ DRY_RUN = os.environ.get('DRY_RUN', 'true').lower() == 'true'
 KALSHI_FEE_RATE = 0.07
 STARTING_BALANCE = float(os.environ.get('STARTING_BALANCE', '200.0'))
 
-# Initialize AWS clients
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+# Trade log replayed when the P&L projection doesn't exist yet
+TRADE_HISTORY_DAYS = float(os.environ.get('TRADE_HISTORY_DAYS', '30'))
+
+# Extra history read so closes at the window start find their opens
+# (positions are in hourly contracts, so opens are never older than this)
+OPEN_LOOKBACK_HOURS = 2
+
+# AWS clients - created on first use so importing this module stays cheap
+_s3 = None
+_dynamodb = None
+_aws_lock = threading.Lock()
+
+
+def get_s3():
+    global _s3
+    with _aws_lock:
+        if _s3 is None:
+            import boto3
+            _s3 = boto3.client('s3')
+        return _s3
+
+
+def get_table(name):
+    """DynamoDB Table; the boto3 resource is created on first call."""
+    global _dynamodb
+    with _aws_lock:
+        if _dynamodb is None:
+            import boto3
+            _dynamodb = boto3.resource('dynamodb')
+        return _dynamodb.Table(name)
+
+
+def get_views():
+    """Read models maintained by the stream projector (None if not deployed yet)."""
+    try:
+        return load_views(get_table(DYNAMODB_POSITIONS_TABLE))
+    except Exception as e:
+        print(f"Error getting dashboard views: {e}")
+        return None
+
+
+def get_simulated_balance(views=None):
+    """Dry-run balance kept by the trader Lambda (None if it has never traded)."""
+    if views is not None:
+        return views['balance']
+    try:
+        table = get_table(DYNAMODB_POSITIONS_TABLE)
+        item = table.get_item(Key={'pk': 'BALANCE', 'sk': 'CURRENT'}).get('Item')
+        if item and 'balance' in item:
+            return float(item['balance'])
+    except Exception as e:
+        print(f"Error getting simulated balance: {e}")
+    return None
 
 
 def get_real_kalshi_balance():
@@ -73,7 +135,7 @@ def get_et_time():
 def get_volatility():
     """Fetch volatility from DynamoDB."""
     try:
-        table = dynamodb.Table(DYNAMODB_VOL_TABLE)
+        table = get_table(DYNAMODB_VOL_TABLE)
         response = table.get_item(Key={'pk': 'VOL', 'sk': 'LATEST'})
         item = response.get('Item')
         if item:
@@ -87,7 +149,7 @@ def get_recent_prices(minutes):
     """Get prices from the last N minutes from DynamoDB."""
     import boto3.dynamodb.conditions as conditions
     
-    table = dynamodb.Table(DYNAMODB_VOL_TABLE)
+    table = get_table(DYNAMODB_VOL_TABLE)
     now = datetime.now(timezone.utc)
     start_time = now - timedelta(minutes=minutes)
     
@@ -211,153 +273,84 @@ def get_btc_price():
     return 0
 
 
-def get_open_positions(current_event_prefix):
-    """Get open positions from DynamoDB."""
+def get_open_positions(current_event_prefix, views=None):
+    """Get open positions for the current event (from the views when available)."""
     positions = []
     try:
-        table = dynamodb.Table(DYNAMODB_POSITIONS_TABLE)
-        response = table.scan(
-            FilterExpression='begins_with(pk, :prefix)',
-            ExpressionAttributeValues={':prefix': 'POS#'}
-        )
-        for item in response.get('Items', []):
-            ticker = item.get('ticker', '')
-            if ticker.startswith(current_event_prefix):
-                positions.append({
-                    'ticker': ticker,
-                    'contracts': int(item.get('contracts', 0)),
-                    'price_cents': float(item.get('avg_price_cents', 0)),
-                    'last_edge': float(item.get('last_edge', 0)),
-                    'strike_price': float(item.get('strike_price', 0)),
-                    'opened_at': item.get('opened_at', '')
-                })
+        if views is not None:
+            items = [p for t, p in views['open_positions'].items() if t.startswith(current_event_prefix)]
+        else:
+            items = query_open_positions(get_table(DYNAMODB_POSITIONS_TABLE), current_event_prefix)
+        for item in items:
+            positions.append({
+                'ticker': item.get('ticker', ''),
+                'contracts': int(item.get('contracts', 0)),
+                'price_cents': float(item.get('avg_price_cents', 0)),
+                'last_edge': float(item.get('last_edge', 0)),
+                'strike_price': float(item.get('strike_price', 0)),
+                'opened_at': item.get('opened_at', '')
+            })
     except Exception as e:
         print(f"Error getting positions: {e}")
     return positions
 
 
-def get_trade_history():
-    """Get all trade history from DynamoDB for P&L calculation."""
-    closed_trades = []
-    total_pnl = 0.0
-    total_fees = 0.0
-    
+def _display_time(timestamp):
+    """ISO UTC timestamp -> HH:MM:SS Central Time for the dashboard."""
+    if not timestamp:
+        return ''
     try:
-        table = dynamodb.Table(DYNAMODB_POSITIONS_TABLE)
-        response = table.scan(
-            FilterExpression='pk = :pk',
-            ExpressionAttributeValues={':pk': 'HF_TRADE'}
-        )
-        
-        # Sort all trades chronologically
-        all_trades = sorted(response.get('Items', []), key=lambda x: x.get('sk', ''))
-        
-        # Track open positions by ticker to match with liquidates
-        open_positions = {}  # ticker -> [list of opens in order]
-        
-        for item in all_trades:
-            ticker = item.get('ticker', '')
-            action = item.get('action', '')
-            contracts = int(item.get('contracts', 0))
-            price_cents = int(item.get('price_cents', 0))
-            timestamp = item.get('sk', '')
-            
-            if action in ['open', 'add']:
-                # Add to open positions for this ticker
-                if ticker not in open_positions:
-                    open_positions[ticker] = []
-                open_positions[ticker].append({
-                    'contracts': contracts,
-                    'price_cents': price_cents,
-                    'timestamp': timestamp,
-                    'opened_at': timestamp,  # Track when position was opened
-                    'model_fair': float(item.get('model_fair', 0) or 0),
-                    'edge': float(item.get('edge_pct', 0) or 0),
-                    'vol_std': float(item.get('vol_std', 0) or 0)
-                })
-            
-            elif action in ['liquidate', 'expired_win']:
-                # Match with the most recent open for this ticker
-                entry_price = 0
-                opened_at = ''
-                open_model_fair = 0
-                open_edge = 0
-                open_vol_std = 0
-                if ticker in open_positions and open_positions[ticker]:
-                    # Use the first open (FIFO) and remove it
-                    entry = open_positions[ticker].pop(0)
-                    entry_price = entry['price_cents']
-                    opened_at = entry.get('opened_at', '')
-                    open_model_fair = entry.get('model_fair', 0)
-                    open_edge = entry.get('edge', 0)
-                    open_vol_std = entry.get('vol_std', 0)
-                    
-                    # If we used all opens, clear the list
-                    if not open_positions[ticker]:
-                        del open_positions[ticker]
-                
-                # Calculate P&L
-                entry_cost = contracts * entry_price / 100
-                exit_value = contracts * price_cents / 100
-                entry_fee = calculate_kalshi_fee(contracts, entry_price) if entry_price > 0 else 0
-                exit_fee = calculate_kalshi_fee(contracts, price_cents)
-                pnl = exit_value - entry_cost - entry_fee - exit_fee
-                pnl_pct = (pnl / entry_cost) * 100 if entry_cost > 0 else 0
-                
-                total_pnl += pnl
-                total_fees += entry_fee + exit_fee
-                
-                # Convert UTC timestamp to Central Time for display
-                closed_time_display = timestamp
-                timestamp_sort = timestamp  # Keep full timestamp for sorting
-                try:
-                    from zoneinfo import ZoneInfo
-                    utc_dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    ct_dt = utc_dt.astimezone(ZoneInfo('America/Mexico_City'))
-                    closed_time_display = ct_dt.strftime('%H:%M:%S')
-                    timestamp_sort = ct_dt.isoformat()  # Full ISO for sorting
-                except:
-                    closed_time_display = timestamp.split('T')[1][:8] if 'T' in timestamp else timestamp
-                
-                # Convert opened_at to Central Time for display
-                opened_time_display = opened_at
-                try:
-                    from zoneinfo import ZoneInfo
-                    if opened_at:
-                        utc_dt = datetime.fromisoformat(opened_at.replace('Z', '+00:00'))
-                        ct_dt = utc_dt.astimezone(ZoneInfo('America/Mexico_City'))
-                        opened_time_display = ct_dt.strftime('%H:%M:%S')
-                except:
-                    opened_time_display = opened_at.split('T')[1][:8] if 'T' in opened_at else opened_at
-                
-                closed_trades.append({
-                    'ticker': ticker,
-                    'contracts': contracts,
-                    'entry_price': entry_price,
-                    'exit_price': price_cents,
-                    'pnl': round(pnl, 2),
-                    'pnl_pct': round(pnl_pct, 1),
-                    'opened': opened_time_display,
-                    'closed': closed_time_display,
-                    'timestamp_sort': timestamp_sort,
-                    'model_fair': round(open_model_fair, 1),
-                    'open_edge': round(open_edge, 1),
-                    'vol_std': round(open_vol_std * 100, 2) if open_vol_std else 0  # Convert to percentage
-                })
+        from zoneinfo import ZoneInfo
+        utc_dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        if utc_dt.tzinfo is None:
+            utc_dt = utc_dt.replace(tzinfo=timezone.utc)
+        return utc_dt.astimezone(ZoneInfo('America/Mexico_City')).strftime('%H:%M:%S')
+    except Exception:
+        return timestamp.split('T')[1][:8] if 'T' in timestamp else timestamp
+
+
+def get_trade_history(views=None, days=TRADE_HISTORY_DAYS):
+    """
+    Realized P&L and the most recent closed trades.
     
+    Reads the P&L projection from the views (or its own item, maintained on
+    every close). Until it exists, falls back to replaying the last `days`
+    of trades.
+    """
+    projection = views['pnl'] if views is not None else None
+    try:
+        table = get_table(DYNAMODB_POSITIONS_TABLE)
+        if projection is None:
+            projection = load_projection(table)
+        if projection is None:
+            print("No P&L projection yet (run scripts/backfill_pnl_projection.py) - replaying trade log")
+            window_start = datetime.now(timezone.utc) - timedelta(days=days)
+            projection = replay(query_trades(table, window_start - timedelta(hours=OPEN_LOOKBACK_HOURS)))
     except Exception as e:
         print(f"Error getting trade history: {e}")
-    
-    # Sort by full timestamp, then remove the sort key before returning
-    sorted_trades = sorted(closed_trades, key=lambda x: x.get('timestamp_sort', ''), reverse=True)[:20]
-    for trade in sorted_trades:
-        trade.pop('timestamp_sort', None)
+    projection = projection or empty_projection()
+    
+    closed_trades = [{
+        'ticker': t['ticker'],
+        'contracts': t['contracts'],
+        'entry_price': round(t['entry_price']),
+        'exit_price': round(t['exit_price']),
+        'pnl': round(t['pnl'], 2),
+        'pnl_pct': round(t['pnl_pct'], 1),
+        'opened': _display_time(t.get('opened_at', '')),
+        'closed': _display_time(t.get('closed_at', '')),
+        'model_fair': round(t.get('model_fair', 0), 1),
+        'open_edge': round(t.get('open_edge', 0), 1),
+        'vol_std': round(t['vol_std'] * 100, 2) if t.get('vol_std') else 0  # Convert to percentage
+    } for t in projection['recent']]
     
     return {
-        'closed_trades': sorted_trades,
-        'total_pnl': total_pnl,
-        'total_fees': total_fees,
-        'trade_count': len(closed_trades)
+        'closed_trades': closed_trades,
+        'total_pnl': projection['realized_pnl'],
+        'total_fees': projection['total_fees'],
+        'trade_count': projection['closed_count'],
+        'wins': projection['wins'],
+        'losses': projection['losses'],
     }
 
 
@@ -472,6 +465,19 @@ def get_market_data(tickers):
     return market_data
 
 
+def get_theta_surface(vol_per_minute, minutes_left):
+    """Downsampled fair-value decay curves for the rest of the hour."""
+    if not THETA_SURFACE_AVAILABLE or vol_per_minute <= 0:
+        return None
+    try:
+        # Surface is parameterized by 15m vol; scale per-minute stdev by √15
+        surface = ThetaSurface.build(vol_per_minute * math.sqrt(15))
+        return surface.to_dict(minutes_left=minutes_left)
+    except Exception as e:
+        print(f"Error building theta surface: {e}")
+        return None
+
+
 def lambda_handler(event, context):
     """Main Lambda handler."""
     et_time = get_et_time()
@@ -500,7 +506,8 @@ def lambda_handler(event, context):
     vol_scaled = vol_data['volatility'] if vol_data else 0.10
     print(f"[DEBUG] Using {vol_window}m per-minute vol: {vol_std:.4f}%, scaled: {vol_scaled:.4f}%")
     
-    positions = get_open_positions(current_event_prefix)
+    views = get_views()
+    positions = get_open_positions(current_event_prefix, views)
     
     # Get market data for positions
     tickers = [p['ticker'] for p in positions]
@@ -554,14 +561,16 @@ def lambda_handler(event, context):
     fair_values = get_fair_values(btc_price, current_event_prefix, vol_std, minutes_to_settlement)
     
     # Get trade history for P&L
-    trade_history = get_trade_history()
+    trade_history = get_trade_history(views)
     
     # Calculate unrealized P&L from open positions
     unrealized_pnl = sum(p.get('unrealized_pnl', 0) for p in open_positions)
     
     # Calculate balance - real from Kalshi if live, simulated if dry-run
     if DRY_RUN:
-        balance = STARTING_BALANCE + trade_history['total_pnl'] - total_exposure
+        balance = get_simulated_balance(views)
+        if balance is None:
+            balance = STARTING_BALANCE + trade_history['total_pnl'] - total_exposure
     else:
         balance = get_real_kalshi_balance()
     
@@ -586,6 +595,7 @@ def lambda_handler(event, context):
             'closed_trades': trade_history['trade_count']
         },
         'volatility_by_window': volatility_by_window,  # Already computed above
+        'theta_surface': get_theta_surface(vol_std, minutes_to_settlement),
         'last_updated': datetime.now(timezone.utc).isoformat()
     }
 
@@ -593,7 +603,7 @@ def lambda_handler(event, context):
     
     # Upload to S3 with no-cache headers
     try:
-        s3.put_object(
+        get_s3().put_object(
             Bucket=S3_BUCKET,
             Key=S3_KEY,
             Body=json.dumps(data, indent=2),
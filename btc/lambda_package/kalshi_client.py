@@ -7,8 +7,9 @@ import os
 import time
 import base64
 import json
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
+
+# cryptography is imported lazily (only live mode signs requests), which keeps
+# it off the cold-start path of dry-run and dashboard invocations
 
 class KalshiClient:
     """Minimal Kalshi API client for Lambda"""
@@ -39,6 +40,7 @@ class KalshiClient:
             formatted_key = private_key_str
 
         # Load the private key
+        from cryptography.hazmat.primitives import serialization
         self.private_key = serialization.load_pem_private_key(
             formatted_key.encode('utf-8'),
             password=None
@@ -47,6 +49,8 @@ class KalshiClient:
     def _sign_request(self, method: str, path: str) -> dict:
         """Generate authentication headers"""
         import requests  # Import here to use Lambda's bundled requests
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
 
         timestamp = int(time.time() * 1000)
         timestamp_str = str(timestamp)
@@ -0,0 +1,209 @@
+"""
+Lightweight latency histograms and stage timers for the BTC trading bots.
+
+Log-spaced fixed buckets, so recording is O(1) and memory is constant no
+matter how long the bot runs. Percentiles are interpolated within the
+bucket that holds the requested rank.
+
+StageTimers wraps per-stage histograms (price fetch, vol fetch, evaluation,
+order send, ...) and emits rolling p50/p95/p99 as JSON lines or CloudWatch
+Embedded Metric Format. Controlled by the LATENCY_METRICS env var:
+    off (default) - stage() returns a shared no-op context manager
+    json          - {"type": "latency", ...} lines on stdout
+    emf           - CloudWatch EMF lines (Lambda logs become metrics)
+"""
+
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+METRICS_MODE = os.environ.get('LATENCY_METRICS', 'off').lower()
+METRICS_NAMESPACE = os.environ.get('LATENCY_METRICS_NAMESPACE', 'BTCTrading')
+
+# Bucket upper bounds in milliseconds: 0.05ms .. ~60s, 10 buckets per decade
+_BUCKETS_PER_DECADE = 10
+_MIN_MS = 0.05
+_MAX_MS = 60_000.0
+BUCKET_BOUNDS_MS: List[float] = [
+    _MIN_MS * 10 ** (i / _BUCKETS_PER_DECADE)
+    for i in range(int(math.log10(_MAX_MS / _MIN_MS) * _BUCKETS_PER_DECADE) + 1)
+]
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram (milliseconds)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # last bucket = overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        """Record one observation in milliseconds."""
+        idx = bisect.bisect_left(BUCKET_BOUNDS_MS, latency_ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.total_ms += latency_ms
+            if latency_ms > self.max_ms:
+                self.max_ms = latency_ms
+
+    def record_since(self, start_perf: float, end_perf: float):
+        """Record the interval between two time.perf_counter() readings."""
+        self.record((end_perf - start_perf) * 1000)
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-th percentile (0-100) in milliseconds."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = q / 100 * self.count
+            seen = 0
+            for idx, n in enumerate(self._counts):
+                if n and seen + n >= rank:
+                    lower = BUCKET_BOUNDS_MS[idx - 1] if idx > 0 else 0.0
+                    upper = BUCKET_BOUNDS_MS[idx] if idx < len(BUCKET_BOUNDS_MS) else self.max_ms
+                    frac = (rank - seen) / n
+                    return min(lower + (upper - lower) * frac, self.max_ms)
+                seen += n
+            return self.max_ms
+
+    def summary(self) -> Dict:
+        """Count, mean, p50/p95/p99 and max in milliseconds."""
+        return {
+            'name': self.name,
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50), 3),
+            'p95_ms': round(self.percentile(95), 3),
+            'p99_ms': round(self.percentile(99), 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+    def format_line(self) -> str:
+        s = self.summary()
+        return (f"{self.name:<24} n={s['count']:<6} p50={s['p50_ms']:.2f}ms "
+                f"p95={s['p95_ms']:.2f}ms p99={s['p99_ms']:.2f}ms max={s['max_ms']:.2f}ms")
+
+
+class _NullStage:
+    """Shared no-op stage used when metrics are disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('_hist', '_start')
+
+    def __init__(self, hist: LatencyHistogram):
+        self._hist = hist
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.record((time.perf_counter() - self._start) * 1000)
+        return False
+
+
+class StageTimers:
+    """
+    Named stage histograms for one component (e.g. 'hf_bot', 'lambda').
+
+    Usage:
+        timers = StageTimers('lambda')
+        with timers.stage('price_fetch'):
+            ...
+        timers.emit()   # one JSON/EMF line, then the window resets
+    """
+
+    def __init__(self, component: str, mode: Optional[str] = None):
+        self.component = component
+        self.mode = (mode or METRICS_MODE).lower()
+        self.enabled = self.mode in ('json', 'emf')
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _hist(self, name: str) -> LatencyHistogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, LatencyHistogram(name))
+        return hist
+
+    def stage(self, name: str):
+        """Context manager timing one stage (no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self._hist(name))
+
+    def record(self, name: str, latency_ms: float):
+        if self.enabled:
+            self._hist(name).record(latency_ms)
+
+    def record_fetch(self, result, names: Optional[Dict[str, str]] = None):
+        """Record per-call timings from a concurrent_fetch.FetchResult."""
+        if not self.enabled:
+            return
+        names = names or {}
+        for call, ms in result.timings_ms.items():
+            self._hist(names.get(call, f"fetch_{call}")).record(ms)
+
+    def summaries(self) -> Dict[str, Dict]:
+        return {name: h.summary() for name, h in self._histograms.items() if h.count}
+
+    def emit(self, reset: bool = True):
+        """Print the current window as one structured line, then start a new window."""
+        if not self.enabled:
+            return
+        stages = self.summaries()
+        if stages:
+            line = self._emf(stages) if self.mode == 'emf' else {
+                'type': 'latency',
+                'component': self.component,
+                'timestamp': int(time.time() * 1000),
+                'stages': stages,
+            }
+            print(json.dumps(line))
+        if reset:
+            with self._lock:
+                self._histograms = {}
+
+    def _emf(self, stages: Dict[str, Dict]) -> Dict:
+        """CloudWatch Embedded Metric Format: <stage>_p50/_p95/_p99 per component."""
+        metrics, values = [], {}
+        for name, s in stages.items():
+            for q in ('p50', 'p95', 'p99'):
+                key = f"{name}_{q}"
+                metrics.append({'Name': key, 'Unit': 'Milliseconds'})
+                values[key] = s[f"{q}_ms"]
+            metrics.append({'Name': f"{name}_count", 'Unit': 'Count'})
+            values[f"{name}_count"] = s['count']
+        return {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': METRICS_NAMESPACE,
+                    'Dimensions': [['Component']],
+                    'Metrics': metrics,
+                }],
+            },
+            'Component': self.component,
+            **values,
+        }
@@ -0,0 +1,239 @@
+"""
+Realized P&L projection.
+
+Instead of replaying every trade ever made to show a total and the last 20
+closes, each close updates one small record:
+
+    realized_pnl, total_fees, closed_count, wins, losses,
+    recent  - the last RECENT_CLOSED closed trades, newest first
+    version - bumped on every write (optimistic concurrency)
+
+It is kept in two places:
+
+- DynamoDB: item pk='PNL', sk='CURRENT' in the positions table, written by
+  whoever closes a position (the trader Lambda inside its trade
+  transaction, the HF bot's PerformanceTracker in the background). Writes
+  are conditional on the version read, so concurrent writers retry instead
+  of overwriting each other.
+- SQLite: table pnl_projection in the bot's trade database, updated in the
+  same transaction as the liquidate row (see sqlite_record_close).
+
+replay() rebuilds a projection from raw trade records (FIFO matching of
+opens to closes) for backfills and for readers that find no projection.
+"""
+
+import json
+import math
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+PNL_KEY = {'pk': 'PNL', 'sk': 'CURRENT'}
+
+# Closed trades kept for display
+RECENT_CLOSED = 20
+
+# Optimistic-write attempts before giving up
+MAX_WRITE_ATTEMPTS = 5
+
+KALSHI_FEE_RATE = 0.07
+
+CLOSE_ACTIONS = ('liquidate', 'expired_win')
+OPEN_ACTIONS = ('open', 'add')
+
+
+def kalshi_fee(contracts, price_cents):
+    """Kalshi fee in dollars: ceil(0.07 x contracts x price x (1 - price)) cents."""
+    price = price_cents / 100
+    return math.ceil(KALSHI_FEE_RATE * contracts * price_cents * (1 - price)) / 100
+
+
+def empty_projection() -> Dict:
+    return {'realized_pnl': 0.0, 'total_fees': 0.0, 'closed_count': 0,
+            'wins': 0, 'losses': 0, 'recent': [], 'version': 0}
+
+
+def closed_trade(ticker: str, contracts: int, entry_price: float, exit_price: float,
+                 closed_at: str, opened_at: str = '', exit_fee: Optional[float] = None,
+                 model_fair: float = 0, open_edge: float = 0, vol_std: float = 0) -> Dict:
+    """
+    One closed trade with its P&L. Timestamps stay ISO UTC; readers convert
+    for display. exit_fee defaults to the Kalshi fee at exit_price (pass 0
+    for settlements).
+    """
+    entry_cost = contracts * entry_price / 100
+    entry_fee = kalshi_fee(contracts, entry_price) if entry_price > 0 else 0
+    if exit_fee is None:
+        exit_fee = kalshi_fee(contracts, exit_price)
+    pnl = contracts * exit_price / 100 - entry_cost - entry_fee - exit_fee
+    return {
+        'ticker': ticker,
+        'contracts': int(contracts),
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'pnl': round(pnl, 4),
+        'pnl_pct': round(pnl / entry_cost * 100, 1) if entry_cost > 0 else 0,
+        'fees': round(entry_fee + exit_fee, 2),
+        'opened_at': opened_at,
+        'closed_at': closed_at,
+        'model_fair': model_fair,
+        'open_edge': open_edge,
+        'vol_std': vol_std,
+    }
+
+
+def apply_close(projection: Dict, closed: Dict, limit: int = RECENT_CLOSED) -> Dict:
+    """New projection with one more closed trade (the input is not modified)."""
+    return {
+        'realized_pnl': round(projection['realized_pnl'] + closed['pnl'], 4),
+        'total_fees': round(projection['total_fees'] + closed['fees'], 4),
+        'closed_count': projection['closed_count'] + 1,
+        'wins': projection['wins'] + (1 if closed['pnl'] > 0 else 0),
+        'losses': projection['losses'] + (1 if closed['pnl'] <= 0 else 0),
+        'recent': ([closed] + projection['recent'])[:limit],
+        'version': projection['version'] + 1,
+    }
+
+
+def replay(trades: Iterable[Dict], limit: int = RECENT_CLOSED) -> Dict:
+    """
+    Projection from trade records in chronological order (HF_TRADE items or
+    SQLite rows as dicts: ticker, action, contracts, price_cents, sk or
+    timestamp, and optionally model_fair, edge_pct, vol_std). Each close is
+    matched with the oldest unmatched open for its ticker.
+    """
+    projection = empty_projection()
+    opens: Dict[str, List[Dict]] = {}
+    for t in trades:
+        ticker, action = t.get('ticker', ''), t.get('action', '')
+        timestamp = t.get('sk') or t.get('timestamp', '')
+        if action in OPEN_ACTIONS:
+            opens.setdefault(ticker, []).append(t)
+        elif action in CLOSE_ACTIONS:
+            entry = opens[ticker].pop(0) if opens.get(ticker) else {}
+            if ticker in opens and not opens[ticker]:
+                del opens[ticker]
+            closed = closed_trade(
+                ticker, int(t.get('contracts', 0)), float(entry.get('price_cents', 0) or 0),
+                float(t.get('price_cents', 0)), timestamp,
+                opened_at=entry.get('sk') or entry.get('timestamp', ''),
+                model_fair=float(entry.get('model_fair', 0) or 0),
+                open_edge=float(entry.get('edge_pct', 0) or 0),
+                vol_std=float(entry.get('vol_std', 0) or 0),
+            )
+            projection = apply_close(projection, closed, limit)
+    return projection
+
+
+# =============================================================================
+# DYNAMODB
+# =============================================================================
+
+def _to_float(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, list):
+        return [_to_float(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_float(v) for k, v in value.items()}
+    return value
+
+
+def _to_decimal(value):
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, list):
+        return [_to_decimal(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_decimal(v) for k, v in value.items()}
+    return value
+
+
+def load_projection(table) -> Optional[Dict]:
+    """The stored projection, or None if it hasn't been created yet."""
+    item = table.get_item(Key=PNL_KEY, ConsistentRead=True).get('Item')
+    if not item:
+        return None
+    projection = _to_float({k: v for k, v in item.items() if k not in PNL_KEY})
+    projection['closed_count'] = int(projection['closed_count'])
+    projection['wins'] = int(projection['wins'])
+    projection['losses'] = int(projection['losses'])
+    projection['version'] = int(projection['version'])
+    return projection
+
+
+def conditional_put(projection: Dict) -> Dict:
+    """
+    put() arguments that store projection only if the stored version is
+    still the one it was built from (or nothing is stored yet).
+    """
+    return {
+        'item': {**PNL_KEY, **_to_decimal(projection)},
+        'condition': 'attribute_not_exists(pk) OR version = :expected',
+        'values': {':expected': projection['version'] - 1},
+    }
+
+
+def is_conflict(error: Exception) -> bool:
+    """True if a write failed because another writer updated the projection first."""
+    code = getattr(error, 'response', {}).get('Error', {}).get('Code')
+    if code == 'ConditionalCheckFailedException':
+        return True
+    return code == 'TransactionCanceledException' and 'ConditionalCheckFailed' in str(error)
+
+
+def record_close(table, closed: Dict) -> Dict:
+    """Apply one close to the DynamoDB projection, retrying on version conflicts."""
+    for attempt in range(MAX_WRITE_ATTEMPTS):
+        projection = apply_close(load_projection(table) or empty_projection(), closed)
+        put = conditional_put(projection)
+        try:
+            table.put_item(Item=put['item'], ConditionExpression=put['condition'],
+                           ExpressionAttributeValues=put['values'])
+            return projection
+        except Exception as e:
+            if not is_conflict(e) or attempt == MAX_WRITE_ATTEMPTS - 1:
+                raise
+    return projection
+
+
+def store_projection(table, projection: Dict):
+    """
+    Overwrite the projection (backfill). The version still moves forward so
+    a writer holding an older read can't slip its update in on top.
+    """
+    current = load_projection(table)
+    version = max(projection['version'], current['version'] + 1 if current else 0)
+    table.put_item(Item={**PNL_KEY, **_to_decimal({**projection, 'version': version})})
+
+
+# =============================================================================
+# SQLITE
+# =============================================================================
+
+def sqlite_backfill(conn):
+    """
+    Build the pnl_projection row from the trades table if there is none yet
+    (run once by the db_schema migration that creates the table). Does not
+    commit.
+    """
+    if conn.execute("SELECT 1 FROM pnl_projection WHERE id = 1").fetchone():
+        return
+    columns = ('ticker', 'action', 'contracts', 'price_cents', 'timestamp', 'edge_pct')
+    rows = conn.execute(f"SELECT {', '.join(columns)} FROM trades ORDER BY id").fetchall()
+    projection = replay(dict(zip(columns, row)) for row in rows)
+    # OR IGNORE: another process may have built it in the meantime
+    conn.execute("INSERT OR IGNORE INTO pnl_projection (id, version, state_json) VALUES (1, ?, ?)",
+                 (projection['version'], json.dumps(projection)))
+
+
+def sqlite_load(conn) -> Optional[Dict]:
+    row = conn.execute("SELECT state_json FROM pnl_projection WHERE id = 1").fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def sqlite_record_close(conn, closed: Dict) -> Dict:
+    """Apply one close inside the caller's transaction (call before its commit)."""
+    projection = apply_close(sqlite_load(conn) or empty_projection(), closed)
+    conn.execute("INSERT OR REPLACE INTO pnl_projection (id, version, state_json) VALUES (1, ?, ?)",
+                 (projection['version'], json.dumps(projection)))
+    return projection
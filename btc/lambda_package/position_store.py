@@ -0,0 +1,107 @@
+"""
+Position access layer for the BTCHFPositions tables.
+
+Positions share their table with HF_TRADE and BALANCE items, so scanning
+for pk begins_with POS# reads the whole trade history to find a handful of
+positions. Instead every position item carries two extra attributes:
+
+    gsi1pk = 'OPEN_POS'
+    gsi1sk = <market ticker>
+
+feeding a sparse global secondary index (OpenPositionsIndex) that contains
+ONLY open positions. "All open positions" is a query on gsi1pk, and "open
+positions for event X" adds begins_with(gsi1sk, X). Both follow
+LastEvaluatedKey, so results never truncate at 1 MB, and their cost depends
+on how many positions are open rather than how many trades were ever made.
+
+If the index doesn't exist yet (see scripts/setup_position_index.sh) reads
+fall back to a paginated scan so nothing breaks mid-migration.
+"""
+
+from typing import Dict, List, Optional
+
+POSITIONS_INDEX = 'OpenPositionsIndex'
+OPEN_POSITION_PK = 'OPEN_POS'
+
+# Tables we've already found without the index - don't retry every call
+_index_missing = set()
+
+
+def position_key(ticker: str) -> Dict[str, str]:
+    """Primary key of a position item."""
+    return {'pk': f'POS#{ticker}', 'sk': 'CURRENT'}
+
+
+def index_attributes(ticker: str) -> Dict[str, str]:
+    """Attributes that put a position item into OpenPositionsIndex."""
+    return {'gsi1pk': OPEN_POSITION_PK, 'gsi1sk': ticker}
+
+
+def position_item(ticker: str, **attributes) -> Dict:
+    """Full item for put_item: keys, index attributes, ticker and the rest."""
+    return {**position_key(ticker), **index_attributes(ticker), 'ticker': ticker, **attributes}
+
+
+def _is_missing_index(error: Exception) -> bool:
+    code = getattr(error, 'response', {}).get('Error', {}).get('Code')
+    return code in ('ValidationException', 'ResourceNotFoundException') and 'index' in str(error).lower()
+
+
+def _paginate(operation, **kwargs) -> List[Dict]:
+    """Call table.query/table.scan until LastEvaluatedKey runs out."""
+    items = []
+    while True:
+        response = operation(**kwargs)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return items
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def _scan_positions(table, event_prefix: Optional[str]) -> List[Dict]:
+    """Fallback for tables without the index: paginated full scan."""
+    prefix = f'POS#{event_prefix}' if event_prefix else 'POS#'
+    return _paginate(
+        table.scan,
+        FilterExpression='begins_with(pk, :prefix)',
+        ExpressionAttributeValues={':prefix': prefix},
+    )
+
+
+def query_open_positions(table, event_prefix: Optional[str] = None) -> List[Dict]:
+    """
+    Raw DynamoDB items for every open position, or only those whose ticker
+    starts with event_prefix (e.g. 'KXBTCD-25DEC1912').
+    """
+    if table.name not in _index_missing:
+        from boto3.dynamodb.conditions import Key
+        condition = Key('gsi1pk').eq(OPEN_POSITION_PK)
+        if event_prefix:
+            condition = condition & Key('gsi1sk').begins_with(event_prefix)
+        try:
+            return _paginate(table.query, IndexName=POSITIONS_INDEX, KeyConditionExpression=condition)
+        except Exception as e:
+            if not _is_missing_index(e):
+                raise
+            print(f"[position_store] {table.name} has no {POSITIONS_INDEX} - falling back to scan")
+            _index_missing.add(table.name)
+    return _scan_positions(table, event_prefix)
+
+
+def backfill_index(table) -> int:
+    """
+    Add index attributes to position items written before the index existed.
+    Returns the number of items updated.
+    """
+    updated = 0
+    for item in _scan_positions(table, None):
+        if item.get('gsi1pk') == OPEN_POSITION_PK:
+            continue
+        table.update_item(
+            Key={'pk': item['pk'], 'sk': item['sk']},
+            UpdateExpression='SET gsi1pk = :pk, gsi1sk = :sk',
+            ExpressionAttributeValues={':pk': OPEN_POSITION_PK, ':sk': item['pk'][len('POS#'):]},
+        )
+        updated += 1
+    return updated
@@ -0,0 +1,358 @@
+"""
+Change-feed projector for the dashboard read models.
+
+Dashboards used to rebuild open positions, closed trades, P&L and balance
+from raw items on every refresh. The projector consumes the trade and
+position change feed instead and keeps those views materialized in one
+place:
+
+    open_positions - ticker -> position (contracts, avg price, strike, edge...)
+    pnl            - the realized P&L projection (see pnl_projection.py)
+    balance        - simulated balance (dry-run)
+    recent_trades  - the last RECENT_TRADES trades, newest first
+
+Two feeds, one Projector:
+
+- DynamoDB Streams on the positions table (prod). lambda_handler applies
+  each batch of stream records to the VIEW/DASHBOARD item in the same
+  table. Position, PNL and BALANCE records carry full new images, and
+  trades are keyed by (pk, sk) and skipped if already in recent_trades, so
+  re-delivered batches are harmless.
+- EventLog, an in-process feed (the HF bot's PerformanceTracker and
+  close_expired, and tests). Views are kept in the read_models table of the
+  bot's SQLite database. There are no position items locally, so positions
+  are derived from open/add/close trades (derive_positions=True).
+
+Consumers (dashboard_generator, generate_status, status.py,
+dashboard_server.py) only read the views.
+"""
+
+import json
+import os
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+try:
+    from pnl_projection import CLOSE_ACTIONS, MAX_WRITE_ATTEMPTS, PNL_KEY, is_conflict, load_projection, sqlite_load
+    from position_store import query_open_positions
+    from trade_log import TRADE_PK_PREFIX, LEGACY_TRADE_PK, query_trades
+except ImportError:  # Imported from btc/ as lambda_package.projector
+    from lambda_package.pnl_projection import (CLOSE_ACTIONS, MAX_WRITE_ATTEMPTS, PNL_KEY, is_conflict,
+                                               load_projection, sqlite_load)
+    from lambda_package.position_store import query_open_positions
+    from lambda_package.trade_log import TRADE_PK_PREFIX, LEGACY_TRADE_PK, query_trades
+
+VIEW_KEY = {'pk': 'VIEW', 'sk': 'DASHBOARD'}
+BALANCE_KEY = {'pk': 'BALANCE', 'sk': 'CURRENT'}
+
+# Trades kept for "last hour" summaries
+RECENT_TRADES = 200
+
+# Event types
+TRADE = 'trade'
+POSITION = 'position'
+PNL = 'pnl'
+BALANCE = 'balance'
+
+
+def feed_event(kind: str, data: Optional[Dict], key: Optional[str] = None) -> Dict:
+    """A feed event. data=None for a position means it was closed."""
+    return {'type': kind, 'key': key, 'data': data}
+
+
+def empty_views() -> Dict:
+    return {'open_positions': {}, 'pnl': None, 'balance': None, 'recent_trades': [],
+            'updated_at': None, 'version': 0}
+
+
+def _plain(value):
+    """DynamoDB values -> JSON-friendly Python (Decimal -> int/float)."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+def _position_view(item: Dict) -> Dict:
+    return {
+        'ticker': item.get('ticker', ''),
+        'contracts': int(item.get('contracts', 0)),
+        'avg_price_cents': float(item.get('avg_price_cents', 0)),
+        'strike_price': float(item.get('strike_price', 0)),
+        'last_edge': float(item.get('last_edge', 0) or 0),
+        'entry_edge': float(item.get('entry_edge', item.get('last_edge', 0)) or 0),
+        'opened_at': item.get('opened_at', ''),
+    }
+
+
+def _trade_key(item: Dict) -> Optional[str]:
+    """Identity of a DynamoDB trade record (None for local trades, which aren't redelivered)."""
+    if item.get('pk') and item.get('sk'):
+        return f"{item['pk']}|{item['sk']}"
+    return None
+
+
+def _trade_view(item: Dict) -> Dict:
+    return {
+        'key': _trade_key(item),
+        'ticker': item.get('ticker', ''),
+        'action': item.get('action', ''),
+        'contracts': int(item.get('contracts', 0)),
+        'price_cents': float(item.get('price_cents', 0)),
+        'edge_pct': float(item.get('edge_pct', 0) or 0),
+        'timestamp': item.get('sk') or item.get('timestamp', ''),
+    }
+
+
+class Projector:
+    """Applies feed events to the views."""
+
+    def __init__(self, views: Optional[Dict] = None, derive_positions: bool = False):
+        self.views = views or empty_views()
+        self.derive_positions = derive_positions
+
+    def apply(self, ev: Dict):
+        kind, data = ev['type'], ev['data']
+        views = self.views
+        if kind == POSITION:
+            if data is None:
+                views['open_positions'].pop(ev['key'], None)
+            else:
+                views['open_positions'][ev['key']] = _position_view(data)
+        elif kind == TRADE:
+            trade = _trade_view(data)
+            if trade['key'] and any(t.get('key') == trade['key'] for t in views['recent_trades']):
+                return  # Redelivered (stream retry, or already loaded by rebuild_views)
+            recent = deque(views['recent_trades'], maxlen=RECENT_TRADES)
+            recent.appendleft(trade)
+            views['recent_trades'] = list(recent)
+            if self.derive_positions:
+                self._derive_position(trade, data)
+        elif kind == PNL:
+            views['pnl'] = data
+        elif kind == BALANCE:
+            views['balance'] = float(data['balance']) if data else None
+        views['updated_at'] = datetime.now(timezone.utc).isoformat()
+
+    def _derive_position(self, trade: Dict, data: Dict):
+        positions = self.views['open_positions']
+        ticker = trade['ticker']
+        if trade['action'] == 'open' or (trade['action'] == 'add' and ticker not in positions):
+            positions[ticker] = _position_view({
+                **data, 'avg_price_cents': trade['price_cents'], 'last_edge': trade['edge_pct'],
+                'opened_at': trade['timestamp'],
+            })
+        elif trade['action'] == 'add':
+            pos = positions[ticker]
+            total = pos['contracts'] + trade['contracts']
+            pos['avg_price_cents'] = (pos['avg_price_cents'] * pos['contracts']
+                                      + trade['price_cents'] * trade['contracts']) / total
+            pos['contracts'] = total
+            pos['last_edge'] = trade['edge_pct']
+        elif trade['action'] in CLOSE_ACTIONS:
+            positions.pop(ticker, None)
+
+
+def trades_since(views: Dict, since: datetime, actions=None) -> List[Dict]:
+    """recent_trades at or after since (newest first), optionally only some actions."""
+    trades = []
+    for trade in views['recent_trades']:
+        ts = datetime.fromisoformat(trade['timestamp'].replace('Z', '+00:00'))
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)  # Naive timestamps are UTC
+        if ts < since:
+            break
+        if actions is None or trade['action'] in actions:
+            trades.append(trade)
+    return trades
+
+
+class EventLog:
+    """In-process change feed: append() hands each event to every subscriber, in order."""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[Dict], None]] = []
+
+    def subscribe(self, handler: Callable[[Dict], None]):
+        self._subscribers.append(handler)
+
+    def append(self, ev: Dict):
+        for handler in self._subscribers:
+            handler(ev)
+
+
+# =============================================================================
+# DYNAMODB (STREAMS)
+# =============================================================================
+
+def from_stream_record(record: Dict) -> Optional[Dict]:
+    """Feed event for one DynamoDB Streams record, or None if it isn't one we project."""
+    from boto3.dynamodb.types import TypeDeserializer
+    deserializer = TypeDeserializer()
+    change = record['dynamodb']
+    keys = {k: deserializer.deserialize(v) for k, v in change['Keys'].items()}
+    image = change.get('NewImage')
+    data = _plain({k: deserializer.deserialize(v) for k, v in image.items()}) if image else None
+    pk = keys['pk']
+
+    if pk.startswith('POS#'):
+        return feed_event(POSITION, None if record['eventName'] == 'REMOVE' else data, key=pk[len('POS#'):])
+    if pk.startswith(TRADE_PK_PREFIX) or pk == LEGACY_TRADE_PK:
+        return feed_event(TRADE, data) if record['eventName'] == 'INSERT' else None
+    if pk == PNL_KEY['pk'] and data:
+        return feed_event(PNL, {k: v for k, v in data.items() if k not in PNL_KEY})
+    if pk == BALANCE_KEY['pk']:
+        return feed_event(BALANCE, data)
+    return None  # VIEW and anything else
+
+
+def load_views(table) -> Optional[Dict]:
+    """The materialized views, or None if the projector hasn't built them yet."""
+    item = table.get_item(Key=VIEW_KEY, ConsistentRead=True).get('Item')
+    if not item:
+        return None
+    views = json.loads(item['views'])
+    views['version'] = int(item['version'])
+    return views
+
+
+def rebuild_views(table) -> Dict:
+    """Views from the table's current state (first run, or after a reset)."""
+    projector = Projector()
+    for item in query_open_positions(table):
+        projector.apply(feed_event(POSITION, _plain(item), key=item['ticker']))
+    projection = load_projection(table)
+    if projection:
+        projector.apply(feed_event(PNL, projection))
+    balance = table.get_item(Key=BALANCE_KEY).get('Item')
+    if balance:
+        projector.apply(feed_event(BALANCE, _plain(balance)))
+    since = datetime.now(timezone.utc) - timedelta(hours=2)
+    for item in query_trades(table, since):
+        projector.apply(feed_event(TRADE, _plain(item)))
+    return projector.views
+
+
+def store_views(table, views: Dict, expected_version: int):
+    """Write the views if nobody else has since expected_version (raises on conflict)."""
+    table.put_item(
+        Item={**VIEW_KEY, 'views': json.dumps({**views, 'version': expected_version + 1}),
+              'version': expected_version + 1},
+        ConditionExpression='attribute_not_exists(pk) OR version = :expected',
+        ExpressionAttributeValues={':expected': expected_version},
+    )
+
+
+def project_records(table, records: List[Dict]) -> Optional[Dict]:
+    """
+    Apply stream records to the stored views (optimistic, retried on conflict).
+    Returns None without writing if no record was projectable: the views live
+    in the streamed table, so storing them for a VIEW-only batch would
+    re-trigger the projector indefinitely.
+    """
+    events = [ev for ev in map(from_stream_record, records) if ev]
+    if not events:
+        return None
+    for attempt in range(MAX_WRITE_ATTEMPTS):
+        views = load_views(table)
+        version = views['version'] if views else 0
+        if views is None:
+            # Rebuilt from the table after these records were written: positions,
+            # P&L and balance already include them, and trades it loaded are
+            # skipped by key - apply only trades the rebuild didn't see
+            projector = Projector(rebuild_views(table))
+            pending = [ev for ev in events if ev['type'] == TRADE]
+        else:
+            projector = Projector(views)
+            pending = events
+        for ev in pending:
+            projector.apply(ev)
+        try:
+            store_views(table, projector.views, version)
+            return projector.views
+        except Exception as e:
+            if not is_conflict(e) or attempt == MAX_WRITE_ATTEMPTS - 1:
+                raise
+    return projector.views
+
+
+def lambda_handler(event, context):
+    """DynamoDB Streams trigger on the positions table (NEW_IMAGE or NEW_AND_OLD_IMAGES)."""
+    import boto3
+    records = event.get('Records', [])
+    if not records:
+        return {'statusCode': 200, 'projected': 0}
+    # arn:aws:dynamodb:<region>:<account>:table/<name>/stream/<label>
+    table_name = os.environ.get('POSITIONS_TABLE') or records[0]['eventSourceARN'].split('/')[1]
+    table = boto3.resource('dynamodb').Table(table_name)
+    views = project_records(table, records)
+    if views is None:
+        return {'statusCode': 200, 'projected': 0}
+    print(f"Projected {len(records)} record(s) into {table_name} views "
+          f"({len(views['open_positions'])} open positions)")
+    return {'statusCode': 200, 'projected': len(records)}
+
+
+# =============================================================================
+# SQLITE (LOCAL FEED)
+# =============================================================================
+
+def sqlite_backfill_views(conn):
+    """
+    Build the dashboard views from the trades table and the P&L projection
+    if they aren't stored yet (run once by the db_schema migration that
+    creates read_models). Does not commit.
+    """
+    if conn.execute("SELECT 1 FROM read_models WHERE name = 'dashboard'").fetchone():
+        return
+    projector = Projector(derive_positions=True)
+    columns = ('ticker', 'action', 'contracts', 'price_cents', 'edge_pct', 'strike_price', 'timestamp')
+    for row in conn.execute(f"SELECT {', '.join(columns)} FROM trades ORDER BY id"):
+        projector.apply(feed_event(TRADE, dict(zip(columns, row))))
+    projection = sqlite_load(conn)
+    if projection:
+        projector.apply(feed_event(PNL, projection))
+    # OR IGNORE: another process may have built it in the meantime
+    conn.execute("INSERT OR IGNORE INTO read_models (name, state_json) VALUES ('dashboard', ?)",
+                 (json.dumps(projector.views),))
+
+
+def sqlite_load_views(conn) -> Dict:
+    row = conn.execute("SELECT state_json FROM read_models WHERE name = 'dashboard'").fetchone()
+    return json.loads(row[0]) if row else empty_views()
+
+
+def sqlite_store_views(conn, views: Dict):
+    """Save the views inside the caller's transaction (call before its commit)."""
+    conn.execute("INSERT OR REPLACE INTO read_models (name, state_json) VALUES ('dashboard', ?)",
+                 (json.dumps(views),))
+
+
+def sqlite_projector(conn) -> EventLog:
+    """
+    Local feed whose events update the SQLite views inside the caller's
+    transaction, e.g.:
+
+        events = sqlite_projector(conn)
+        conn.execute("INSERT INTO trades ...")
+        events.append(feed_event(TRADE, row))
+        conn.commit()
+
+    The read_models table comes from db_schema (migrate before calling).
+    """
+    projector = Projector(derive_positions=True)
+    log = EventLog()
+
+    def project(ev):
+        # Re-read inside the transaction: other processes (close_expired) update the views too
+        projector.views = sqlite_load_views(conn)
+        projector.apply(ev)
+        sqlite_store_views(conn, projector.views)
+
+    log.subscribe(project)
+    return log
@@ -0,0 +1,62 @@
+"""
+Strike ladder for one or more Kalshi BTC events.
+
+Markets are kept sorted by floor_strike so the candidate strikes for a spot
+price are a bisect away, and a ticker → market dict gives O(1) position
+lookups. Replaces the per-cycle "scan every market, skip those at or below
+spot" loops and the per-position linear ticker searches.
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional
+
+# Only strikes within this many bps above spot are candidates by default.
+# Matches the theta surface extent - beyond it fair value is ~100¢.
+MAX_BPS_ABOVE = 300
+
+
+class StrikeLadder:
+    """Markets sorted by strike with ticker lookup."""
+
+    def __init__(self, markets: Iterable[Dict]):
+        markets = list(markets)
+        self.by_ticker: Dict[str, Dict] = {m.get('ticker'): m for m in markets if m.get('ticker')}
+        self.markets: List[Dict] = sorted(
+            (m for m in markets if m.get('floor_strike')),
+            key=lambda m: m['floor_strike'],
+        )
+        self.strikes: List[float] = [m['floor_strike'] for m in self.markets]
+
+    def __len__(self) -> int:
+        return len(self.by_ticker)
+
+    def __iter__(self):
+        return iter(self.by_ticker.values())
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Market for a ticker, or None."""
+        return self.by_ticker.get(ticker)
+
+    def update(self, market: Dict) -> Optional[Dict]:
+        """Merge a fresh quote into the stored market (strike is unchanged)."""
+        current = self.by_ticker.get(market.get('ticker'))
+        if current is not None:
+            current.update(market)
+        return current
+
+    def above(self, spot: float, min_bps: float = 0,
+              max_bps: Optional[float] = MAX_BPS_ABOVE) -> List[Dict]:
+        """
+        Markets with strikes above spot, nearest first.
+
+        min_bps=0 means strictly above spot; otherwise strikes at least
+        min_bps above. max_bps=None removes the upper band.
+        """
+        if min_bps > 0:
+            lo = bisect.bisect_left(self.strikes, spot * (1 + min_bps / 10000))
+        else:
+            lo = bisect.bisect_right(self.strikes, spot)
+        if max_bps is None:
+            return self.markets[lo:]
+        hi = bisect.bisect_right(self.strikes, spot * (1 + max_bps / 10000), lo)
+        return self.markets[lo:hi]
@@ -0,0 +1,163 @@
+"""
+Precomputed NO fair-value surface for BTC hourly contracts.
+
+Builds the random-walk fair value once per volatility update over a grid of
+(vol, minutes to settlement, bps of strike above spot) and serves lookups,
+theta and delta straight off the grid. Shared by the HF bot, the dashboard
+generators and plot_theta.py so they all price from the same numbers.
+
+Model (same as HFTradingBot.calculate_model_probability):
+    vol_scaled = vol_15m × √(minutes / 15)
+    z          = (bps / 100) / vol_scaled
+    P(NO wins) = Φ(z)
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+# Grid extent - strikes more than 3% from spot are ~0/100¢ at any hourly vol
+BPS_MIN = -300
+BPS_MAX = 300
+BPS_STEP = 1
+
+# Minutes to settlement (0 = settled, 60 = top of the previous hour)
+MINUTES_MAX = 60
+
+# Vol axis as multiples of the current 15m vol (uniform so lookup is O(1))
+VOL_MULT_MIN = 0.5
+VOL_MULT_STEP = 0.25
+VOL_MULT_COUNT = 7  # 0.5x .. 2.0x
+
+# Relative vol change before the surface is considered stale
+REBUILD_TOLERANCE = 0.005
+
+
+def norm_cdf(z: np.ndarray) -> np.ndarray:
+    """Vectorized version of the bot's normal CDF approximation."""
+    z = np.asarray(z, dtype=np.float64)
+    t = 1 / (1 + 0.2316419 * np.abs(z))
+    d = 0.3989423 * np.exp(-z * z / 2)
+    p = d * t * (0.3193815 + t * (-0.3565638 + t * (1.781478 + t * (-1.821256 + t * 1.330274))))
+    prob = np.where(z > 0, 1 - p, p)
+    prob = np.where(z < -6, 0.0, prob)
+    return np.where(z > 6, 1.0, prob)
+
+
+class ThetaSurface:
+    """
+    NO fair-value probabilities on a (vol, minutes, bps) grid.
+
+    Arrays are float32 with shape (VOL_MULT_COUNT, MINUTES_MAX + 1, n_bps):
+        fair  - P(NO wins)
+        theta - change in P(NO wins) for one minute elapsing (per minute)
+        delta - change in P(NO wins) for the strike moving 1bp further away
+    """
+
+    def __init__(self, vol_15m: float):
+        if vol_15m <= 0:
+            raise ValueError(f"vol_15m must be positive, got {vol_15m}")
+        self.vol_15m = vol_15m
+        self.bps = np.arange(BPS_MIN, BPS_MAX + BPS_STEP, BPS_STEP, dtype=np.float64)
+        self.minutes = np.arange(0, MINUTES_MAX + 1, dtype=np.float64)
+        self.vol_multipliers = VOL_MULT_MIN + VOL_MULT_STEP * np.arange(VOL_MULT_COUNT)
+        self.vols = vol_15m * self.vol_multipliers
+        self._center = int(round((1.0 - VOL_MULT_MIN) / VOL_MULT_STEP))
+
+        vol = self.vols[:, None, None]
+        minutes = self.minutes[None, :, None]
+        bps = self.bps[None, None, :]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vol_scaled = vol * np.sqrt(minutes / 15)
+            z = (bps / 100) / vol_scaled
+        fair = norm_cdf(z)
+        # At settlement NO wins only if BTC finished below the strike
+        fair[:, 0, :] = np.where(self.bps > 0, 1.0, 0.0)
+
+        self.fair = fair.astype(np.float32)
+        # Theta: value gained as the clock runs down one minute (m -> m-1)
+        theta = np.zeros_like(fair)
+        theta[:, 1:, :] = fair[:, :-1, :] - fair[:, 1:, :]
+        self.theta = theta.astype(np.float32)
+        self.delta = np.gradient(fair, BPS_STEP, axis=2).astype(np.float32)
+
+    @classmethod
+    def build(cls, vol_15m: float) -> 'ThetaSurface':
+        """Build a surface centered on the current 15m volatility (% std dev)."""
+        return cls(vol_15m)
+
+    def matches(self, vol_15m: float) -> bool:
+        """True if this surface was built for (approximately) this volatility."""
+        return abs(vol_15m - self.vol_15m) <= REBUILD_TOLERANCE * self.vol_15m
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def _vol_index(self, vol_15m: float = None) -> int:
+        if vol_15m is None:
+            return self._center
+        idx = int(round((vol_15m / self.vol_15m - VOL_MULT_MIN) / VOL_MULT_STEP))
+        return min(max(idx, 0), VOL_MULT_COUNT - 1)
+
+    def _read(self, grid: np.ndarray, bps_above: float, minutes: int, vol_15m: float = None) -> float:
+        """Read a grid value, linearly interpolated along the bps axis."""
+        v = self._vol_index(vol_15m)
+        m = min(max(int(minutes), 0), MINUTES_MAX)
+        pos = (min(max(bps_above, BPS_MIN), BPS_MAX) - BPS_MIN) / BPS_STEP
+        lo = int(pos)
+        hi = min(lo + 1, len(self.bps) - 1)
+        frac = pos - lo
+        row = grid[v, m]
+        return float(row[lo] + (row[hi] - row[lo]) * frac)
+
+    def fair_prob(self, bps_above: float, minutes: int, vol_15m: float = None) -> float:
+        """P(NO wins) for a strike bps_above spot with `minutes` left."""
+        return self._read(self.fair, bps_above, minutes, vol_15m)
+
+    def theta_at(self, bps_above: float, minutes: int, vol_15m: float = None) -> float:
+        """Probability gained per minute of time decay."""
+        return self._read(self.theta, bps_above, minutes, vol_15m)
+
+    def delta_at(self, bps_above: float, minutes: int, vol_15m: float = None) -> float:
+        """Probability gained per 1bp increase in distance to strike."""
+        return self._read(self.delta, bps_above, minutes, vol_15m)
+
+    def covers(self, bps_above: float, minutes: int) -> bool:
+        """True if the point lies inside the grid (no clamping needed)."""
+        return BPS_MIN <= bps_above <= BPS_MAX and 0 < minutes <= MINUTES_MAX
+
+    def curve(self, bps_above: float, minutes, vol_15m: float = None) -> np.ndarray:
+        """Fair value probabilities for one strike over an array of minutes."""
+        return np.array([self.fair_prob(bps_above, m, vol_15m) for m in minutes])
+
+    # -------------------------------------------------------------------------
+    # Dashboard export
+    # -------------------------------------------------------------------------
+
+    def to_dict(self, bps_points=(10, 25, 50, 75, 100), minute_step: int = 5,
+                minutes_left: int = None) -> Dict:
+        """
+        JSON-serializable downsample of the center-vol surface.
+
+        Fair values are in cents. Only minutes <= minutes_left are included
+        when given, so the chart shows the rest of the current hour.
+        """
+        top = MINUTES_MAX if minutes_left is None else min(max(int(minutes_left), 0), MINUTES_MAX)
+        minutes = list(range(top, -1, -minute_step))
+        if minutes[-1] != 0:
+            minutes.append(0)
+
+        curves = []
+        for bps in bps_points:
+            fair = [round(self.fair_prob(bps, m) * 100, 2) for m in minutes]
+            theta = [round(self.theta_at(bps, m) * 100, 3) for m in minutes]
+            curves.append({'bps': bps, 'fair_cents': fair, 'theta_cents_per_min': theta})
+
+        return {
+            'vol_15m': round(self.vol_15m, 4),
+            'minutes': minutes,
+            'curves': curves,
+        }
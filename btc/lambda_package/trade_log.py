@@ -0,0 +1,90 @@
+"""
+Time-partitioned HF trade log.
+
+Trade records used to share one partition key, pk='HF_TRADE', so every
+write hit the same partition and every read scanned the whole table. They
+are now written to one partition per UTC day:
+
+    pk = 'HF_TRADE#20260118'
+    sk = '2026-01-18T17:04:12.345678+00:00'   (ISO timestamp, time-ordered)
+
+query_trades() reads only the days covering the requested range, one
+paginated Query per day partition, run in parallel. Records written before
+partitioning remain under the legacy 'HF_TRADE' key and are included in
+range reads via the same sk BETWEEN condition.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Union
+
+try:
+    from concurrent_fetch import gather
+except ImportError:  # Imported from btc/ as lambda_package.trade_log
+    from lambda_package.concurrent_fetch import gather
+
+TRADE_PK_PREFIX = 'HF_TRADE#'
+LEGACY_TRADE_PK = 'HF_TRADE'
+
+
+def _as_utc(ts: Union[str, datetime]) -> datetime:
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+    # Naive timestamps in this codebase are utcnow()
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def trade_partition(ts: Union[str, datetime, date]) -> str:
+    """Partition key for the UTC day containing ts."""
+    day = ts if isinstance(ts, date) and not isinstance(ts, datetime) else _as_utc(ts).date()
+    return f"{TRADE_PK_PREFIX}{day.strftime('%Y%m%d')}"
+
+
+def trade_keys(ts: Optional[Union[str, datetime]] = None) -> Dict[str, str]:
+    """pk/sk for a trade record at ts (default: now)."""
+    moment = _as_utc(ts) if ts is not None else datetime.now(timezone.utc)
+    return {'pk': trade_partition(moment), 'sk': moment.isoformat()}
+
+
+def partitions_between(start: datetime, end: datetime) -> List[str]:
+    """Day partitions overlapping [start, end]."""
+    day, last = _as_utc(start).date(), _as_utc(end).date()
+    partitions = []
+    while day <= last:
+        partitions.append(trade_partition(day))
+        day += timedelta(days=1)
+    return partitions
+
+
+def _query_partition(table, pk: str, start_sk: str, end_sk: str) -> List[Dict]:
+    from boto3.dynamodb.conditions import Key
+    kwargs = {'KeyConditionExpression': Key('pk').eq(pk) & Key('sk').between(start_sk, end_sk)}
+    items = []
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response.get('Items', []))
+        if not response.get('LastEvaluatedKey'):
+            return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def query_trades(table, start: datetime, end: Optional[datetime] = None,
+                 include_legacy: bool = True) -> List[Dict]:
+    """
+    Trade records with start <= timestamp <= end (default: now), oldest first.
+    Raises RuntimeError if any partition can't be read, since callers compute
+    P&L from the result and a silently missing day would be wrong.
+    """
+    end = _as_utc(end) if end else datetime.now(timezone.utc)
+    start = _as_utc(start)
+    start_sk, end_sk = start.isoformat(), end.isoformat()
+
+    pks = partitions_between(start, end)
+    if include_legacy:
+        pks.append(LEGACY_TRADE_PK)
+    fetched = gather({pk: (lambda pk=pk: _query_partition(table, pk, start_sk, end_sk)) for pk in pks})
+    if fetched.errors:
+        raise RuntimeError(f"Trade log query failed: {fetched.errors}")
+
+    items = [item for pk in pks for item in fetched.values[pk]]
+    items.sort(key=lambda item: _as_utc(item['sk']))
+    return items
@@ -0,0 +1,169 @@
+"""
+Batched DynamoDB writes for trades.
+
+Two patterns:
+
+- TradeUnit: the position change, trade log record and balance update of
+  ONE trade, committed together in a single TransactWriteItems call (all or
+  nothing, one round trip instead of three or four sequential ones).
+
+- AsyncTradeWriter: fire-and-forget audit records (PerformanceTracker's
+  HF_TRADE log) queued from the order path and written by a background
+  thread with batch_writer, so placing an order never waits on the audit
+  write. Follow-up work (e.g. the P&L projection update) can be queued
+  behind them with submit().
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
+
+# TransactWriteItems accepts at most 100 actions
+MAX_TRANSACT_ITEMS = 100
+
+# How long the background writer waits to fill a batch
+ASYNC_BATCH_WAIT_SEC = 0.5
+
+
+class TradeUnit:
+    """
+    Collect the writes for one trade, then commit them atomically.
+
+        unit = TradeUnit(table)
+        unit.put(position_item(...))
+        unit.put(trade_item)
+        unit.put(balance_item)
+        unit.commit()
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.actions: List[Dict] = []
+
+    def put(self, item: Dict, condition: Optional[str] = None,
+            values: Optional[Dict] = None) -> 'TradeUnit':
+        """Add a put; with condition, the whole unit fails if it doesn't hold."""
+        # DynamoDB rejects None attribute values written through the resource
+        action = {'Put': {k: v for k, v in item.items() if v is not None}}
+        if condition:
+            action['Condition'] = (condition, values or {})
+        self.actions.append(action)
+        return self
+
+    def delete(self, key: Dict) -> 'TradeUnit':
+        self.actions.append({'Delete': key})
+        return self
+
+    def __len__(self):
+        return len(self.actions)
+
+    def commit(self):
+        """One TransactWriteItems call for everything collected (raises on failure)."""
+        if not self.actions:
+            return
+        if len(self.actions) > MAX_TRANSACT_ITEMS:
+            raise ValueError(f"TradeUnit has {len(self.actions)} writes (max {MAX_TRANSACT_ITEMS})")
+
+        from boto3.dynamodb.types import TypeSerializer
+        serializer = TypeSerializer()
+
+        def serialize(attrs):
+            return {k: serializer.serialize(v) for k, v in attrs.items()}
+
+        items = []
+        for action in self.actions:
+            if 'Put' in action:
+                put = {'TableName': self.table.name, 'Item': serialize(action['Put'])}
+                if 'Condition' in action:
+                    expression, values = action['Condition']
+                    put['ConditionExpression'] = expression
+                    put['ExpressionAttributeValues'] = serialize(values)
+                items.append({'Put': put})
+            else:
+                items.append({'Delete': {'TableName': self.table.name, 'Key': serialize(action['Delete'])}})
+        self.table.meta.client.transact_write_items(TransactItems=items)
+        self.actions = []
+
+
+class AsyncTradeWriter:
+    """Background batch writer for items nobody waits on."""
+
+    def __init__(self, table):
+        self.table = table
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="trade-writer", daemon=True)
+        self._thread.start()
+        self.failed = 0
+        self._queued = 0    # items/tasks put (caller thread)
+        self._done = 0      # items/tasks written or run, failed or not (writer thread)
+
+    def put(self, item: Dict):
+        self._queued += 1
+        self._queue.put(item)
+
+    def submit(self, task: Callable[[], None]):
+        """Run task on the writer thread after the items queued before it."""
+        self._queued += 1
+        self._queue.put(task)
+
+    @property
+    def pending(self) -> int:
+        """Items and tasks queued or in flight (not yet written, retried or failed)."""
+        return self._queued - self._done
+
+    def _drain(self) -> List[Optional[Dict]]:
+        """Block for one item, then take whatever else arrives within the batch window."""
+        batch = [self._queue.get()]
+        while batch[-1] is not None:
+            try:
+                batch.append(self._queue.get(timeout=ASYNC_BATCH_WAIT_SEC))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, items: List[Dict]):
+        try:
+            # batch_writer chunks into 25-item BatchWriteItem calls and retries unprocessed items
+            with self.table.batch_writer(overwrite_by_pkeys=['pk', 'sk']) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+        except Exception as e:
+            self.failed += len(items)
+            print(f"[TradeWriter] Failed to write {len(items)} trade record(s) to DynamoDB: {e}")
+
+    def _run_task(self, task: Callable[[], None]):
+        try:
+            task()
+        except Exception as e:
+            self.failed += 1
+            print(f"[TradeWriter] Background task failed: {e}")
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            stop = batch[-1] is None
+            items = [item for item in batch if isinstance(item, dict)]
+            if items:
+                self._write(items)
+            for task in batch:
+                if callable(task):
+                    self._run_task(task)
+            self._done += len(batch) - stop
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """Wait until everything queued so far is written."""
+        self._queue.join()
+
+    def close(self, timeout: float = 10.0) -> int:
+        """
+        Write what's queued and stop the thread. Returns how many items and
+        tasks were still queued or in flight when the join timed out (0 if
+        everything was written or failed).
+        """
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        return self.pending
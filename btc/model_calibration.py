@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Model Calibration for BTC High-Frequency Trading Bot
+
+Fits corrections to the random-walk model from settled price_observations
+(model_prob vs actual_outcome), per minutes-to-settlement bucket:
+
+1. Volatility multiplier k:   P' = Φ(Φ⁻¹(P) / k)
+   (equivalent to pricing with vol × k)
+2. Platt recalibration:       P'' = σ(a · logit(P') + b)
+
+Observations are streamed in chunks (hf_trades.db plus the Parquet archive,
+via analytics.observation_chunks) and reduced to a histogram
+of z-scores per bucket (count + NO wins per bin), so memory is flat and the
+fit itself runs on a few thousand bins regardless of database size.
+
+The fitted parameters are written to a small JSON artifact that the bot
+loads at startup.
+
+Usage:
+    python model_calibration.py                              # hf_trades.db -> model_calibration.json
+    python model_calibration.py --db other.db --out cal.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analytics import observation_chunks
+from archive import ARCHIVE_DIR
+from lambda_package.theta_surface import norm_cdf
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DB_PATH = "hf_trades.db"
+CALIBRATION_PATH = "model_calibration.json"
+
+# Minutes-to-settlement buckets (inclusive)
+MINUTE_BUCKETS = [(1, 5), (6, 10), (11, 15), (16, 30), (31, 45), (46, 60)]
+
+# Candidate vol multipliers for the grid search
+VOL_MULTIPLIER_GRID = np.round(np.arange(0.50, 2.0001, 0.025), 3)
+
+# z-score histogram resolution
+Z_MAX = 6.0
+Z_BIN_WIDTH = 0.01
+
+# Rows fetched from SQLite per chunk
+CHUNK_SIZE = 100_000
+
+# Buckets with fewer settled observations keep the identity calibration
+MIN_BUCKET_SAMPLES = 200
+
+# Probabilities are clipped away from 0/1 before taking logits
+PROB_EPS = 1e-6
+
+# Inverse of the bot's CDF approximation, tabulated once
+_Z_GRID = np.linspace(-Z_MAX, Z_MAX, 24001)
+_CDF_GRID = norm_cdf(_Z_GRID)
+
+
+def _norm_ppf(p: np.ndarray) -> np.ndarray:
+    """Invert the bot's normal CDF approximation by table interpolation."""
+    return np.interp(p, _CDF_GRID, _Z_GRID)
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, PROB_EPS, 1 - PROB_EPS)
+    return np.log(p / (1 - p))
+
+
+def _log_loss(p: np.ndarray, wins: np.ndarray, counts: np.ndarray) -> float:
+    """Total binary log loss for binned outcomes."""
+    p = np.clip(p, PROB_EPS, 1 - PROB_EPS)
+    return float(-(wins * np.log(p) + (counts - wins) * np.log(1 - p)).sum())
+
+
+def _bucket_index(minutes: np.ndarray) -> np.ndarray:
+    """Map minutes to bucket index, -1 if outside every bucket."""
+    idx = np.full(minutes.shape, -1, dtype=np.int64)
+    for i, (lo, hi) in enumerate(MINUTE_BUCKETS):
+        idx[(minutes >= lo) & (minutes <= hi)] = i
+    return idx
+
+
+# =============================================================================
+# FITTING
+# =============================================================================
+
+def _accumulate_histograms(chunks: Iterable[pd.DataFrame]):
+    """
+    Reduce settled observation chunks (model_prob, minutes_to_settlement,
+    actual_outcome, weighted by sample count) into per-bucket z-score
+    histograms.
+
+    Returns (counts, wins, rows) where counts/wins have shape
+    (n_buckets, n_z_bins) and rows is the number of evaluations.
+    """
+    n_bins = int(round(2 * Z_MAX / Z_BIN_WIDTH)) + 1
+    counts = np.zeros((len(MINUTE_BUCKETS), n_bins), dtype=np.float64)
+    wins = np.zeros_like(counts)
+    rows = 0
+
+    for chunk in chunks:
+        data = np.column_stack([
+            chunk['model_prob'].to_numpy(dtype=np.float64),
+            chunk['minutes_to_settlement'].to_numpy(dtype=np.float64),
+            (chunk['actual_outcome'] == 'NO_WIN').to_numpy(dtype=np.float64),
+            chunk['weight'].to_numpy(dtype=np.float64),
+        ])
+        rows += int(data[:, 3].sum())
+
+        bucket = _bucket_index(data[:, 1])
+        keep = bucket >= 0
+        z = _norm_ppf(data[keep, 0])
+        z_bin = np.clip(np.rint((z + Z_MAX) / Z_BIN_WIDTH), 0, n_bins - 1).astype(np.int64)
+        flat = bucket[keep] * n_bins + z_bin
+
+        weight = data[keep, 3]
+        counts += np.bincount(flat, weights=weight, minlength=counts.size).reshape(counts.shape)
+        wins += np.bincount(flat, weights=weight * data[keep, 2], minlength=wins.size).reshape(wins.shape)
+
+    return counts, wins, rows
+
+
+def _fit_vol_multiplier(z: np.ndarray, wins: np.ndarray, counts: np.ndarray) -> float:
+    """Grid-search the vol multiplier minimizing log loss."""
+    probs = norm_cdf(z[None, :] / VOL_MULTIPLIER_GRID[:, None])
+    probs = np.clip(probs, PROB_EPS, 1 - PROB_EPS)
+    losses = -(wins * np.log(probs) + (counts - wins) * np.log(1 - probs)).sum(axis=1)
+    return float(VOL_MULTIPLIER_GRID[int(np.argmin(losses))])
+
+
+def _fit_platt(x: np.ndarray, wins: np.ndarray, counts: np.ndarray,
+               iterations: int = 50) -> Tuple[float, float]:
+    """Weighted logistic regression of outcome on logit(p) via Newton's method."""
+    a, b = 1.0, 0.0
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-(a * x + b)))
+        residual = wins - counts * p
+        w = counts * p * (1 - p)
+        grad = np.array([(residual * x).sum(), residual.sum()])
+        hess = np.array([[(w * x * x).sum(), (w * x).sum()],
+                         [(w * x).sum(), w.sum()]]) + 1e-9 * np.eye(2)
+        step = np.linalg.solve(hess, grad)
+        a, b = a + step[0], b + step[1]
+        if np.abs(step).max() < 1e-8:
+            break
+    return float(a), float(b)
+
+
+def fit_calibration(db_path: str = DB_PATH, chunk_size: int = CHUNK_SIZE,
+                    archive_dir: Optional[str] = ARCHIVE_DIR) -> Dict:
+    """Fit per-bucket vol multipliers and Platt curves from a SQLite DB and its Parquet archive."""
+    start = time.perf_counter()
+    counts, wins, rows = _accumulate_histograms(observation_chunks(
+        db_path, archive_dir, ('model_prob', 'minutes_to_settlement', 'actual_outcome'),
+        settled_only=True, chunk_size=chunk_size))
+
+    z_centers = -Z_MAX + Z_BIN_WIDTH * np.arange(counts.shape[1])
+    buckets = []
+    for i, (lo, hi) in enumerate(MINUTE_BUCKETS):
+        occupied = counts[i] > 0
+        n = int(counts[i].sum())
+        entry = {
+            'min_minutes': lo,
+            'max_minutes': hi,
+            'samples': n,
+            'vol_multiplier': 1.0,
+            'platt_a': 1.0,
+            'platt_b': 0.0,
+        }
+        if n >= MIN_BUCKET_SAMPLES:
+            z, w, c = z_centers[occupied], wins[i][occupied], counts[i][occupied]
+            k = _fit_vol_multiplier(z, w, c)
+            p_k = norm_cdf(z / k)
+            a, b = _fit_platt(_logit(p_k), w, c)
+            p_final = 1 / (1 + np.exp(-(a * _logit(p_k) + b)))
+            entry.update({
+                'vol_multiplier': k,
+                'platt_a': round(a, 6),
+                'platt_b': round(b, 6),
+                'log_loss_before': round(_log_loss(norm_cdf(z), w, c) / n, 6),
+                'log_loss_after': round(_log_loss(p_final, w, c) / n, 6),
+            })
+        buckets.append(entry)
+
+    return {
+        'fitted_at': datetime.now(timezone.utc).isoformat(),
+        'source': os.path.basename(db_path),
+        'rows': rows,
+        'fit_seconds': round(time.perf_counter() - start, 3),
+        'buckets': buckets,
+    }
+
+
+# =============================================================================
+# RUNTIME
+# =============================================================================
+
+class ModelCalibration:
+    """
+    Fitted corrections applied by the pricing code.
+
+    Loaded once at startup; lookups are O(1) via a per-minute table.
+    Without an artifact every bucket is the identity (k=1, a=1, b=0).
+    """
+
+    def __init__(self, buckets: Optional[List[Dict]] = None):
+        self.buckets = buckets or []
+        self._by_minute: List[Optional[Dict]] = [None] * 61
+        for bucket in self.buckets:
+            for m in range(bucket['min_minutes'], bucket['max_minutes'] + 1):
+                if 0 <= m <= 60:
+                    self._by_minute[m] = bucket
+
+    @classmethod
+    def load(cls, path: str = CALIBRATION_PATH) -> 'ModelCalibration':
+        """Load an artifact, falling back to the identity calibration."""
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            print(f"[ModelCalibration] Loaded {path} (fitted {data.get('fitted_at')}, {data.get('rows', 0):,} rows)")
+            return cls(data.get('buckets', []))
+        except Exception as e:
+            print(f"[WARNING] Could not load calibration {path}: {e}")
+            return cls()
+
+    def _bucket(self, minutes: int) -> Optional[Dict]:
+        return self._by_minute[min(max(int(minutes), 0), 60)]
+
+    def vol_multiplier(self, minutes: int) -> float:
+        bucket = self._bucket(minutes)
+        return bucket['vol_multiplier'] if bucket else 1.0
+
+    def recalibrate(self, prob: float, minutes: int) -> float:
+        """Apply the bucket's Platt curve to a (vol-adjusted) probability."""
+        bucket = self._bucket(minutes)
+        if not bucket or (bucket['platt_a'] == 1.0 and bucket['platt_b'] == 0.0):
+            return prob
+        p = min(max(prob, PROB_EPS), 1 - PROB_EPS)
+        x = bucket['platt_a'] * math.log(p / (1 - p)) + bucket['platt_b']
+        return 1 / (1 + math.exp(-x))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit model calibration from settled observations')
+    parser.add_argument('--db', default=DB_PATH, help=f'SQLite database (default: {DB_PATH})')
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help=f'Parquet archive (default: {ARCHIVE_DIR}/)')
+    parser.add_argument('--out', default=CALIBRATION_PATH, help=f'Output artifact (default: {CALIBRATION_PATH})')
+    args = parser.parse_args()
+
+    result = fit_calibration(args.db, archive_dir=args.archive_dir)
+    with open(args.out, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    print(f"✅ Fitted {result['rows']:,} settled observations in {result['fit_seconds']:.2f}s → {args.out}")
+    print(f"\n   {'Minutes':<10} {'Samples':>9} {'Vol ×':>7} {'Platt a':>9} {'Platt b':>9} {'LogLoss':>17}")
+    for b in result['buckets']:
+        loss = ""
+        if 'log_loss_before' in b:
+            loss = f"{b['log_loss_before']:.4f}→{b['log_loss_after']:.4f}"
+        print(f"   {b['min_minutes']:>2}-{b['max_minutes']:<7} {b['samples']:>9,} {b['vol_multiplier']:>7.3f} "
+              f"{b['platt_a']:>9.3f} {b['platt_b']:>9.3f} {loss:>17}")
+
+
+if __name__ == "__main__":
+    main()
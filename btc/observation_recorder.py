@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Change-only recording of price observations (delta encoding).
+
+The bot evaluates every strike each scan (every spot tick / quote in
+event-driven mode), and most evaluations repeat the previous one: same ask,
+same bid, same minute, BTC a few dollars away. Instead of a row per
+evaluation, price_observations holds one row per *state*:
+
+    timestamp     first sample of the state (all values are from this sample)
+    last_seen     last sample that matched it (NULL = single sample)
+    sample_count  evaluations the state covers
+
+A sample matches the ticker's current state when every field equals the
+state's first sample within the tolerances (fields not listed must be
+equal): TOLERANCES for fixed-interval scans, EVENT_DRIVEN_TOLERANCES for
+event-driven mode.
+Comparing against the first sample, not the previous one, keeps slow drift
+from stretching a state. A state ends when a sample differs, or when a
+scan cycle passes without the ticker being observed (its edge went away).
+
+Writes: a state's row is inserted when it starts (so it is visible right
+away), and its last_seen / sample_count are updated once when it ends -
+or every TOUCH_SEC while it lasts, so readers see it is still current.
+
+Readers weight each row by sample_count (analytics.py does); reconstruct()
+expands the rows back into one row per evaluation.
+
+Usage (compare a database's rows with the evaluations they cover):
+    python observation_recorder.py [hf_trades.db]
+"""
+
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Columns of a recorded sample, in the order record_observation builds them
+OBSERVATION_COLUMNS = ('timestamp', 'ticker', 'price_cents', 'edge_pct', 'model_prob', 'market_prob',
+                       'btc_price', 'strike_price', 'bps_above_current', 'minutes_to_settlement',
+                       'was_traded', 'bid_price_cents', 'spread_cents')
+
+# Largest difference from the state's first sample that is still the same
+# state. Below what the reports resolve (edge to 0.1%, model prob to 0.1%);
+# prices, bid, minutes and was_traded must match exactly.
+#
+# Fixed-interval scans (10s): BTC moves enough between scans that few
+# samples repeat - ~1.1x fewer rows here, and still only ~2x with every
+# float ignored - so there is no tolerance worth coarsening the data for.
+TOLERANCES = {
+    'edge_pct': 0.1,            # percentage points
+    'model_prob': 0.001,
+    'btc_price': 5.0,           # dollars (~0.5 bps)
+    'bps_above_current': 0.5,
+}
+
+# Event-driven mode (1s spot ticks, 2s quotes): a strike is re-evaluated on
+# every tick, so consecutive samples are near-identical. These keep a state
+# to its ask/bid/minute and edge within 1pp - ~10x fewer rows (vs ~2x at
+# TOLERANCES). Reports still read each state's first sample.
+EVENT_DRIVEN_TOLERANCES = {
+    'edge_pct': 1.0,
+    'model_prob': 0.01,
+    'btc_price': 50.0,          # ~5 bps
+    'bps_above_current': 5.0,
+}
+
+# A state still going is re-written this often (seconds)
+TOUCH_SEC = 60
+
+_INSERT = f"""
+    INSERT INTO price_observations ({', '.join(OBSERVATION_COLUMNS)}, last_seen, sample_count)
+    VALUES ({', '.join('?' * (len(OBSERVATION_COLUMNS) + 2))})
+"""
+
+_UPDATE = "UPDATE price_observations SET last_seen = ?, sample_count = ? WHERE id = ?"
+
+
+@dataclass
+class _State:
+    values: tuple                   # first sample
+    last_seen: str
+    count: int = 1
+    row_id: Optional[int] = None    # None until inserted
+    written: int = 0                # sample_count as last written
+    written_at: float = 0.0         # time.monotonic() of the last write
+
+
+class ObservationRecorder:
+    """
+    Per-ticker current states, written to price_observations by flush().
+    Not thread-safe (the bot records and flushes from one thread).
+    """
+
+    def __init__(self, tolerances: Optional[Dict[str, float]] = None, touch_sec: float = TOUCH_SEC):
+        tolerances = TOLERANCES if tolerances is None else tolerances
+        compared = range(2, len(OBSERVATION_COLUMNS))  # timestamp / ticker never compared
+        self._exact = [i for i in compared if not tolerances.get(OBSERVATION_COLUMNS[i])]
+        self._close = [(i, tolerances[OBSERVATION_COLUMNS[i]]) for i in compared
+                       if tolerances.get(OBSERVATION_COLUMNS[i])]
+        self.touch_sec = touch_sec
+        self._open: Dict[str, _State] = {}
+        self._ended: List[_State] = []
+        self._seen = set()          # tickers observed this scan cycle
+        self.samples = 0            # evaluations recorded (lifetime)
+        self.states = 0             # states started (lifetime)
+
+    def _same(self, first: tuple, row: tuple) -> bool:
+        for i in self._exact:
+            if first[i] != row[i]:
+                return False
+        for i, tolerance in self._close:
+            a, b = first[i], row[i]
+            if a != b and (a is None or b is None or abs(a - b) > tolerance):
+                return False
+        return True
+
+    def observe(self, row: tuple) -> bool:
+        """Record one sample (a tuple of OBSERVATION_COLUMNS). True if it started a new state."""
+        ticker = row[1]
+        self._seen.add(ticker)
+        self.samples += 1
+        state = self._open.get(ticker)
+        if state is not None and self._same(state.values, row):
+            state.last_seen = row[0]
+            state.count += 1
+            return False
+        if state is not None:
+            self._ended.append(state)
+        self._open[ticker] = _State(values=row, last_seen=row[0])
+        self.states += 1
+        return True
+
+    @property
+    def unwritten(self) -> int:
+        """States with nothing in the database yet, or ended with a stale row."""
+        return len(self._ended) + sum(1 for s in self._open.values() if s.row_id is None)
+
+    @property
+    def idle(self) -> bool:
+        return not self._open and not self._ended
+
+    def flush(self, conn: sqlite3.Connection, end_cycle: bool = True, end_all: bool = False) -> int:
+        """
+        Insert new states and write the extent of ended (and long-running)
+        ones. Runs in the caller's transaction. With end_cycle (the once per
+        scan cycle flush), tickers not observed since the previous cycle end
+        here; end_all ends every state (shutdown). Returns rows inserted.
+        """
+        if end_cycle or end_all:
+            for ticker in [t for t in self._open if end_all or t not in self._seen]:
+                self._ended.append(self._open.pop(ticker))
+            self._seen.clear()
+
+        now = time.monotonic()
+        inserted, updates = 0, []
+        for ended, states in ((True, self._ended), (False, self._open.values())):
+            for state in states:
+                if state.row_id is None:
+                    state.row_id = conn.execute(
+                        _INSERT, (*state.values, state.last_seen if state.count > 1 else None,
+                                  state.count)).lastrowid
+                    inserted += 1
+                elif state.count != state.written and (ended or now - state.written_at >= self.touch_sec):
+                    updates.append((state.last_seen, state.count, state.row_id))
+                else:
+                    continue
+                state.written, state.written_at = state.count, now
+        if updates:
+            conn.executemany(_UPDATE, updates)
+        self._ended = []
+        return inserted
+
+
+# =============================================================================
+# RECONSTRUCTION
+# =============================================================================
+
+def reconstruct(states: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expand change-only rows into one row per recorded evaluation. Each state
+    is repeated sample_count times with timestamps spread evenly from its
+    timestamp to last_seen (exact for evenly spaced scans); every other
+    column keeps the state's values. Rows without sample_count (written
+    before change-only recording) are single samples.
+    """
+    if states.empty:
+        return states.copy()
+    counts = (states['sample_count'].fillna(1).astype(np.int64).to_numpy()
+              if 'sample_count' in states else np.ones(len(states), dtype=np.int64))
+    expanded = states.loc[states.index.repeat(counts)].reset_index(drop=True)
+    if 'timestamp' in states:
+        first = pd.to_datetime(states['timestamp'], format='ISO8601')
+        last = (pd.to_datetime(states['last_seen'], format='ISO8601').fillna(first)
+                if 'last_seen' in states else first)
+        step = ((last - first) / np.maximum(counts - 1, 1)).to_numpy()
+        # Position of each expanded row within its state: 0, 1, ..., count - 1
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        timestamps = np.repeat(first.to_numpy(), counts) + np.repeat(step, counts) * offsets
+        # Same naive ISO strings as the stored rows
+        expanded['timestamp'] = pd.Series(timestamps).dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    expanded['sample_count'] = 1
+    if 'last_seen' in expanded:
+        expanded['last_seen'] = None
+    return expanded
+
+
+def state_durations(states: pd.DataFrame) -> pd.Series:
+    """Seconds each state lasted (first to last matching sample; 0 for single samples)."""
+    first = pd.to_datetime(states['timestamp'], format='ISO8601')
+    last = pd.to_datetime(states['last_seen'], format='ISO8601').fillna(first)
+    return (last - first).dt.total_seconds()
+
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "hf_trades.db"
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows, samples, multi = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(sample_count), 0), COALESCE(SUM(sample_count > 1), 0) "
+        "FROM price_observations").fetchone()
+    conn.close()
+    print(f"{rows:,} observation rows covering {samples:,} evaluations "
+          f"({samples / rows if rows else 0:.1f}x; {multi:,} multi-sample states)")
@@ -10,10 +10,28 @@ import sqlite3
 import os
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Optional, Dict, List
+from collections import deque
+from typing import Deque, Optional, Dict, List
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from analytics import PRICE_ANALYSIS_COLUMNS, observation_chunks, print_price_analysis
+from archive import ARCHIVE_DIR
+from db_schema import migrate
+from lambda_package.pnl_projection import closed_trade, record_close, sqlite_record_close
+from lambda_package.projector import PNL, TRADE, feed_event, sqlite_projector
+from lambda_package.trade_log import trade_keys
+from lambda_package.trade_writer import AsyncTradeWriter
+from observation_recorder import ObservationRecorder
+from settlement_service import SettlementService
+
+
+# Observations are flushed early if a cycle leaves more unwritten states than this
+OBSERVATION_BUFFER_MAX = 5000
+
+# Trade records kept in memory; older ones are only in SQLite/DynamoDB
+TRADE_WINDOW = 500
+
 
 class TradeAction(Enum):
     OPEN = "open"
@@ -38,6 +56,10 @@ class TradeRecord:
     order_id: Optional[str] = None
     settlement_result: Optional[str] = None  # "win", "lose", or None if not settled
     realized_pnl: Optional[float] = None
+    # Liquidations only: the position being closed (feeds the P&L projection)
+    entry_price_cents: Optional[float] = None
+    opened_at: Optional[str] = None
+    entry_edge: Optional[float] = None
 
 
 @dataclass
@@ -60,19 +82,77 @@ class SessionStats:
     avg_edge_accuracy: float  # How often model was right
 
 
+@dataclass
+class SessionTotals:
+    """Running counters behind SessionStats, updated as trades and settlements arrive."""
+    total_trades: int = 0
+    opened: int = 0
+    added: int = 0
+    liquidated: int = 0
+    settled: int = 0
+    wins: int = 0
+    losses: int = 0
+    contracts: int = 0
+    cost: float = 0.0
+    realized_pnl: float = 0.0
+    entry_edge_sum: float = 0.0  # Over opens
+    
+    def add_trade(self, trade: 'TradeRecord'):
+        self.total_trades += 1
+        self.contracts += trade.contracts
+        if trade.action == TradeAction.OPEN:
+            self.opened += 1
+            self.entry_edge_sum += trade.edge_pct
+        elif trade.action == TradeAction.ADD:
+            self.added += 1
+        elif trade.action == TradeAction.LIQUIDATE:
+            self.liquidated += 1
+        if trade.action in (TradeAction.OPEN, TradeAction.ADD):
+            self.cost += trade.contracts * trade.price_cents / 100
+        if trade.settlement_result is not None:
+            self.add_settlement(trade.settlement_result, trade.realized_pnl)
+    
+    def add_settlement(self, result: str, realized_pnl: Optional[float]):
+        self.settled += 1
+        self.wins += result == "win"
+        self.losses += result == "lose"
+        self.realized_pnl += realized_pnl or 0
+
+
 class PerformanceTracker:
     """
     Tracks trading performance for both dry-run and live modes.
     
     Dry-run: Uses local SQLite database
     Live: Uses DynamoDB (extends BTCTradeLog table)
+    
+    DynamoDB trade records are an audit log, so they are queued to a
+    background batch writer rather than written on the order path.
+    Liquidations also update the realized P&L projection (pnl_projection):
+    the SQLite copy in the same transaction as the trade row, the DynamoDB
+    copy on the writer thread. In dry-run every SQLite write is also fed to
+    the local projector, which keeps the dashboard read models (projector.py).
+    
+    Session statistics are running totals updated by record_trade and the
+    settlement methods; open positions' trades are indexed by ticker. Only
+    the last TRADE_WINDOW trade records stay in memory (every record is
+    already written to SQLite/DynamoDB when it is recorded).
+    
+    Price observations are analytics, not state: record_observation only
+    feeds the change-only recorder (observation_recorder.py - a row per
+    state, not per evaluation), and flush_observations() writes the cycle's
+    new and ended states in one transaction (call it once per scan cycle).
     """
     
     def __init__(self, dry_run: bool = True, db_path: str = "trades.db"):
         self.dry_run = dry_run
         self.db_path = db_path
         self.session_start = datetime.utcnow().isoformat()
-        self.trades: List[TradeRecord] = []
+        self.trades: Deque[TradeRecord] = deque(maxlen=TRADE_WINDOW)  # Recent trades only
+        self.totals = SessionTotals()
+        self._held: Dict[str, List[TradeRecord]] = {}  # ticker -> opens/adds not yet liquidated or settled
+        self.observations = ObservationRecorder()
+        self._settlement_counts: Dict[str, list] = {}  # ticker -> [strike, expiry, new observations]
         
         # Always initialize DynamoDB for Lambda access
         self._init_dynamodb()
@@ -85,72 +165,17 @@ class PerformanceTracker:
         """Initialize SQLite database for dry-run mode."""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        # WAL + NORMAL: commits don't fsync (the WAL is synced at checkpoints);
+        # position state has its own fully-synced journal
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         cursor = self.conn.cursor()
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                ticker TEXT NOT NULL,
-                action TEXT NOT NULL,
-                side TEXT NOT NULL,
-                contracts INTEGER NOT NULL,
-                price_cents INTEGER NOT NULL,
-                edge_pct REAL NOT NULL,
-                btc_price REAL NOT NULL,
-                strike_price REAL NOT NULL,
-                model_prob REAL NOT NULL,
-                market_prob REAL NOT NULL,
-                order_id TEXT,
-                settlement_result TEXT,
-                realized_pnl REAL
-            )
-        """)
+        # Tables, indexes, P&L projection and dashboard views (versioned - see db_schema.py)
+        migrate(self.conn)
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                start_time TEXT NOT NULL,
-                end_time TEXT,
-                stats_json TEXT
-            )
-        """)
-        
-        # Price level observations - tracks ALL edge opportunities (traded or not)
-        # Enhanced with outcome tracking and slippage data
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS price_observations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                ticker TEXT NOT NULL,
-                price_cents INTEGER NOT NULL,
-                edge_pct REAL NOT NULL,
-                model_prob REAL NOT NULL,
-                market_prob REAL NOT NULL,
-                btc_price REAL NOT NULL,
-                strike_price REAL NOT NULL,
-                bps_above_current REAL NOT NULL,
-                minutes_to_settlement INTEGER NOT NULL,
-                was_traded INTEGER DEFAULT 0,
-                -- Slippage tracking
-                bid_price_cents INTEGER,
-                spread_cents INTEGER,
-                -- Settlement outcome tracking (updated after contract settles)
-                actual_outcome TEXT,  -- 'NO_WIN', 'NO_LOSE', or NULL if not settled
-                settlement_btc_price REAL,
-                model_was_correct INTEGER  -- 1 if model prediction matched outcome
-            )
-        """)
-        
-        # Pending settlements - contracts we're tracking for outcome
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pending_settlements (
-                ticker TEXT PRIMARY KEY,
-                strike_price REAL NOT NULL,
-                expiry_time TEXT NOT NULL,
-                observation_count INTEGER DEFAULT 0
-            )
-        """)
+        self.events = sqlite_projector(self.conn)
+        self.settlements = SettlementService(self.conn)
         
         # Start new session
         cursor.execute(
@@ -169,19 +194,28 @@ class PerformanceTracker:
         # Use same table as position tracker for consistency
         table_name = 'BTCHFPositions-DryRun' if self.dry_run else 'BTCTradeLog'
         self.table = self.dynamodb.Table(table_name)
+        self.writer = AsyncTradeWriter(self.table)
         print(f"[PerformanceTracker] DynamoDB initialized: {table_name}")
 
     
     def record_trade(self, trade: TradeRecord):
         """Record a trade to the appropriate storage."""
         self.trades.append(trade)
+        self.totals.add_trade(trade)
+        
+        closed = self._closed_trade(trade) if trade.action == TradeAction.LIQUIDATE else None
+        if trade.action in (TradeAction.OPEN, TradeAction.ADD):
+            if trade.settlement_result is None:
+                self._held.setdefault(trade.ticker, []).append(trade)
+        elif trade.action == TradeAction.LIQUIDATE:
+            self._held.pop(trade.ticker, None)
         
         # Always write to DynamoDB for Lambda access
-        self._record_dynamodb(trade)
+        self._record_dynamodb(trade, closed)
         
         # Also write to SQLite in dry-run mode for local analysis
         if self.dry_run:
-            self._record_sqlite(trade)
+            self._record_sqlite(trade, closed)
 
         
         action_emoji = {
@@ -195,8 +229,22 @@ class PerformanceTracker:
               f"{trade.contracts} contracts @ {trade.price_cents}¢ "
               f"(edge: {trade.edge_pct:.1f}%)")
     
-    def _record_sqlite(self, trade: TradeRecord):
-        """Record trade to SQLite."""
+    def _closed_trade(self, trade: TradeRecord) -> Dict:
+        """P&L projection entry for a liquidation."""
+        entry_price, opened_at, entry_edge = trade.entry_price_cents, trade.opened_at, trade.entry_edge
+        if entry_price is None:
+            # Caller didn't say - use this session's latest open/add of the ticker
+            held = self._held.get(trade.ticker)
+            if held:
+                entry = held[-1]
+                entry_price, opened_at, entry_edge = entry.price_cents, entry.timestamp, entry.edge_pct
+        return closed_trade(
+            trade.ticker, trade.contracts, entry_price or 0, trade.price_cents, trade.timestamp,
+            opened_at=opened_at or '', open_edge=entry_edge or 0,
+        )
+    
+    def _record_sqlite(self, trade: TradeRecord, closed: Optional[Dict] = None):
+        """Record trade (and its P&L projection update) to SQLite in one transaction."""
         cursor = self.conn.cursor()
         cursor.execute("""
             INSERT INTO trades (
@@ -220,13 +268,23 @@ class PerformanceTracker:
             trade.settlement_result,
             trade.realized_pnl
         ))
+        self.events.append(feed_event(TRADE, {
+            'timestamp': trade.timestamp,
+            'ticker': trade.ticker,
+            'action': trade.action.value,
+            'contracts': trade.contracts,
+            'price_cents': trade.price_cents,
+            'edge_pct': trade.edge_pct,
+            'strike_price': trade.strike_price,
+        }))
+        if closed is not None:
+            self.events.append(feed_event(PNL, sqlite_record_close(self.conn, closed)))
         self.conn.commit()
     
-    def _record_dynamodb(self, trade: TradeRecord):
-        """Record trade to DynamoDB."""
+    def _record_dynamodb(self, trade: TradeRecord, closed: Optional[Dict] = None):
+        """Queue trade for the background DynamoDB writer."""
         item = {
-            'pk': 'HF_TRADE',
-            'sk': trade.timestamp,
+            **trade_keys(trade.timestamp),  # Day-partitioned, time-ordered
             'ticker': trade.ticker,
             'action': trade.action.value,
             'side': trade.side,
@@ -245,7 +303,9 @@ class PerformanceTracker:
         if trade.realized_pnl is not None:
             item['realized_pnl'] = Decimal(str(trade.realized_pnl))
         
-        self.table.put_item(Item=item)
+        self.writer.put(item)
+        if closed is not None:
+            self.writer.submit(lambda: record_close(self.table, closed))
     
     def update_settlement(self, ticker: str, result: str, realized_pnl: float):
         """
@@ -256,80 +316,48 @@ class PerformanceTracker:
             result: "win" or "lose"
             realized_pnl: Actual profit/loss in dollars
         """
-        for trade in reversed(self.trades):
-            if trade.ticker == ticker and trade.settlement_result is None:
-                trade.settlement_result = result
-                trade.realized_pnl = realized_pnl
-                
-                if self.dry_run:
-                    cursor = self.conn.cursor()
-                    cursor.execute("""
-                        UPDATE trades 
-                        SET settlement_result = ?, realized_pnl = ?
-                        WHERE ticker = ? AND settlement_result IS NULL
-                    """, (result, realized_pnl, ticker))
-                    self.conn.commit()
-                
-                print(f"💰 Settlement: {ticker} -> {result.upper()} "
-                      f"(P&L: ${realized_pnl:+.2f})")
-                break
-    
-    def get_session_stats(self) -> SessionStats:
-        """Calculate and return current session statistics."""
-        if not self.trades:
-            return SessionStats(
-                session_start=self.session_start,
-                session_end=datetime.utcnow().isoformat(),
-                total_trades=0,
-                trades_opened=0,
-                trades_added=0,
-                trades_liquidated=0,
-                positions_settled=0,
-                wins=0,
-                losses=0,
-                win_rate=0.0,
-                total_contracts_traded=0,
-                total_cost=0.0,
-                total_realized_pnl=0.0,
-                avg_edge_at_entry=0.0,
-                avg_edge_accuracy=0.0
-            )
-        
-        opened = [t for t in self.trades if t.action == TradeAction.OPEN]
-        added = [t for t in self.trades if t.action == TradeAction.ADD]
-        liquidated = [t for t in self.trades if t.action == TradeAction.LIQUIDATE]
-        settled = [t for t in self.trades if t.settlement_result is not None]
-        wins = [t for t in settled if t.settlement_result == "win"]
-        losses = [t for t in settled if t.settlement_result == "lose"]
-        
-        total_contracts = sum(t.contracts for t in self.trades)
-        total_cost = sum(t.contracts * t.price_cents / 100 for t in self.trades 
-                        if t.action in [TradeAction.OPEN, TradeAction.ADD])
-        total_pnl = sum(t.realized_pnl or 0 for t in settled)
+        held = self._held.pop(ticker, None)
+        if not held:
+            return
         
-        entry_edges = [t.edge_pct for t in opened]
-        avg_edge = sum(entry_edges) / len(entry_edges) if entry_edges else 0
+        # The position's P&L is booked on its latest open/add
+        trade = held[-1]
+        trade.settlement_result = result
+        trade.realized_pnl = realized_pnl
+        self.totals.add_settlement(result, realized_pnl)
         
-        # Edge accuracy: did the model predict correctly?
-        correct_predictions = len(wins)
-        edge_accuracy = correct_predictions / len(settled) if settled else 0
+        if self.dry_run:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                UPDATE trades 
+                SET settlement_result = ?, realized_pnl = ?
+                WHERE ticker = ? AND settlement_result IS NULL
+            """, (result, realized_pnl, ticker))
+            self.conn.commit()
         
+        print(f"💰 Settlement: {ticker} -> {result.upper()} "
+              f"(P&L: ${realized_pnl:+.2f})")
+    
+    def get_session_stats(self) -> SessionStats:
+        """Current session statistics (from running totals, O(1))."""
+        t = self.totals
         return SessionStats(
             session_start=self.session_start,
             session_end=datetime.utcnow().isoformat(),
-            total_trades=len(self.trades),
-            trades_opened=len(opened),
-            trades_added=len(added),
-            trades_liquidated=len(liquidated),
-            positions_settled=len(settled),
-            wins=len(wins),
-            losses=len(losses),
-            win_rate=len(wins) / len(settled) if settled else 0,
-            total_contracts_traded=total_contracts,
-            total_cost=total_cost,
-            total_realized_pnl=total_pnl,
-            avg_edge_at_entry=avg_edge,
-            avg_edge_accuracy=edge_accuracy
+            total_trades=t.total_trades,
+            trades_opened=t.opened,
+            trades_added=t.added,
+            trades_liquidated=t.liquidated,
+            positions_settled=t.settled,
+            wins=t.wins,
+            losses=t.losses,
+            win_rate=t.wins / t.settled if t.settled else 0.0,
+            total_contracts_traded=t.contracts,
+            total_cost=t.cost,
+            total_realized_pnl=t.realized_pnl,
+            avg_edge_at_entry=t.entry_edge_sum / t.opened if t.opened else 0.0,
+            # Edge accuracy: did the model predict correctly?
+            avg_edge_accuracy=t.wins / t.settled if t.settled else 0.0
         )
     
     def print_summary(self):
@@ -362,6 +390,12 @@ class PerformanceTracker:
         
         print("="*60 + "\n")
     
+    def set_observation_tolerances(self, tolerances: Dict[str, float]):
+        """Tolerances for change-only recording (per scan mode - see observation_recorder.py)."""
+        if not self.observations.idle:
+            self.flush_observations(end_all=True)
+        self.observations = ObservationRecorder(tolerances)
+    
     def record_observation(self, ticker: str, price_cents: int, edge_pct: float,
                            model_prob: float, market_prob: float, btc_price: float,
                            strike_price: float, bps_above: float, minutes_to_settlement: int,
@@ -370,6 +404,8 @@ class PerformanceTracker:
         """
         Record a price observation for analytics.
         Tracks ALL edge opportunities, not just traded ones.
+        Only changes are stored (a repeat extends the ticker's current
+        state); written by flush_observations().
         
         Args:
             bid_price_cents: The bid price (for slippage analysis)
@@ -383,14 +419,7 @@ class PerformanceTracker:
         if bid_price_cents is not None:
             spread_cents = price_cents - bid_price_cents
         
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO price_observations (
-                timestamp, ticker, price_cents, edge_pct, model_prob, market_prob,
-                btc_price, strike_price, bps_above_current, minutes_to_settlement, 
-                was_traded, bid_price_cents, spread_cents
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        self.observations.observe((
             datetime.utcnow().isoformat(),
             ticker,
             price_cents,
@@ -408,203 +437,91 @@ class PerformanceTracker:
         
         # Track contract for settlement outcome if expiry provided
         if expiry_time:
-            cursor.execute("""
-                INSERT OR REPLACE INTO pending_settlements (ticker, strike_price, expiry_time, observation_count)
-                VALUES (?, ?, ?, 
-                    COALESCE((SELECT observation_count + 1 FROM pending_settlements WHERE ticker = ?), 1)
-                )
-            """, (ticker, strike_price, expiry_time, ticker))
+            pending = self._settlement_counts.setdefault(ticker, [strike_price, expiry_time, 0])
+            pending[0], pending[1] = strike_price, expiry_time
+            pending[2] += 1
         
-        self.conn.commit()
+        if self.observations.unwritten >= OBSERVATION_BUFFER_MAX:
+            self.flush_observations(end_cycle=False)
     
-    def update_settlement_outcomes(self, final_btc_price: float):
+    def flush_observations(self, end_cycle: bool = True, end_all: bool = False) -> int:
         """
-        Update all pending settlements with actual outcomes.
-        Call this periodically to check for expired contracts.
+        Write new / ended observation states and pending-settlement counts in
+        one transaction. end_cycle marks the end of a scan cycle (tickers not
+        observed in it end their state); internal flushes that only need the
+        rows written pass False. end_all ends every state, for shutdown.
+        Returns the number of observation rows inserted.
+        """
+        if not self.dry_run or (self.observations.idle and not self._settlement_counts):
+            return 0
+        
+        counts, self._settlement_counts = self._settlement_counts, {}
+        with self.conn:  # One transaction: commits on success, rolls back on error
+            inserted = self.observations.flush(self.conn, end_cycle, end_all)
+            self.conn.executemany("""
+                INSERT INTO pending_settlements (ticker, strike_price, expiry_time, observation_count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(ticker) DO UPDATE SET
+                    strike_price = excluded.strike_price,
+                    expiry_time = excluded.expiry_time,
+                    observation_count = observation_count + excluded.observation_count
+            """, [(ticker, strike, expiry, n) for ticker, (strike, expiry, n) in counts.items()])
+        return inserted
+    
+    def update_settlement_outcomes(self) -> int:
+        """
+        Settle expired contracts against Kalshi's official results
+        (settlement_service.py): every observation and held trade of the
+        settled tickers in one transaction. Contracts whose results aren't
+        published yet stay pending for a later call.
         
-        Args:
-            final_btc_price: The BTC price at settlement time
+        Returns the number of contracts settled.
         """
         if not self.dry_run:
-            return
+            return 0
         
-        cursor = self.conn.cursor()
-        now = datetime.utcnow().isoformat()
-        
-        # Find expired contracts
-        cursor.execute("""
-            SELECT ticker, strike_price, expiry_time 
-            FROM pending_settlements 
-            WHERE expiry_time < ?
-        """, (now,))
-        
-        expired = cursor.fetchall()
-        
-        for ticker, strike_price, expiry_time in expired:
-            # Determine outcome: NO wins if BTC stayed BELOW strike
-            no_wins = final_btc_price < strike_price
-            outcome = 'NO_WIN' if no_wins else 'NO_LOSE'
-            
-            # Update all observations for this ticker
-            cursor.execute("""
-                UPDATE price_observations 
-                SET actual_outcome = ?,
-                    settlement_btc_price = ?,
-                    model_was_correct = CASE 
-                        WHEN model_prob > 0.5 AND ? = 'NO_WIN' THEN 1
-                        WHEN model_prob <= 0.5 AND ? = 'NO_LOSE' THEN 1
-                        ELSE 0
-                    END
-                WHERE ticker = ?
-            """, (outcome, final_btc_price, outcome, outcome, ticker))
-            
-            # Remove from pending
-            cursor.execute("DELETE FROM pending_settlements WHERE ticker = ?", (ticker,))
-            
-            print(f"📊 Settlement: {ticker} → {outcome} (BTC: ${final_btc_price:,.2f}, Strike: ${strike_price:,.0f})")
-        
-        self.conn.commit()
-        return len(expired)
+        self.flush_observations(end_cycle=False)  # Outcomes must cover this cycle's observations too
+        settled = self.settlements.settle_expired()
+        for ticker, outcome, _ in settled:
+            self._settle_held_trades(ticker, 'win' if outcome == 'NO_WIN' else 'lose')
+        return len(settled)
+    
+    def _settle_held_trades(self, ticker: str, result: str):
+        """Mirror the SQLite settlement on this session's opens/adds still held at expiry."""
+        payout = 100 if result == 'win' else 0
+        for trade in self._held.pop(ticker, []):
+            trade.settlement_result = result
+            trade.realized_pnl = trade.contracts * (payout - trade.price_cents) / 100
+            self.totals.add_settlement(result, trade.realized_pnl)
 
     
     def print_price_analysis(self):
-        """Print analysis of edge opportunities by price level."""
+        """Print analysis of edge opportunities by price level (hot DB + Parquet archive)."""
         if not self.dry_run:
             return
         
-        cursor = self.conn.cursor()
-        
-        # Check if we have observations
-        cursor.execute("SELECT COUNT(*) FROM price_observations")
-        count = cursor.fetchone()[0]
-        if count == 0:
-            return
-        
-        print(f"\n📊 Price Level Analysis ({count} observations):")
-        
-        # Edge by price bucket (10¢ buckets)
-        cursor.execute("""
-            SELECT 
-                (price_cents / 10) * 10 as bucket,
-                COUNT(*) as observations,
-                AVG(edge_pct) as avg_edge,
-                MAX(edge_pct) as max_edge,
-                SUM(was_traded) as trades,
-                AVG(bps_above_current) as avg_bps
-            FROM price_observations
-            WHERE edge_pct > 0
-            GROUP BY bucket
-            ORDER BY bucket
-        """)
-        
-        rows = cursor.fetchall()
-        if rows:
-            print("\n   Price Bucket | Obs | Avg Edge | Max Edge | Trades | Avg BPS")
-            print("   " + "-"*60)
-            for row in rows:
-                bucket_start = row[0]
-                bucket_end = bucket_start + 9
-                print(f"   {bucket_start:3d}-{bucket_end:2d}¢      | {row[1]:3d} | {row[2]:7.1f}% | {row[3]:7.1f}% | {row[4]:6d} | {row[5]:6.0f}")
-        
-        # ============ NEW: Outcome Analysis by Price Band ============
-        cursor.execute("""
-            SELECT 
-                (price_cents / 10) * 10 as bucket,
-                COUNT(*) as total,
-                SUM(CASE WHEN actual_outcome = 'NO_WIN' THEN 1 ELSE 0 END) as wins,
-                SUM(CASE WHEN actual_outcome = 'NO_LOSE' THEN 1 ELSE 0 END) as losses,
-                AVG(edge_pct) as avg_edge,
-                AVG(model_was_correct) * 100 as accuracy_pct
-            FROM price_observations
-            WHERE actual_outcome IS NOT NULL
-            GROUP BY bucket
-            ORDER BY bucket
-        """)
-        
-        rows = cursor.fetchall()
-        if rows:
-            print("\n   🎯 PRICE BAND OUTCOMES (where does edge break down?):")
-            print("   Price Bucket | Settled | Wins | Losses | Win Rate | Avg Edge | Model Accuracy")
-            print("   " + "-"*75)
-            for row in rows:
-                bucket_start = row[0]
-                bucket_end = bucket_start + 9
-                total = row[1]
-                wins = row[2] or 0
-                losses = row[3] or 0
-                win_rate = (wins / total * 100) if total > 0 else 0
-                avg_edge = row[4] or 0
-                accuracy = row[5] or 0
-                
-                # Flag price bands where edge is NOT working
-                flag = "⚠️" if win_rate < 60 else "✅" if win_rate >= 80 else "  "
-                print(f"   {bucket_start:3d}-{bucket_end:2d}¢      | {total:7d} | {wins:4d} | {losses:6d} | {win_rate:7.1f}% | {avg_edge:7.1f}% | {accuracy:6.1f}% {flag}")
-        
-        # ============ NEW: Slippage Analysis ============
-        cursor.execute("""
-            SELECT 
-                AVG(spread_cents) as avg_spread,
-                MAX(spread_cents) as max_spread,
-                MIN(spread_cents) as min_spread,
-                COUNT(*) as obs_with_spread
-            FROM price_observations
-            WHERE spread_cents IS NOT NULL
-        """)
-        
-        row = cursor.fetchone()
-        if row and row[3] > 0:
-            print(f"\n   📉 SLIPPAGE ANALYSIS ({row[3]} observations with bid/ask data):")
-            print(f"      Average spread: {row[0]:.1f}¢")
-            print(f"      Max spread:     {row[1]}¢")
-            print(f"      Min spread:     {row[2]}¢")
-            
-            # Spread impact by price level
-            cursor.execute("""
-                SELECT 
-                    (price_cents / 10) * 10 as bucket,
-                    AVG(spread_cents) as avg_spread,
-                    AVG(spread_cents * 100.0 / price_cents) as spread_pct
-                FROM price_observations
-                WHERE spread_cents IS NOT NULL
-                GROUP BY bucket
-                ORDER BY bucket
-            """)
-            
-            rows = cursor.fetchall()
-            if rows:
-                print("\n      Price Bucket | Avg Spread | Spread %")
-                print("      " + "-"*40)
-                for row in rows:
-                    bucket_start = row[0]
-                    bucket_end = bucket_start + 9
-                    print(f"      {bucket_start:3d}-{bucket_end:2d}¢      | {row[1]:9.1f}¢ | {row[2]:7.2f}%")
-        
-        # High-edge opportunities by time to settlement
-        cursor.execute("""
-            SELECT 
-                minutes_to_settlement,
-                COUNT(*) as opportunities,
-                AVG(edge_pct) as avg_edge
-            FROM price_observations
-            WHERE edge_pct >= 10
-            GROUP BY minutes_to_settlement
-            ORDER BY minutes_to_settlement DESC
-        """)
-        
-        rows = cursor.fetchall()
-        if rows:
-            print("\n   ⏱️  TIME TO SETTLEMENT (10%+ edge opportunities):")
-            print("   Min to Settlement | 10%+ Edge Opps | Avg Edge")
-            print("   " + "-"*45)
-            for row in rows[:10]:  # Top 10
-                print(f"   {row[0]:18d} | {row[1]:14d} | {row[2]:7.1f}%")
+        self.flush_observations(end_cycle=False)
+        archive_dir = os.path.join(os.path.dirname(self.db_path), ARCHIVE_DIR)
+        # Own read-only connection: the report never holds the bot's writer
+        print_price_analysis(observation_chunks(
+            self.db_path, archive_dir=archive_dir, columns=PRICE_ANALYSIS_COLUMNS))
 
     
     def save_session(self):
         """Save session stats and close connections."""
         stats = self.get_session_stats()
         
+        # Write any queued DynamoDB trade records before exiting
+        unwritten = self.writer.close()
+        if self.writer.failed:
+            print(f"[PerformanceTracker] ⚠️ {self.writer.failed} trade record(s) failed to reach DynamoDB "
+                  f"(still in SQLite/session log)")
+        if unwritten:
+            print(f"[PerformanceTracker] ⚠️ {unwritten} trade record(s)/P&L update(s) still queued or being "
+                  f"retried at shutdown - not written to DynamoDB (still in SQLite/session log)")
+        
         if self.dry_run:
+            self.flush_observations(end_all=True)
             cursor = self.conn.cursor()
             cursor.execute("""
                 UPDATE sessions 
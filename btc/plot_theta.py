@@ -2,30 +2,17 @@
 """
 Plot theta decay for BTC NO contracts.
 Shows how fair value changes as settlement approaches.
+Curves are read off the shared ThetaSurface.
 """
-import math
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
-def norm_cdf(z):
-    """Normal CDF approximation."""
-    if z < -6: return 0.0
-    if z > 6: return 1.0
-    t = 1 / (1 + 0.2316419 * abs(z))
-    d = 0.3989423 * math.exp(-z * z / 2)
-    p = d * t * (0.3193815 + t * (-0.3565638 + t * (1.781478 + t * (-1.821256 + t * 1.330274))))
-    return 1 - p if z > 0 else p
-
-def calculate_fair_value(btc_price, strike, vol_std, minutes_to_settlement):
-    """Calculate NO fair value using the model."""
-    if minutes_to_settlement <= 0:
-        return 100 if btc_price < strike else 0
-    
-    vol_scaled = vol_std * math.sqrt(minutes_to_settlement / 15)
-    price_diff_pct = (strike - btc_price) / btc_price * 100
-    std_devs = price_diff_pct / vol_scaled if vol_scaled > 0 else 0
-    prob = norm_cdf(std_devs)
-    return prob * 100
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_package.theta_surface import ThetaSurface
 
 # Current parameters
 btc_price = 88500  # Example BTC price
@@ -37,11 +24,14 @@ bps_above = [10, 25, 50, 75, 100]  # 0.1%, 0.25%, 0.5%, 0.75%, 1% above
 # Time range (60 min down to 0)
 minutes = np.arange(60, 0, -1)
 
+# Same surface the bot and dashboard price from
+surface = ThetaSurface.build(vol_std)
+
 plt.figure(figsize=(12, 6))
 
 for bps in bps_above:
     strike = btc_price * (1 + bps / 10000)
-    fair_values = [calculate_fair_value(btc_price, strike, vol_std, m) for m in minutes]
+    fair_values = surface.curve(bps, minutes) * 100
     plt.plot(minutes, fair_values, label=f'+{bps}bps (${strike:,.0f})', linewidth=2)
 
 plt.xlabel('Minutes to Settlement', fontsize=12)
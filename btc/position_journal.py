@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Local write-ahead journal for HF bot position state.
+
+Every position change (open/add, close, edge update) is committed to a local
+SQLite database in WAL mode with synchronous=FULL before the tracker
+returns, so a position we hold survives a crash even if DynamoDB is down.
+Each commit writes two things in one transaction:
+
+- position_events: append-only log of changes, with a `replicated` flag
+- positions:       current state per ticker (what restart replays)
+
+Restart reads `positions` in milliseconds instead of scanning DynamoDB.
+JournalReplicator pushes unreplicated changes to DynamoDB from a background
+thread, coalesced per ticker (one put/delete of the latest state each), and
+retries with backoff while DynamoDB is unavailable.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# How often the replicator pushes pending changes to DynamoDB
+REPLICATE_INTERVAL_SEC = 2.0
+
+# Backoff cap while DynamoDB is failing
+MAX_BACKOFF_SEC = 60.0
+
+# Max events per replication batch
+REPLICATE_BATCH = 500
+
+# Replicated events older than this are compacted away
+KEEP_REPLICATED_HOURS = 24
+
+
+class PositionJournal:
+    """Append-only position log plus current-state table in one SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")  # Position writes must survive power loss
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS position_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts TEXT NOT NULL,
+                kind TEXT NOT NULL,             -- upsert | delete | edge | touch
+                ticker TEXT NOT NULL,
+                payload TEXT,
+                replicated INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_position_events_pending
+                ON position_events(replicated, seq);
+            CREATE TABLE IF NOT EXISTS positions (
+                ticker TEXT PRIMARY KEY,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS journal_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+    # -------------------------------------------------------------------------
+    # Writes (each one durable before returning)
+    # -------------------------------------------------------------------------
+
+    def _commit(self, events: List[Tuple[str, str, Optional[Dict]]]):
+        """Append events and apply them to `positions` in one transaction."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                for kind, ticker, payload in events:
+                    body = json.dumps(payload) if payload is not None else None
+                    cur.execute(
+                        "INSERT INTO position_events (ts, kind, ticker, payload) VALUES (?, ?, ?, ?)",
+                        (now, kind, ticker, body),
+                    )
+                    if kind == 'upsert':
+                        cur.execute(
+                            "INSERT INTO positions (ticker, payload) VALUES (?, ?) "
+                            "ON CONFLICT(ticker) DO UPDATE SET payload = excluded.payload",
+                            (ticker, body),
+                        )
+                    elif kind == 'delete':
+                        cur.execute("DELETE FROM positions WHERE ticker = ?", (ticker,))
+                    elif kind == 'edge':
+                        cur.execute(
+                            "UPDATE positions SET payload = json_set(payload, '$.last_edge', ?) "
+                            "WHERE ticker = ?",
+                            (payload['last_edge'], ticker),
+                        )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def upsert(self, ticker: str, position: Dict):
+        self._commit([('upsert', ticker, position)])
+
+    def delete(self, ticker: str):
+        self._commit([('delete', ticker, None)])
+
+    def update_edges(self, edges: Dict[str, float]):
+        """Record several last_edge changes in one transaction."""
+        if edges:
+            self._commit([('edge', t, {'last_edge': e}) for t, e in edges.items()])
+
+    def seed(self, positions: Dict[str, Dict]):
+        """
+        Initialize from an existing copy of the state (DynamoDB on first run).
+        Writes `positions` only - there is nothing to replicate back.
+        """
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute("DELETE FROM positions")
+            cur.executemany(
+                "INSERT INTO positions (ticker, payload) VALUES (?, ?)",
+                [(ticker, json.dumps(p)) for ticker, p in positions.items()],
+            )
+            cur.execute(
+                "INSERT OR REPLACE INTO journal_meta (key, value) VALUES ('initialized', ?)",
+                (datetime.now(timezone.utc).isoformat(),),
+            )
+            cur.execute("COMMIT")
+
+    def touch(self, ticker: str):
+        """Queue a ticker for re-replication without changing it (reconciliation)."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO position_events (ts, kind, ticker) VALUES (?, 'touch', ?)",
+                (datetime.now(timezone.utc).isoformat(), ticker),
+            )
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def load(self) -> Dict[str, Dict]:
+        """Current position state, keyed by ticker."""
+        with self._lock:
+            rows = self.conn.execute("SELECT ticker, payload FROM positions").fetchall()
+        return {ticker: json.loads(payload) for ticker, payload in rows}
+
+    def is_initialized(self) -> bool:
+        """False until the journal has been seeded (from DynamoDB or empty)."""
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM journal_meta WHERE key = 'initialized'").fetchone()
+        return row is not None
+
+    def pending(self, limit: int = REPLICATE_BATCH) -> List[Tuple[int, str]]:
+        """(seq, ticker) of unreplicated events, oldest first."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT seq, ticker FROM position_events WHERE replicated = 0 ORDER BY seq LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM position_events WHERE replicated = 0").fetchone()[0]
+
+    def mark_replicated(self, max_seq: int):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE position_events SET replicated = 1 WHERE replicated = 0 AND seq <= ?",
+                (max_seq,),
+            )
+
+    def compact(self, keep_hours: float = KEEP_REPLICATED_HOURS) -> int:
+        """Drop replicated events older than keep_hours. Returns rows removed."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=keep_hours)).isoformat()
+        with self._lock:
+            cur = self.conn.execute(
+                "DELETE FROM position_events WHERE replicated = 1 AND ts < ?", (cutoff,))
+            return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class JournalReplicator:
+    """
+    Background thread that makes DynamoDB match the journal.
+
+    put_item(ticker, position_dict) and delete_item(ticker) do the remote
+    writes and should raise on failure; the batch is then retried later.
+    """
+
+    def __init__(self, journal: PositionJournal,
+                 put_item: Callable[[str, Dict], None],
+                 delete_item: Callable[[str], None],
+                 interval_sec: float = REPLICATE_INTERVAL_SEC):
+        self.journal = journal
+        self.put_item = put_item
+        self.delete_item = delete_item
+        self.interval_sec = interval_sec
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.failures = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="journal-replicator", daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        """Replicate soon (called after a critical write)."""
+        self._wake.set()
+
+    def replicate_once(self) -> int:
+        """Push one batch; returns tickers written. Raises if DynamoDB fails."""
+        pending = self.journal.pending()
+        if not pending:
+            return 0
+        state = self.journal.load()
+        # Coalesce: whatever happened in between, DynamoDB needs the latest state
+        tickers = dict.fromkeys(ticker for _, ticker in pending)
+        for ticker in tickers:
+            if ticker in state:
+                self.put_item(ticker, state[ticker])
+            else:
+                self.delete_item(ticker)
+        self.journal.mark_replicated(pending[-1][0])
+        return len(tickers)
+
+    def _run(self):
+        backoff = self.interval_sec
+        retry_at = 0.0
+        last_compact = time.monotonic()
+        while not self._stop.is_set():
+            self._wake.wait(backoff)
+            self._wake.clear()
+            if time.monotonic() < retry_at:
+                continue  # Still backing off - writes stay queued in the journal
+            try:
+                while self.replicate_once():
+                    pass
+                if self.failures:
+                    print(f"[Journal] DynamoDB replication recovered after {self.failures} failed attempt(s)")
+                self.failures = 0
+                backoff = self.interval_sec
+            except Exception as e:
+                self.failures += 1
+                backoff = min(backoff * 2, MAX_BACKOFF_SEC)
+                retry_at = time.monotonic() + backoff
+                print(f"[Journal] DynamoDB replication failed ({self.journal.pending_count()} pending, "
+                      f"retry in {backoff:.0f}s): {e}")
+            if time.monotonic() - last_compact > 3600:
+                last_compact = time.monotonic()
+                self.journal.compact()
+
+    def stop(self, flush: bool = True, timeout: float = 10.0):
+        """Stop the thread, pushing anything still pending first."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                # Still mid-batch (a slow DynamoDB call): a second writer would
+                # race it, and the journal is about to close under both
+                print(f"[Journal] Replicator still running after {timeout:.0f}s - skipping final replication; "
+                      f"{self.journal.pending_count()} change(s) replicate on next start")
+                return
+        if flush:
+            try:
+                while self.replicate_once():
+                    pass
+            except Exception as e:
+                print(f"[Journal] Final replication failed - {self.journal.pending_count()} change(s) "
+                      f"stay in the journal and replicate on next start: {e}")
+                traceback.print_exc()
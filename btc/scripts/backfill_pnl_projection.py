@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Build the realized P&L projection (pk='PNL', sk='CURRENT') from the trade
+log. Run once after deploying the projection, or to rebuild it if it's ever
+suspected wrong - it overwrites whatever is stored.
+
+Stop the trader Lambda and HF bot while it runs, or closes made in between
+are lost from the projection (not from the trade log).
+
+Usage:
+    python scripts/backfill_pnl_projection.py BTCHFPositions-DryRun
+    python scripts/backfill_pnl_projection.py BTCHFPositions-DryRun --days 365
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lambda_package'))
+
+import boto3
+
+from pnl_projection import replay, store_projection
+from trade_log import query_trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the P&L projection from the trade log')
+    parser.add_argument('tables', nargs='*', default=['BTCHFPositions-DryRun'])
+    parser.add_argument('--days', type=int, default=365, help='Trade log history to replay (default: 365)')
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource('dynamodb')
+    since = datetime.now(timezone.utc) - timedelta(days=args.days)
+    for name in args.tables:
+        table = dynamodb.Table(name)
+        projection = replay(query_trades(table, since))
+        store_projection(table, projection)
+        print(f"✅ {name}: {projection['closed_count']} closed trades, "
+              f"realized P&L ${projection['realized_pnl']:+.2f}, fees ${projection['total_fees']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Tag position items written before OpenPositionsIndex existed so they show
+up in the index. Safe to re-run - already tagged items are skipped.
+
+Usage:
+    python scripts/backfill_position_index.py BTCHFPositions-DryRun
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lambda_package'))
+
+import boto3
+
+from position_store import backfill_index
+
+
+def main():
+    tables = sys.argv[1:] or ['BTCHFPositions', 'BTCHFPositions-DryRun']
+    dynamodb = boto3.resource('dynamodb')
+    for name in tables:
+        updated = backfill_index(dynamodb.Table(name))
+        print(f"✅ {name}: tagged {updated} position(s)")
+
+
+if __name__ == "__main__":
+    main()
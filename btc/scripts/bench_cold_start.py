@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Lambda handlers.
+
+Each run is a fresh interpreter (like a new Lambda execution environment)
+that times:
+  - import: importing the handler module (what the INIT phase pays)
+  - init:   first-use setup the handler then pays (boto3 resource, plus
+            cryptography with --live, as the live trader/dashboard sign requests)
+and reports which heavy modules were pulled in at import time.
+
+No network calls are made. Compare two trees by pointing --package-dir at
+an older checkout's btc/lambda_package.
+
+Usage:
+    python scripts/bench_cold_start.py
+    python scripts/bench_cold_start.py --runs 20 --function trader --live
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from build_lambda import FUNCTIONS, PACKAGE_DIR
+
+HEAVY_MODULES = ['boto3', 'botocore', 'cryptography', 'numpy', 'pandas', 'yfinance']
+
+# Runs inside the child interpreter
+_PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {package_dir!r})
+t0 = time.perf_counter()
+__import__({module!r})
+t1 = time.perf_counter()
+heavy = [m for m in {heavy!r} if m in sys.modules]
+import boto3
+boto3.resource('dynamodb', region_name='us-east-1')
+if {live!r}:
+    from cryptography.hazmat.primitives import serialization, hashes
+t2 = time.perf_counter()
+print(json.dumps({{'import_ms': (t1 - t0) * 1000, 'init_ms': (t2 - t1) * 1000,
+                  'heavy_at_import': heavy}}))
+"""
+
+
+def measure(function: str, package_dir: str, runs: int, live: bool = False):
+    module = FUNCTIONS[function]['handler'].split('.')[0]
+    code = _PROBE.format(package_dir=package_dir, module=module, heavy=HEAVY_MODULES,
+                         live=live and function in ('trader', 'dashboard'))
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             env={**os.environ, 'AWS_DEFAULT_REGION': 'us-east-1'})
+        if out.returncode != 0:
+            raise RuntimeError(f"{function}: {out.stderr.strip().splitlines()[-1]}")
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        'import_ms': statistics.median(s['import_ms'] for s in samples),
+        'init_ms': statistics.median(s['init_ms'] for s in samples),
+        'heavy_at_import': samples[-1]['heavy_at_import'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure Lambda handler import/init time')
+    parser.add_argument('--function', choices=sorted(FUNCTIONS), help='Only this function')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per function (default: 10)')
+    parser.add_argument('--package-dir', default=PACKAGE_DIR, help='lambda_package directory to benchmark')
+    parser.add_argument('--live', action='store_true', help='Include cryptography init (live trader/dashboard)')
+    args = parser.parse_args()
+
+    functions = [args.function] if args.function else list(FUNCTIONS)
+    print(f"Cold start (median of {args.runs} fresh interpreters) - {args.package_dir}\n")
+    print(f"{'Function':<16} {'Import':>10} {'Init':>10} {'Total':>10}  Heavy modules at import")
+    print("-" * 80)
+    for function in functions:
+        try:
+            r = measure(function, args.package_dir, args.runs, args.live)
+        except RuntimeError as e:
+            print(f"{function:<16} FAILED: {e}")
+            continue
+        total = r['import_ms'] + r['init_ms']
+        heavy = ', '.join(r['heavy_at_import']) or '-'
+        print(f"{function:<16} {r['import_ms']:>8.1f}ms {r['init_ms']:>8.1f}ms {total:>8.1f}ms  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Query benchmark for hf_trades.db before/after the indexes in db_schema.py.
+
+Builds a synthetic database (default 1M price observations, 20k trades) at
+schema v1 - the original tables with no secondary indexes - times the hot
+queries, migrates to the latest schema and times them again. The database
+is a temp file unless --db is given (kept, so later runs can reuse it with
+--reuse).
+
+Usage:
+    python scripts/bench_sqlite_queries.py
+    python scripts/bench_sqlite_queries.py --observations 200000 --runs 5
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_schema import LATEST_VERSION, migrate, schema_version
+
+TICKERS_PER_HOUR = 40
+
+# name -> (sql, params); the UPDATE runs inside a rolled-back transaction
+QUERIES = {
+    'latest_price': ("SELECT btc_price FROM price_observations ORDER BY COALESCE(last_seen, timestamp) DESC LIMIT 1", ()),
+    'settle_ticker': ("""
+        UPDATE price_observations
+        SET actual_outcome = 'NO_WIN', settlement_btc_price = 100000, model_was_correct = 1
+        WHERE ticker = ?
+    """, None),  # Filled with a real ticker
+    'outcome_by_bucket': ("""
+        SELECT (price_cents / 10) * 10 AS bucket, COUNT(*), AVG(edge_pct)
+        FROM price_observations
+        WHERE actual_outcome IS NOT NULL
+        GROUP BY bucket
+    """, ()),
+    'open_positions': ("""
+        SELECT t1.id, t1.ticker FROM trades t1
+        WHERE t1.action = 'open'
+        AND NOT EXISTS (
+            SELECT 1 FROM trades t2
+            WHERE t2.ticker = t1.ticker AND t2.action = 'liquidate' AND t2.id > t1.id
+        )
+    """, ()),
+    'recent_trades': ("SELECT * FROM trades ORDER BY timestamp DESC LIMIT 20", ()),
+}
+
+
+def ticker_for(hour: datetime, strike_idx: int) -> str:
+    return f"KXBTCD-{hour.strftime('%y%b%d%H').upper()}-T{95000 + strike_idx * 250}"
+
+
+def build(path: str, observations: int, trades: int):
+    """Synthetic database at schema v1 (no secondary indexes)."""
+    conn = sqlite3.connect(path)
+    migrate(conn, target=1)
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    per_hour = TICKERS_PER_HOUR * 60  # One observation per ticker per minute-ish
+    hours = max(1, observations // per_hour)
+
+    def obs_rows():
+        for i in range(observations):
+            hour = start + timedelta(hours=i * hours // observations)
+            ts = hour + timedelta(seconds=(i % per_hour) * 3600 / per_hour)
+            price = rng.randint(5, 95)
+            settled = hour < start + timedelta(hours=hours - 2)
+            yield (ts.isoformat(), ticker_for(hour, rng.randrange(TICKERS_PER_HOUR)), price,
+                   rng.uniform(-5, 30), rng.random(), price / 100, 95000.0, 96000.0, 50.0, 30, 0,
+                   price - 1, 1, ('NO_WIN' if rng.random() < 0.8 else 'NO_LOSE') if settled else None)
+
+    conn.executemany("""
+        INSERT INTO price_observations (timestamp, ticker, price_cents, edge_pct, model_prob, market_prob,
+            btc_price, strike_price, bps_above_current, minutes_to_settlement, was_traded,
+            bid_price_cents, spread_cents, actual_outcome)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, obs_rows())
+
+    def trade_rows():
+        for i in range(trades):
+            hour = start + timedelta(hours=i * hours // trades)
+            ticker = ticker_for(hour, rng.randrange(TICKERS_PER_HOUR))
+            action = 'open' if i % 2 == 0 or rng.random() < 0.1 else 'liquidate'
+            yield ((hour + timedelta(minutes=i % 60)).isoformat(), ticker, action, 'NO', 5,
+                   rng.randint(50, 95), 10.0, 95000.0, 96000.0, 0.9, 0.8)
+
+    conn.executemany("""
+        INSERT INTO trades (timestamp, ticker, action, side, contracts, price_cents, edge_pct,
+            btc_price, strike_price, model_prob, market_prob)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, trade_rows())
+    conn.commit()
+    conn.close()
+
+
+def time_queries(conn: sqlite3.Connection, runs: int):
+    ticker = conn.execute("SELECT ticker FROM price_observations ORDER BY id DESC LIMIT 1").fetchone()[0]
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        params = (ticker,) if params is None else params
+        samples = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - t0) * 1000)
+            conn.rollback()
+        plan = ' / '.join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        results[name] = (statistics.median(samples), plan)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hf_trades.db queries before/after indexing')
+    parser.add_argument('--observations', type=int, default=1_000_000)
+    parser.add_argument('--trades', type=int, default=20_000)
+    parser.add_argument('--runs', type=int, default=3, help='Runs per query (median reported)')
+    parser.add_argument('--db', help='Build the synthetic database here (default: temp file)')
+    parser.add_argument('--reuse', action='store_true', help='Reuse --db as is (reset to v1 indexes first)')
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), 'bench_hf_trades.db')
+    if not args.reuse or not os.path.exists(path):
+        if os.path.exists(path):
+            os.remove(path)
+        print(f"Building {args.observations:,} observations / {args.trades:,} trades in {path} ...")
+        t0 = time.perf_counter()
+        build(path, args.observations, args.trades)
+        print(f"   built in {time.perf_counter() - t0:.1f}s")
+
+    conn = sqlite3.connect(path)
+    if schema_version(conn) > 1:
+        # --reuse of a migrated database: drop the v2 indexes to measure "before" again
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall():
+            conn.execute(f"DROP INDEX {name}")
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+
+    before = time_queries(conn, args.runs)
+    t0 = time.perf_counter()
+    migrate(conn)
+    migrate_s = time.perf_counter() - t0
+    conn.execute("ANALYZE")
+    after = time_queries(conn, args.runs)
+    conn.close()
+
+    print(f"\nSchema v1 -> v{LATEST_VERSION} (migration took {migrate_s:.1f}s), median of {args.runs} runs\n")
+    print(f"{'Query':<20} {'Before':>10} {'After':>10} {'Speedup':>9}  Plan after")
+    print("-" * 100)
+    for name in QUERIES:
+        b, _ = before[name]
+        a, plan = after[name]
+        print(f"{name:<20} {b:>8.1f}ms {a:>8.1f}ms {b / a if a else float('inf'):>8.0f}x  {plan}")
+    if not args.db:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
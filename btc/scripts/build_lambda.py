@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Build a slim deployment zip for one Lambda function.
+
+Each function gets only the lambda_package modules it imports plus its own
+requirement set from btc/lambda_requirements/, installed as Lambda-compatible
+manylinux wheels (so compiled deps like cryptography/numpy actually load,
+instead of being stripped of their .so files).
+
+Usage:
+    python scripts/build_lambda.py trader --out trader.zip
+    python scripts/build_lambda.py dashboard --out dashboard.zip
+    python scripts/build_lambda.py --list
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+BTC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(BTC_DIR, "lambda_package")
+REQUIREMENTS_DIR = os.path.join(BTC_DIR, "lambda_requirements")
+
+# Lambda runtime the functions are deployed on (see deploy_btc_lambdas.sh)
+PYTHON_VERSION = "3.12"
+PLATFORM = "manylinux2014_x86_64"
+
+# function -> handler module and the lambda_package modules it needs
+FUNCTIONS = {
+    'trader': {
+        'handler': 'btc_lambda_function.lambda_handler',
+        'modules': ['btc_lambda_function', 'concurrent_fetch', 'latency_metrics', 'strike_ladder',
+                    'pnl_projection', 'position_store', 'trade_log', 'trade_writer', 'kalshi_client'],
+    },
+    'dashboard': {
+        'handler': 'dashboard_generator.lambda_handler',
+        'modules': ['dashboard_generator', 'theta_surface', 'pnl_projection', 'position_store',
+                    'projector', 'trade_log', 'concurrent_fetch', 'kalshi_client'],
+    },
+    'projector': {
+        'handler': 'projector.lambda_handler',
+        'modules': ['projector', 'pnl_projection', 'position_store', 'trade_log', 'concurrent_fetch'],
+    },
+    'collector': {
+        'handler': 'btc_price_collector.lambda_handler',
+        'modules': ['btc_price_collector'],
+    },
+    'volatility_api': {
+        'handler': 'btc_volatility_api.lambda_handler',
+        'modules': ['btc_volatility_api'],
+    },
+}
+
+
+def requirements_file(function: str) -> str:
+    return os.path.join(REQUIREMENTS_DIR, f"{function}.txt")
+
+
+def has_requirements(path: str) -> bool:
+    with open(path) as f:
+        return any(line.strip() and not line.strip().startswith('#') for line in f)
+
+
+def stage(function: str, build_dir: str, install: bool = True):
+    """Copy the function's modules and install its dependencies into build_dir."""
+    spec = FUNCTIONS[function]
+    for module in spec['modules']:
+        shutil.copy2(os.path.join(PACKAGE_DIR, f"{module}.py"), build_dir)
+
+    reqs = requirements_file(function)
+    if install and has_requirements(reqs):
+        subprocess.run([
+            sys.executable, "-m", "pip", "install", "--quiet",
+            "-r", reqs, "-t", build_dir,
+            "--platform", PLATFORM, "--python-version", PYTHON_VERSION,
+            "--implementation", "cp", "--only-binary=:all:",
+        ], check=True)
+
+    # Bytecode caches and dist-info metadata aren't needed at runtime
+    for root, dirs, _ in os.walk(build_dir):
+        for d in list(dirs):
+            if d == "__pycache__" or d.endswith(".dist-info"):
+                shutil.rmtree(os.path.join(root, d))
+                dirs.remove(d)
+
+
+def build(function: str, out_path: str) -> int:
+    """Build the zip and return its size in bytes."""
+    with tempfile.TemporaryDirectory() as build_dir:
+        stage(function, build_dir)
+        with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for root, _, files in os.walk(build_dir):
+                for name in files:
+                    full = os.path.join(root, name)
+                    zf.write(full, os.path.relpath(full, build_dir))
+    return os.path.getsize(out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a slim Lambda deployment package')
+    parser.add_argument('function', nargs='?', choices=sorted(FUNCTIONS), help='Function to build')
+    parser.add_argument('--out', help='Output zip (default: <function>_lambda.zip)')
+    parser.add_argument('--list', action='store_true', help='List functions and their contents')
+    args = parser.parse_args()
+
+    if args.list or not args.function:
+        for name, spec in FUNCTIONS.items():
+            print(f"{name:<16} {spec['handler']:<40} modules={','.join(spec['modules'])}")
+        return
+
+    out = args.out or f"{args.function}_lambda.zip"
+    size = build(args.function, out)
+    print(f"✅ Built {out} ({size / 1024 / 1024:.1f} MB) for {FUNCTIONS[args.function]['handler']}")
+
+
+if __name__ == "__main__":
+    main()
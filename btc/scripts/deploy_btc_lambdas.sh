@@ -5,8 +5,8 @@ set -e
 
 REGION="us-east-1"
 LAMBDA_ROLE="arn:aws:iam::$(aws sts get-caller-identity --query Account --output text):role/lambda-execution-role"
-PACKAGE_DIR="lambda_package"
-ZIP_FILE="btc_lambda.zip"
+COLLECTOR_ZIP="collector_lambda.zip"
+TRADER_ZIP="btc_lambda.zip"
 
 echo "=========================================="
 echo "Deploying BTC Lambdas"
@@ -15,18 +15,10 @@ echo "=========================================="
 # Navigate to project root
 cd "$(dirname "$0")/.."
 
-# Create deployment package
-echo "Creating deployment package..."
-cd $PACKAGE_DIR
-
-# Remove old zip if exists
-rm -f ../$ZIP_FILE
-
-# Zip everything (include .so files for cryptography)
-zip -r ../$ZIP_FILE . -x "*.pyc" -x "__pycache__/*"
-
-cd ..
-echo "Created $ZIP_FILE ($(du -h $ZIP_FILE | cut -f1))"
+# Create slim per-function deployment packages (see scripts/build_lambda.py)
+echo "Creating deployment packages..."
+python3 scripts/build_lambda.py collector --out $COLLECTOR_ZIP
+python3 scripts/build_lambda.py trader --out $TRADER_ZIP
 
 # ==========================================
 # Deploy BTC Price Collector Lambda
@@ -41,7 +33,7 @@ if aws lambda get-function --function-name $COLLECTOR_NAME --region $REGION 2>/d
     echo "Updating existing function..."
     aws lambda update-function-code \
         --function-name $COLLECTOR_NAME \
-        --zip-file fileb://$ZIP_FILE \
+        --zip-file fileb://$COLLECTOR_ZIP \
         --region $REGION
 else
     echo "Creating new function..."
@@ -50,7 +42,7 @@ else
         --runtime python3.12 \
         --role $LAMBDA_ROLE \
         --handler btc_price_collector.lambda_handler \
-        --zip-file fileb://$ZIP_FILE \
+        --zip-file fileb://$COLLECTOR_ZIP \
         --timeout 30 \
         --memory-size 128 \
         --region $REGION
@@ -72,7 +64,7 @@ if aws lambda get-function --function-name $TRADER_NAME --region $REGION 2>/dev/
     echo "Updating existing function..."
     aws lambda update-function-code \
         --function-name $TRADER_NAME \
-        --zip-file fileb://$ZIP_FILE \
+        --zip-file fileb://$TRADER_ZIP \
         --region $REGION
 else
     echo "Creating new function..."
@@ -81,7 +73,7 @@ else
         --runtime python3.12 \
         --role $LAMBDA_ROLE \
         --handler btc_lambda_function.lambda_handler \
-        --zip-file fileb://$ZIP_FILE \
+        --zip-file fileb://$TRADER_ZIP \
         --timeout 30 \
         --memory-size 128 \
         --region $REGION \
@@ -91,6 +83,13 @@ fi
 echo "Waiting for function to be ready..."
 aws lambda wait function-updated --function-name $TRADER_NAME --region $REGION 2>/dev/null || true
 
+# One invocation at a time: a scan loop that overruns its minute must not
+# run alongside the next (positions and BALANCE assume a single writer)
+aws lambda put-function-concurrency \
+    --function-name $TRADER_NAME \
+    --reserved-concurrent-executions 1 \
+    --region $REGION
+
 # ==========================================
 # Set up EventBridge triggers
 # ==========================================
@@ -14,7 +14,7 @@ git clone https://github.com/louisv1148/BTC-Card-Counter.git
 cd BTC-Card-Counter/btc
 
 echo "=== Installing Python packages ==="
-pip3 install --user requests boto3
+pip3 install --user requests boto3 pandas pyarrow
 
 echo "=== Creating systemd service for bot ==="
 sudo tee /etc/systemd/system/btc-bot.service > /dev/null <<EOF
@@ -56,10 +56,36 @@ StandardError=journal
 WantedBy=multi-user.target
 EOF
 
+echo "=== Creating systemd timer for the Parquet archiver ==="
+sudo tee /etc/systemd/system/btc-archive.service > /dev/null <<EOF
+[Unit]
+Description=BTC hf_trades.db archiver (settled observations / closed trades -> Parquet)
+
+[Service]
+Type=oneshot
+User=ec2-user
+WorkingDirectory=/home/ec2-user/BTC-Card-Counter/btc
+ExecStart=/usr/bin/python3 /home/ec2-user/BTC-Card-Counter/btc/archive.py
+StandardOutput=journal
+StandardError=journal
+EOF
+
+sudo tee /etc/systemd/system/btc-archive.timer > /dev/null <<EOF
+[Unit]
+Description=Run the BTC archiver hourly
+
+[Timer]
+OnCalendar=*-*-* *:20:00
+Persistent=true
+
+[Install]
+WantedBy=timers.target
+EOF
+
 echo "=== Enabling and starting services ==="
 sudo systemctl daemon-reload
-sudo systemctl enable btc-bot btc-dashboard
-sudo systemctl start btc-bot btc-dashboard
+sudo systemctl enable btc-bot btc-dashboard btc-archive.timer
+sudo systemctl start btc-bot btc-dashboard btc-archive.timer
 
 echo "=== Done! ==="
 echo ""
@@ -67,3 +93,4 @@ echo "Check bot status:     sudo systemctl status btc-bot"
 echo "Check dashboard:      sudo systemctl status btc-dashboard"
 echo "View bot logs:        sudo journalctl -u btc-bot -f"
 echo "View dashboard logs:  sudo journalctl -u btc-dashboard -f"
+echo "View archiver logs:   sudo journalctl -u btc-archive"
@@ -0,0 +1,77 @@
+#!/bin/bash
+#
+# Stream the HF position tables into the dashboard projector Lambda, which
+# keeps the VIEW/DASHBOARD read models (see lambda_package/projector.py)
+#
+
+set -e
+
+REGION="${AWS_REGION:-us-east-1}"
+FUNCTION_NAME="BTCDashboardProjector"
+LAMBDA_ROLE="arn:aws:iam::$(aws sts get-caller-identity --query Account --output text):role/lambda-execution-role"
+ZIP="projector_lambda.zip"
+
+# The projector writes its views (pk=VIEW) into the table it streams from;
+# don't deliver those records back to it
+VIEW_FILTER='{"Filters": [{"Pattern": "{\"dynamodb\": {\"Keys\": {\"pk\": {\"S\": [{\"anything-but\": [\"VIEW\"]}]}}}}"}]}'
+
+cd "$(dirname "$0")/.."
+python3 scripts/build_lambda.py projector --out $ZIP
+
+if aws lambda get-function --function-name $FUNCTION_NAME --region $REGION 2>/dev/null; then
+    echo "Updating $FUNCTION_NAME..."
+    aws lambda update-function-code \
+        --function-name $FUNCTION_NAME \
+        --zip-file fileb://$ZIP \
+        --region $REGION
+else
+    echo "Creating $FUNCTION_NAME..."
+    aws lambda create-function \
+        --function-name $FUNCTION_NAME \
+        --runtime python3.12 \
+        --role $LAMBDA_ROLE \
+        --handler projector.lambda_handler \
+        --zip-file fileb://$ZIP \
+        --timeout 30 \
+        --memory-size 128 \
+        --region $REGION
+fi
+
+for TABLE_NAME in BTCHFPositions BTCHFPositions-DryRun; do
+    STREAM_ARN=$(aws dynamodb describe-table --table-name "$TABLE_NAME" --region "$REGION" \
+        --query "Table.LatestStreamArn" --output text)
+
+    if [ "$STREAM_ARN" == "None" ]; then
+        echo "Enabling stream on $TABLE_NAME"
+        STREAM_ARN=$(aws dynamodb update-table \
+            --table-name "$TABLE_NAME" \
+            --stream-specification StreamEnabled=true,StreamViewType=NEW_IMAGE \
+            --region "$REGION" \
+            --query "TableDescription.LatestStreamArn" --output text)
+    fi
+
+    MAPPING_UUID=$(aws lambda list-event-source-mappings --function-name $FUNCTION_NAME \
+        --event-source-arn "$STREAM_ARN" --region "$REGION" --query 'EventSourceMappings[0].UUID' \
+        --output text | grep -v None || true)
+
+    if [ -n "$MAPPING_UUID" ]; then
+        echo "Updating $TABLE_NAME stream filter"
+        aws lambda update-event-source-mapping \
+            --uuid "$MAPPING_UUID" \
+            --filter-criteria "$VIEW_FILTER" \
+            --region "$REGION"
+    else
+        echo "Subscribing $FUNCTION_NAME to $TABLE_NAME stream"
+        aws lambda create-event-source-mapping \
+            --function-name $FUNCTION_NAME \
+            --event-source-arn "$STREAM_ARN" \
+            --starting-position LATEST \
+            --batch-size 100 \
+            --maximum-batching-window-in-seconds 1 \
+            --filter-criteria "$VIEW_FILTER" \
+            --region "$REGION"
+    fi
+done
+
+rm -f $ZIP
+echo "✅ $FUNCTION_NAME projecting BTCHFPositions and BTCHFPositions-DryRun"
@@ -15,9 +15,16 @@ aws dynamodb create-table \
     --attribute-definitions \
         AttributeName=pk,AttributeType=S \
         AttributeName=sk,AttributeType=S \
+        AttributeName=gsi1pk,AttributeType=S \
+        AttributeName=gsi1sk,AttributeType=S \
     --key-schema \
         AttributeName=pk,KeyType=HASH \
         AttributeName=sk,KeyType=RANGE \
+    --global-secondary-indexes \
+        "[{\"IndexName\": \"OpenPositionsIndex\",
+           \"KeySchema\": [{\"AttributeName\": \"gsi1pk\", \"KeyType\": \"HASH\"},
+                         {\"AttributeName\": \"gsi1sk\", \"KeyType\": \"RANGE\"}],
+           \"Projection\": {\"ProjectionType\": \"ALL\"}}]" \
     --billing-mode PAY_PER_REQUEST \
     --region "$REGION"
 
@@ -0,0 +1,38 @@
+#!/bin/bash
+#
+# Add the sparse OpenPositionsIndex GSI to the HF position tables and backfill
+# existing positions (see lambda_package/position_store.py)
+#
+
+set -e
+
+REGION="${AWS_REGION:-us-east-1}"
+INDEX_NAME="OpenPositionsIndex"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+for TABLE_NAME in BTCHFPositions BTCHFPositions-DryRun; do
+    echo "Adding $INDEX_NAME to $TABLE_NAME in $REGION"
+
+    aws dynamodb update-table \
+        --table-name "$TABLE_NAME" \
+        --attribute-definitions \
+            AttributeName=gsi1pk,AttributeType=S \
+            AttributeName=gsi1sk,AttributeType=S \
+        --global-secondary-index-updates \
+            "[{\"Create\": {\"IndexName\": \"$INDEX_NAME\",
+                \"KeySchema\": [{\"AttributeName\": \"gsi1pk\", \"KeyType\": \"HASH\"},
+                              {\"AttributeName\": \"gsi1sk\", \"KeyType\": \"RANGE\"}],
+                \"Projection\": {\"ProjectionType\": \"ALL\"}}}]" \
+        --region "$REGION"
+
+    echo "Waiting for index to become active..."
+    until [ "$(aws dynamodb describe-table --table-name "$TABLE_NAME" --region "$REGION" \
+        --query "Table.GlobalSecondaryIndexes[?IndexName=='$INDEX_NAME'].IndexStatus" \
+        --output text)" == "ACTIVE" ]; do
+        sleep 10
+    done
+
+    AWS_DEFAULT_REGION="$REGION" python3 "$SCRIPT_DIR/backfill_position_index.py" "$TABLE_NAME"
+done
+
+echo "✅ $INDEX_NAME ready on all position tables"
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Settlement resolver for the HF bot's SQLite database.
+
+Outcomes come from Kalshi's official results, fetched once per expired
+event (all strikes of an hour in one call) and cached. Results for an event
+are determined together, so an event that returned results is never fetched
+again; one that hasn't settled yet is retried after RESULT_RETRY_SEC.
+
+apply_outcomes() writes one event-hour's worth of outcomes in a single
+transaction with set-based statements joined against a temp table:
+
+    settlement_results(ticker, outcome, settlement_price)
+      -> UPDATE price_observations ... FROM settlement_results
+      -> UPDATE trades ... FROM settlement_results   (positions held to expiry)
+      -> DELETE FROM pending_settlements
+
+Usage (inspect what would settle, no writes):
+    python settlement_service.py [hf_trades.db]
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lambda_package.concurrent_fetch import gather
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+EVENTS_URL = "https://api.elections.kalshi.com/trade-api/v2/events"
+
+# An event that returned no results yet is not re-fetched for this long
+RESULT_RETRY_SEC = 60
+
+# Strikes are floats (e.g. 89249.99); results match within this distance
+STRIKE_TOLERANCE = 1
+
+# Market results we settle on. Anything else (void, scalar, ...) is logged
+# and left pending rather than booked as a win or loss.
+SETTLED_RESULTS = ('yes', 'no')
+
+
+# =============================================================================
+# TICKERS AND RESULTS
+# =============================================================================
+
+def parse_ticker_hour(ticker: str) -> datetime:
+    """
+    Extract the settlement hour from a ticker of any hourly series.
+    e.g., KXBTCD-25DEC1410-T89249.99 -> 2025-12-14 10:00 ET
+          KXETHD-25DEC1410-T3899.99  -> 2025-12-14 10:00 ET
+    """
+    # Pattern: <SERIES>-YYMmmDDHH-T...
+    match = re.match(r'[A-Z0-9]+-(\d{2})([A-Z]{3})(\d{2})(\d{2})', ticker)
+    if not match:
+        return None
+
+    year = 2000 + int(match.group(1))
+    month_str = match.group(2)
+    day = int(match.group(3))
+    hour = int(match.group(4))
+
+    months = {'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+              'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12}
+    month = months.get(month_str, 1)
+
+    et_tz = ZoneInfo("America/New_York")
+    return datetime(year, month, day, hour, 0, 0, tzinfo=et_tz)
+
+
+def get_event_ticker(ticker: str) -> str:
+    """Extract event ticker from position ticker (e.g., KXBTCD-25DEC1817-T85749.99 -> KXBTCD-25DEC1817)"""
+    parts = ticker.rsplit('-', 1)
+    return parts[0] if len(parts) >= 1 else None
+
+
+def fetch_event_settlement(event_ticker: str) -> Dict:
+    """
+    Fetch an event's official results from Kalshi.
+    Returns {'results': {strike: 'yes' | 'no'}, 'settlement_price': float or None};
+    results only has markets that have settled, and is empty on error.
+    """
+    settlement = {'results': {}, 'settlement_price': None}
+    try:
+        resp = requests.get(f'{EVENTS_URL}/{event_ticker}', timeout=10)
+        if resp.status_code == 200:
+            markets = resp.json().get('markets', [])
+            for m in markets:
+                strike = m.get('floor_strike')
+                result = m.get('result')  # 'yes', 'no', or None if not settled
+                if strike and result:
+                    settlement['results'][strike] = result
+                    # Settlement value of the underlying (BTC index), same for every strike
+                    if m.get('expiration_value') and settlement['settlement_price'] is None:
+                        try:
+                            settlement['settlement_price'] = float(m['expiration_value'])
+                        except (TypeError, ValueError):
+                            pass
+    except Exception as e:
+        print(f"  ⚠️ Could not fetch settlement for {event_ticker}: {e}")
+    return settlement
+
+
+def fetch_settlement_results(event_ticker: str) -> dict:
+    """
+    Fetch settlement results for an event from Kalshi API.
+    Returns dict mapping strike -> result ('yes' or 'no')
+    """
+    return fetch_event_settlement(event_ticker)['results']
+
+
+def result_for_strike(results: Dict[float, str], strike: float) -> Optional[str]:
+    """Result for strike, allowing for float noise in the stored strike."""
+    result = results.get(strike)
+    if not result:
+        for s, r in results.items():
+            if abs(s - strike) < STRIKE_TOLERANCE:
+                return r
+    return result
+
+
+# =============================================================================
+# SERVICE
+# =============================================================================
+
+class SettlementService:
+    """
+    Resolves expired contracts against official results and writes the
+    outcomes to SQLite in bulk. One instance per process keeps the
+    per-event results cache.
+    """
+
+    def __init__(self, conn: sqlite3.Connection,
+                 fetch: Callable[[str], Dict] = fetch_event_settlement):
+        self.conn = conn
+        self.fetch = fetch
+        self._settled: Dict[str, Dict] = {}        # event -> fetch_event_settlement() result
+        self._retry_at: Dict[str, float] = {}      # event -> monotonic time of next attempt
+        self._unsettleable = set()                 # tickers with a non yes/no result (logged)
+
+    def resolve(self, event_tickers: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Official results for each event that has settled (cached; uncached
+        events are fetched in parallel). Events without results are omitted.
+        """
+        events, now = set(event_tickers), time.monotonic()
+        missing = [e for e in events
+                   if e not in self._settled and self._retry_at.get(e, 0) <= now]
+        if missing:
+            fetched = gather({event: (lambda event=event: self.fetch(event)) for event in missing})
+            for event in missing:
+                settlement = fetched.get(event)
+                if settlement and settlement['results']:
+                    self._settled[event] = settlement
+                    self._retry_at.pop(event, None)
+                else:
+                    self._retry_at[event] = now + RESULT_RETRY_SEC
+        return {e: self._settled[e] for e in events if e in self._settled}
+
+    def outcome(self, ticker: str, strike: float) -> Optional[str]:
+        """
+        'yes' / 'no' for a market whose event has been resolved, else None
+        (also for results we don't settle on - those are logged once).
+        """
+        settlement = self._settled.get(get_event_ticker(ticker))
+        result = result_for_strike(settlement['results'], strike) if settlement else None
+        if result and result not in SETTLED_RESULTS:
+            if ticker not in self._unsettleable:
+                self._unsettleable.add(ticker)
+                print(f"  ⚠️ {ticker} resolved '{result}' - not a yes/no result, leaving it pending")
+            return None
+        return result
+
+    def expired_pending(self, now: Optional[str] = None) -> List[Tuple[str, float, str]]:
+        """(ticker, strike, expiry_time) of tracked contracts past expiry."""
+        now = now or datetime.utcnow().isoformat()
+        return self.conn.execute("""
+            SELECT ticker, strike_price, expiry_time
+            FROM pending_settlements
+            WHERE expiry_time < ?
+        """, (now,)).fetchall()
+
+    def apply_outcomes(self, outcomes: List[Tuple[str, str, Optional[float]]]) -> int:
+        """
+        Write (ticker, 'NO_WIN' | 'NO_LOSE', settlement_price) rows to every
+        observation and held trade of those tickers, and stop tracking them -
+        one transaction, three set-based statements. Returns tickers settled.
+        """
+        if not outcomes:
+            return 0
+        with self.conn:
+            self.conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS settlement_results (
+                    ticker TEXT PRIMARY KEY,
+                    outcome TEXT NOT NULL,
+                    settlement_price REAL
+                )
+            """)
+            self.conn.execute("DELETE FROM settlement_results")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO settlement_results (ticker, outcome, settlement_price) VALUES (?, ?, ?)",
+                outcomes)
+
+            self.conn.execute("""
+                UPDATE price_observations
+                SET actual_outcome = r.outcome,
+                    settlement_btc_price = r.settlement_price,
+                    model_was_correct = CASE
+                        WHEN price_observations.model_prob > 0.5 AND r.outcome = 'NO_WIN' THEN 1
+                        WHEN price_observations.model_prob <= 0.5 AND r.outcome = 'NO_LOSE' THEN 1
+                        ELSE 0
+                    END
+                FROM settlement_results r
+                WHERE price_observations.ticker = r.ticker
+            """)
+
+            # Opens/adds still held at expiry (no later liquidate) settle at 100¢ or 0¢
+            self.conn.execute("""
+                UPDATE trades
+                SET settlement_result = CASE r.outcome WHEN 'NO_WIN' THEN 'win' ELSE 'lose' END,
+                    realized_pnl = trades.contracts *
+                        ((CASE r.outcome WHEN 'NO_WIN' THEN 100 ELSE 0 END) - trades.price_cents) / 100.0
+                FROM settlement_results r
+                WHERE trades.ticker = r.ticker
+                AND trades.action IN ('open', 'add')
+                AND trades.settlement_result IS NULL
+                AND NOT EXISTS (
+                    SELECT 1 FROM trades l
+                    WHERE l.ticker = trades.ticker AND l.action = 'liquidate' AND l.id > trades.id
+                )
+            """)
+
+            self.conn.execute(
+                "DELETE FROM pending_settlements WHERE ticker IN (SELECT ticker FROM settlement_results)")
+            self.conn.execute("DELETE FROM settlement_results")
+        return len(outcomes)
+
+    def settle_expired(self, now: Optional[str] = None,
+                       verbose: bool = True) -> List[Tuple[str, str, Optional[float]]]:
+        """
+        Settle every expired tracked contract whose event has official
+        results. Contracts still awaiting results stay pending. Returns the
+        (ticker, outcome, settlement_price) rows applied.
+        """
+        expired = self.expired_pending(now)
+        if not expired:
+            return []
+        settlements = self.resolve(get_event_ticker(ticker) for ticker, _, _ in expired)
+
+        outcomes = []
+        for ticker, strike, _ in expired:
+            result = self.outcome(ticker, strike)
+            if not result:
+                continue
+            settlement = settlements[get_event_ticker(ticker)]
+            # NO wins if the market resolved 'no' (BTC below strike), loses on 'yes'
+            outcome = 'NO_WIN' if result == 'no' else 'NO_LOSE'
+            outcomes.append((ticker, outcome, settlement['settlement_price']))
+            if verbose:
+                price = settlement['settlement_price']
+                print(f"📊 Settlement: {ticker} → {outcome} "
+                      f"(BTC: {f'${price:,.2f}' if price else 'n/a'}, Strike: ${strike:,.0f})")
+        self.apply_outcomes(outcomes)
+        return outcomes
+
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "hf_trades.db"
+    service = SettlementService(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True))
+    expired = service.expired_pending()
+    settlements = service.resolve(get_event_ticker(t) for t, _, _ in expired)
+    print(f"{len(expired)} expired contracts pending across {len({get_event_ticker(t) for t, _, _ in expired})} "
+          f"events ({len(settlements)} with official results)")
+    for ticker, strike, expiry in expired:
+        print(f"   {ticker:<32} {expiry:<28} {service.outcome(ticker, strike) or 'awaiting result'}")
@@ -3,19 +3,28 @@
 Real-time trading status dashboard
 Shows: current BTC price, open positions, recent opportunities, and hourly summary
 """
-import sqlite3
+import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db_schema import connect
+from lambda_package.projector import sqlite_load_views, trades_since
 
 DB_PATH = "hf_trades.db"
 
 def get_status():
     """Display comprehensive trading status"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)  # Migrates the schema if needed
     cursor = conn.cursor()
     
+    # Positions and trade summaries come from the projector's read models
+    views = sqlite_load_views(conn)
+    hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    
     # Get latest BTC price from observations
-    cursor.execute("SELECT btc_price FROM price_observations ORDER BY timestamp DESC LIMIT 1")
+    cursor.execute("SELECT btc_price FROM price_observations ORDER BY COALESCE(last_seen, timestamp) DESC LIMIT 1")
     row = cursor.fetchone()
     btc_price = row[0] if row else 0
     
@@ -32,17 +41,7 @@ def get_status():
     print(f"{'='*90}\n")
     
     # OPEN POSITIONS
-    cursor.execute("""
-        SELECT ticker, contracts, price_cents, edge_pct, btc_price, strike_price, timestamp
-        FROM trades
-        WHERE action = 'open'
-        AND ticker NOT IN (
-            SELECT ticker FROM trades WHERE action = 'liquidate'
-        )
-        ORDER BY timestamp DESC
-    """)
-    
-    positions = cursor.fetchall()
+    positions = sorted(views['open_positions'].values(), key=lambda p: p['opened_at'], reverse=True)
     if positions:
         print(f"📦 OPEN POSITIONS ({len(positions)})")
         print(f"{'-'*90}")
@@ -50,11 +49,12 @@ def get_status():
         print(f"{'-'*90}")
         
         total_exposure = 0
-        for ticker, contracts, price, edge, btc, strike, ts in positions:
-            opened = datetime.fromisoformat(ts).strftime("%m/%d %H:%M")
-            exposure = contracts * price / 100
+        for pos in positions:
+            opened = datetime.fromisoformat(pos['opened_at']).strftime("%m/%d %H:%M")
+            exposure = pos['contracts'] * pos['avg_price_cents'] / 100
             total_exposure += exposure
-            print(f"{ticker:<30} {contracts:<5} {price:<7.0f}¢ {edge:<7.1f}% ${strike:<11,.0f} {opened:<20}")
+            print(f"{pos['ticker']:<30} {pos['contracts']:<5} {pos['avg_price_cents']:<7.0f}¢ "
+                  f"{pos['entry_edge']:<7.1f}% ${pos['strike_price']:<11,.0f} {opened:<20}")
         
         print(f"{'-'*90}")
         print(f"Total Exposure: ${total_exposure:.2f}\n")
@@ -63,11 +63,11 @@ def get_status():
     
     # RECENT OPPORTUNITIES (last 10 min)
     cursor.execute("""
-        SELECT ticker, price_cents, edge_pct, strike_price, timestamp
+        SELECT ticker, price_cents, edge_pct, strike_price, COALESCE(last_seen, timestamp) AS seen
         FROM price_observations
         WHERE edge_pct >= 10
-        AND timestamp > datetime('now', '-10 minutes')
-        ORDER BY timestamp DESC
+        AND COALESCE(last_seen, timestamp) > datetime('now', '-10 minutes')
+        ORDER BY seen DESC
         LIMIT 10
     """)
     
@@ -86,43 +86,28 @@ def get_status():
         print("🎯 RECENT OPPORTUNITIES: None (10%+ edge)\n")
     
     # HOURLY SUMMARY
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as total_trades,
-            SUM(contracts) as total_contracts,
-            AVG(edge_pct) as avg_edge,
-            MAX(edge_pct) as max_edge
-        FROM trades
-        WHERE timestamp > datetime('now', '-1 hour')
-    """)
-    
-    row = cursor.fetchone()
-    if row and row[0] > 0:
-        trades, contracts, avg_edge, max_edge = row
+    last_hour = trades_since(views, hour_ago)
+    if last_hour:
+        trades = len(last_hour)
+        contracts = sum(t['contracts'] for t in last_hour)
+        avg_edge = sum(t['edge_pct'] for t in last_hour) / trades
+        max_edge = max(t['edge_pct'] for t in last_hour)
         print(f"📊 LAST HOUR SUMMARY")
         print(f"{'-'*90}")
         print(f"Trades: {trades} | Contracts: {contracts} | Avg Edge: {avg_edge:.1f}% | Max Edge: {max_edge:.1f}%")
         print()
     
     # CLOSED TRADES (last hour)
-    cursor.execute("""
-        SELECT ticker, contracts, price_cents, edge_pct, timestamp
-        FROM trades
-        WHERE action = 'liquidate'
-        AND timestamp > datetime('now', '-1 hour')
-        ORDER BY timestamp DESC
-    """)
-    
-    closed = cursor.fetchall()
+    closed = trades_since(views, hour_ago, actions=('liquidate',))
     if closed:
         print(f"🔴 CLOSED TRADES (last hour)")
         print(f"{'-'*90}")
         print(f"{'Ticker':<30} {'Qty':<5} {'Exit':<8} {'Edge':<8} {'Closed':<15}")
         print(f"{'-'*90}")
         
-        for ticker, contracts, price, edge, ts in closed:
-            time_str = datetime.fromisoformat(ts).strftime("%H:%M:%S")
-            print(f"{ticker:<30} {contracts:<5} {price:<7.0f}¢ {edge:<7.1f}% {time_str:<15}")
+        for t in closed:
+            time_str = datetime.fromisoformat(t['timestamp']).strftime("%H:%M:%S")
+            print(f"{t['ticker']:<30} {t['contracts']:<5} {t['price_cents']:<7.0f}¢ {t['edge_pct']:<7.1f}% {time_str:<15}")
         print()
     
     conn.close()
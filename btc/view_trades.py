@@ -1,103 +1,73 @@
 #!/usr/bin/env python3
 """
-View trading history from SQLite database
+View trading history from SQLite database (and the Parquet archive for outcomes).
+Queries live in analytics.py; this only formats them.
 """
-import sqlite3
 import sys
 from datetime import datetime
 
-DB_PATH = "hf_trades.db"
+import pandas as pd
+
+from analytics import (DB_PATH, PRICE_ANALYSIS_COLUMNS, WIN_RATE_BAD, WIN_RATE_GOOD, load_sessions,
+                       load_trades, observation_chunks, price_band_outcomes, print_price_analysis)
 
 def view_trades(limit=50):
     """View recent trades"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT timestamp, ticker, action, contracts, price_cents, edge_pct, 
-               btc_price, strike_price
-        FROM trades 
-        ORDER BY timestamp DESC 
-        LIMIT ?
-    """, (limit,))
-    
+    trades = load_trades(DB_PATH, limit)
+
     print(f"\n{'='*100}")
     print(f"RECENT TRADES (last {limit})")
     print(f"{'='*100}")
     print(f"{'Time':<20} {'Ticker':<25} {'Action':<10} {'Qty':<5} {'Price':<7} {'Edge':<7} {'BTC $':<10} {'Strike $':<10}")
     print("-" * 100)
-    
-    for row in cursor.fetchall():
-        ts, ticker, action, contracts, price, edge, btc, strike = row
-        dt = datetime.fromisoformat(ts).strftime("%m/%d %H:%M:%S")
-        print(f"{dt:<20} {ticker:<25} {action:<10} {contracts:<5} {price:<7.0f}¢ {edge:<6.1f}% ${btc:<9,.0f} ${strike:<9,.0f}")
-    
-    conn.close()
+
+    for t in trades.itertuples(index=False):
+        dt = datetime.fromisoformat(t.timestamp).strftime("%m/%d %H:%M:%S")
+        print(f"{dt:<20} {t.ticker:<25} {t.action:<10} {t.contracts:<5} {t.price_cents:<7.0f}¢ {t.edge_pct:<6.1f}% "
+              f"${t.btc_price:<9,.0f} ${t.strike_price:<9,.0f}")
 
 def view_sessions():
     """View session summaries"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT started_at, ended_at, total_trades, total_contracts, 
-               avg_edge, max_edge, total_pnl
-        FROM sessions 
-        ORDER BY started_at DESC 
-        LIMIT 10
-    """)
-    
+    sessions = load_sessions(DB_PATH)
+
     print(f"\n{'='*100}")
     print(f"SESSION HISTORY")
     print(f"{'='*100}")
-    print(f"{'Started':<20} {'Ended':<20} {'Trades':<8} {'Contracts':<10} {'Avg Edge':<10} {'Max Edge':<10} {'P&L':<10}")
+    print(f"{'Started':<20} {'Ended':<20} {'Trades':<8} {'Contracts':<10} {'Avg Edge':<10} {'Win Rate':<10} {'P&L':<10}")
     print("-" * 100)
-    
-    for row in cursor.fetchall():
-        start, end, trades, contracts, avg_edge, max_edge, pnl = row
-        start_dt = datetime.fromisoformat(start).strftime("%m/%d %H:%M")
-        end_dt = datetime.fromisoformat(end).strftime("%m/%d %H:%M") if end else "Running"
-        pnl_str = f"${pnl:.2f}" if pnl else "N/A"
-        print(f"{start_dt:<20} {end_dt:<20} {trades:<8} {contracts:<10} {avg_edge:<9.1f}% {max_edge:<9.1f}% {pnl_str:<10}")
-    
-    conn.close()
+
+    for s in sessions.to_dict('records'):
+        start_dt = datetime.fromisoformat(s['start_time']).strftime("%m/%d %H:%M")
+        end_dt = datetime.fromisoformat(s['end_time']).strftime("%m/%d %H:%M") if isinstance(s["end_time"], str) else "Running"
+        if pd.isna(s.get('total_trades')):  # Crashed before save_session
+            print(f"{start_dt:<20} {end_dt:<20} {'-':<8} {'-':<10} {'-':<10} {'-':<10} {'N/A':<10}")
+            continue
+        pnl_str = f"${s['total_realized_pnl']:.2f}" if s['positions_settled'] else "N/A"
+        print(f"{start_dt:<20} {end_dt:<20} {s['total_trades']:<8.0f} {s['total_contracts_traded']:<10.0f} "
+              f"{s['avg_edge_at_entry']:<9.1f}% {s['win_rate'] * 100:<9.1f}% {pnl_str:<10}")
 
 def view_price_outcomes():
     """View price band outcomes"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT 
-            (price_cents / 10) * 10 as bucket,
-            COUNT(*) as total,
-            SUM(CASE WHEN actual_outcome = 'NO_WIN' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN actual_outcome = 'NO_LOSE' THEN 1 ELSE 0 END) as losses,
-            AVG(edge_pct) as avg_edge
-        FROM price_observations
-        WHERE actual_outcome IS NOT NULL
-        GROUP BY bucket
-        ORDER BY bucket
-    """)
-    
-    rows = cursor.fetchall()
-    if not rows:
+    outcomes = price_band_outcomes(observation_chunks(
+        DB_PATH, columns=['price_cents', 'edge_pct', 'actual_outcome', 'model_was_correct'], settled_only=True))
+    if outcomes.empty:
         print("\nNo settled observations yet")
-        conn.close()
         return
-    
+
     print(f"\n{'='*80}")
     print(f"PRICE BAND OUTCOMES")
     print(f"{'='*80}")
     print(f"{'Bucket':<15} {'Total':<8} {'Wins':<8} {'Losses':<8} {'Win %':<10} {'Avg Edge':<10}")
     print("-" * 80)
-    
-    for bucket, total, wins, losses, avg_edge in rows:
-        win_pct = (wins / total * 100) if total > 0 else 0
-        flag = "✅" if win_pct >= 80 else "⚠️" if win_pct < 60 else ""
-        print(f"{int(bucket):3d}-{int(bucket)+9:2d}¢       {total:<8} {wins:<8} {losses:<8} {win_pct:<9.1f}% {avg_edge:<9.1f}% {flag}")
-    
-    conn.close()
+
+    for bucket, row in outcomes.iterrows():
+        flag = "✅" if row.win_rate >= WIN_RATE_GOOD else "⚠️" if row.win_rate < WIN_RATE_BAD else ""
+        print(f"{bucket:3d}-{bucket+9:2d}¢       {row.settled:<8.0f} {row.wins:<8.0f} {row.losses:<8.0f} "
+              f"{row.win_rate:<9.1f}% {row.avg_edge:<9.1f}% {flag}")
+
+def view_analysis():
+    """Full price level report (price, bps and minutes-to-settlement bands, calibration)"""
+    print_price_analysis(observation_chunks(DB_PATH, columns=PRICE_ANALYSIS_COLUMNS))
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -105,11 +75,13 @@ if __name__ == "__main__":
             view_sessions()
         elif sys.argv[1] == "outcomes":
             view_price_outcomes()
+        elif sys.argv[1] == "analysis":
+            view_analysis()
         elif sys.argv[1] == "all":
             view_sessions()
             view_trades()
             view_price_outcomes()
         else:
-            print("Usage: python view_trades.py [sessions|outcomes|all]")
+            print("Usage: python view_trades.py [sessions|outcomes|analysis|all]")
     else:
         view_trades()